@@ -0,0 +1,64 @@
+"""
+Compares load time and memory of homogeneous numeric lists for each array backend.
+
+    python -m benchmarks.bench_arrays --size 1000000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+import thsl
+from benchmarks.corpus import long_list, one_liner
+from thsl.src.arrays import numpy
+
+SHAPES = {"long_list": long_list, "one_liner": one_liner}
+
+
+def backends() -> list[str | None]:
+    available: list[str | None] = [None, "array"]
+    if numpy is not None:
+        available.append("numpy")
+    return available
+
+
+def bench_backend(text: str, backend: str | None, repeat: int) -> dict[str, Any]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        thsl.loads(text, array_backend=backend)
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    result = thsl.loads(text, array_backend=backend)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"seconds": best, "retained_bytes": retained, "peak_bytes": peak}
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--size", type=int, default=1_000_000)
+    arg_parser.add_argument("--repeat", type=int, default=1)
+    args = arg_parser.parse_args(argv)
+
+    print(f"{'shape':<11}{'backend':<9}{'s':>9}{'retained MiB':>14}{'peak MiB':>10}")
+    for shape, make_text in SHAPES.items():
+        text = make_text(args.size)
+        for backend in backends():
+            result = bench_backend(text, backend, args.repeat)
+            print(
+                f"{shape:<11}{backend or 'list':<9}"
+                f"{result['seconds']:>9.3f}"
+                f"{result['retained_bytes'] / 2**20:>14.2f}"
+                f"{result['peak_bytes'] / 2**20:>10.2f}",
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
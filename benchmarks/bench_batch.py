@@ -0,0 +1,63 @@
+"""
+Times checking and converting a directory of many small config files.
+
+    python -m benchmarks.bench_batch --files 10000 --jobs 1 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import config
+from thsl.src import batch
+
+
+def write_files(directory: Path, count: int, sections: int) -> int:
+    text = config(sections)
+    for i in range(count):
+        sub_directory = directory / f"team_{i % 100}"
+        sub_directory.mkdir(parents=True, exist_ok=True)
+        (sub_directory / f"service_{i}.thsl").write_text(text)
+    return len(text.encode("utf-8")) * count
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--files", type=int, default=10_000)
+    arg_parser.add_argument("--sections", type=int, default=3)
+    arg_parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=sorted({1, os.cpu_count() or 1}),
+    )
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = Path(temp_dir)
+        num_bytes = write_files(directory / "configs", args.files, args.sections)
+        print(f"{args.files} files, {num_bytes / 1024 / 1024:.1f} MiB")
+        print(f"{'task':<9}{'jobs':>6}{'seconds':>10}{'files/s':>10}")
+        tasks = {
+            "check": batch.Check(),
+            "convert": batch.Convert(output_dir=directory / "json"),
+        }
+        for name, task in tasks.items():
+            for jobs in args.jobs:
+                start = time.perf_counter()
+                sources = batch.collect([str(directory / "configs")])
+                results = batch.run(task, sources, jobs=jobs)
+                seconds = time.perf_counter() - start
+                assert all(result.ok for result in results)
+                print(
+                    f"{name:<9}{jobs:>6}{seconds:>10.2f}"
+                    f"{len(results) / seconds:>10.0f}",
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
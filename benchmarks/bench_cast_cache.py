@@ -0,0 +1,59 @@
+"""
+Compares casting many documents that repeat the same literals with and without the
+cast cache.
+
+    python -m benchmarks.bench_cast_cache --size 2000
+"""
+
+import argparse
+import sys
+
+import thsl
+
+LITERALS = (
+    "\tcreated :datetime: 2020-01-01 12:00:00 -6\n"
+    "\thost :ip: 192.168.1.1\n"
+    "\tsubnet :network: 192.168.0.0/16\n"
+    "\thome :url: http://www.example.com/index.html\n"
+    "\ttimeout :interval: 5 minutes\n"
+    "\tpattern :regex: ^\\d+(\\.\\d+)*$\n"
+)
+
+
+def documents(size: int) -> list[str]:
+    return [f"service_{i}:\n" + LITERALS for i in range(size)]
+
+
+def best_cast_seconds(repeat: int, texts: list[str], cache_casts: bool) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        thsl.clear_cast_cache()
+        seconds: list[float] = []
+        for text in texts:
+            thsl.loads(
+                text,
+                stats=lambda stats: seconds.append(stats.cast_seconds),
+                cache_casts=cache_casts,
+            )
+        best = min(best, sum(seconds))
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--size", type=int, default=2_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    texts = documents(args.size)
+    print(f"{'cache':<8}{'cast s':>10}")
+    for cache_casts in (False, True):
+        seconds = best_cast_seconds(args.repeat, texts, cache_casts)
+        print(f"{str(cache_casts):<8}{seconds:>10.4f}")
+    info = thsl.cast_cache_info()
+    print(f"hits {info.hits}, misses {info.misses}, hit rate {info.hit_rate:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Compares decoding into dataclasses with loading a dict and constructing them from it.
+
+    python -m benchmarks.bench_decode --size 2000
+"""
+
+import argparse
+import dataclasses
+import sys
+import time
+import typing
+from collections.abc import Callable
+from typing import Any
+
+import thsl
+
+
+@dataclasses.dataclass(slots=True)
+class Resolution:
+    width: int
+    height: int
+
+
+@dataclasses.dataclass(slots=True)
+class Screen:
+    name: str
+    refresh_rate: float
+    width: int
+    height: int
+
+
+@dataclasses.dataclass(slots=True)
+class Settings:
+    debug: bool
+    window: Resolution
+    screens: list[Screen]
+
+
+def settings(size: int) -> str:
+    return (
+        "debug :bool: false\n"
+        "window:\n"
+        "\twidth :int: 1920\n"
+        "\theight :int: 1080\n"
+        "screens:\n"
+        + "".join(
+            f'\t- {{name :str: "screen_{i}", refresh_rate :float: 59.9, '
+            f"width :int: {i}, height :int: {i}}}\n"
+            for i in range(size)
+        )
+    )
+
+
+def construct(cls: type, data: dict) -> Any:
+    """
+    The dict-then-construct path, builds the dataclass tree from a loaded dict
+    """
+    hints = typing.get_type_hints(cls)
+    kwargs = {}
+    for name, value in data.items():
+        hint = hints[name]
+        if dataclasses.is_dataclass(hint):
+            value = construct(hint, value)  # type: ignore
+        elif typing.get_origin(hint) is list:
+            item_type = typing.get_args(hint)[0]
+            if dataclasses.is_dataclass(item_type):
+                value = [construct(item_type, item) for item in value]  # type: ignore
+        kwargs[name] = value
+    return cls(**kwargs)
+
+
+def best_of(repeat: int, run: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--size", type=int, default=2_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    text = settings(args.size)
+    assert thsl.loads(text, into=Settings) == construct(Settings, thsl.loads(text))
+    paths = {
+        "into": lambda: thsl.loads(text, into=Settings),
+        "dict+construct": lambda: construct(Settings, thsl.loads(text)),
+    }
+    print(f"{'path':<16}{'s':>9}")
+    for path, run in paths.items():
+        print(f"{path:<16}{best_of(args.repeat, run):>9.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Compares lexing with and without the fast path for simple ``key :type: value`` and
+``key:`` lines.
+
+    python -m benchmarks.bench_fast_path --scale 5
+"""
+
+import argparse
+import sys
+
+from benchmarks.bench_stages import best_of
+from benchmarks.corpus import CORPORA, DEFAULT_SIZES
+from thsl.src.lexer import Lexer, Token
+
+
+class CharacterLexer(Lexer):
+    """
+    Reads every line character by character
+    """
+
+    def _scan_simple_line(self) -> Token | None:
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument(
+        "corpora",
+        nargs="*",
+        default=["config", "mixed", "wide_dict", "dates"],
+        help=", ".join(CORPORA),
+    )
+    arg_parser.add_argument("--scale", type=float, default=1.0)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+    if unknown := set(args.corpora) - set(CORPORA):
+        arg_parser.error(f"unknown corpora: {', '.join(sorted(unknown))}")
+
+    print(f"{'corpus':<14}{'lines':>8}{'chars ms':>10}{'fast ms':>10}{'speedup':>9}")
+    for name in args.corpora:
+        text = CORPORA[name](max(1, int(DEFAULT_SIZES[name] * args.scale)))
+        assert Lexer(text).parse() == CharacterLexer(text).parse()
+        timings = [
+            best_of(args.repeat, lambda: lexer(text), lambda subject: subject.parse())
+            for lexer in (CharacterLexer, Lexer)
+        ]
+        print(
+            f"{name:<14}{text.count(chr(10)):>8}"
+            f"{timings[0] * 1000:>10.1f}{timings[1] * 1000:>10.1f}"
+            f"{timings[0] / timings[1]:>8.1f}x",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
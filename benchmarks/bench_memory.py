@@ -0,0 +1,221 @@
+"""
+Measures the peak and retained memory of each stage on the synthetic corpora.
+
+    python -m benchmarks.bench_memory --scales 1 4 --check
+    python -m benchmarks.bench_memory --output memory.json
+    python -m benchmarks.bench_memory --compare memory.json
+
+Memory is traced with tracemalloc, so it counts the Python objects a stage allocates,
+not the RSS of the process. The peak is the most memory in use at once while the stage
+ran, the retained memory is what is still allocated once it returned, its output and
+anything cached along the way. Both are reported per byte of input.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import thsl
+from benchmarks.bench_stages import git_commit
+from benchmarks.corpus import CORPORA, DEFAULT_SIZES
+from thsl.src.compiler import Compiler
+from thsl.src.lexer import Lexer
+from thsl.src.parser import Parser
+
+Stage = Callable[[str, Any], Any]
+
+
+@dataclass
+class Engine:
+    """
+    A way of loading a document, as stages that each take the text and the output of
+    the stage before them
+    """
+
+    name: str
+    stages: dict[str, Stage]
+
+
+def _lex(text: str, _: Any) -> Any:
+    return Lexer(text).parse()
+
+
+def _parse(text: str, tokens: Any) -> Any:
+    return Parser(text, tokens=tokens).parse()
+
+
+def _compile(text: str, tree: Any) -> Any:
+    return Compiler(text, tree=tree).compile()
+
+
+# other engines are added here to be measured on the same corpora
+ENGINES: dict[str, Engine] = {
+    "thsl": Engine("thsl", {"lex": _lex, "parse": _parse, "compile": _compile}),
+}
+
+# the most peak and retained memory per byte of input each stage of the thsl engine may
+# use on each corpus, about 1.5 times what it used when they were set. Stages of other
+# engines and corpora without a budget are not checked
+BUDGETS: dict[str, dict[str, tuple[float, float]]] = {
+    "wide_dict": {"lex": (59, 59), "parse": (22, 21), "compile": (24, 14)},
+    "deep_nesting": {"lex": (13, 12), "parse": (27, 9), "compile": (6, 5)},
+    "deep_one_liner": {"lex": (79, 70), "parse": (135, 42), "compile": (27, 24)},
+    "long_list": {"lex": (100, 99), "parse": (27, 25), "compile": (40, 7)},
+    "one_liner": {"lex": (107, 107), "parse": (34, 34), "compile": (55, 10)},
+    "long_string": {"lex": (2, 2), "parse": (1, 1), "compile": (1, 1)},
+    "dates": {"lex": (31, 31), "parse": (11, 11), "compile": (8, 3)},
+    "regexes": {"lex": (29, 29), "parse": (11, 10), "compile": (27, 20)},
+    "mixed": {"lex": (61, 61), "parse": (26, 25), "compile": (16, 6)},
+    "config": {"lex": (45, 45), "parse": (17, 17), "compile": (9, 4)},
+}
+
+
+def measure(stage: Stage, text: str, subject: Any) -> tuple[Any, int, int]:
+    """
+    Runs a stage and returns its output, its peak and its retained memory in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        output = stage(text, subject)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return output, peak, retained
+
+
+def bench_corpus(engine: Engine, name: str, size: int) -> dict[str, Any]:
+    text = CORPORA[name](size)
+    num_bytes = len(text.encode("utf-8"))
+    thsl.clear_cast_cache()
+    stages = {}
+    subject = None
+    for stage_name, stage in engine.stages.items():
+        subject, peak, retained = measure(stage, text, subject)
+        stages[stage_name] = {
+            "peak": peak,
+            "retained": retained,
+            "peak_per_byte": peak / num_bytes,
+            "retained_per_byte": retained / num_bytes,
+        }
+    return {
+        "engine": engine.name,
+        "corpus": name,
+        "size": size,
+        "bytes": num_bytes,
+        "stages": stages,
+    }
+
+
+def over_budget(result: dict[str, Any]) -> list[str]:
+    if result["engine"] != "thsl":
+        return []
+    budgets = BUDGETS.get(result["corpus"], {})
+    failures = []
+    for stage, memory in result["stages"].items():
+        if stage not in budgets:
+            continue
+        for measured, budget in zip(
+            ("peak_per_byte", "retained_per_byte"),
+            budgets[stage],
+        ):
+            if memory[measured] > budget:
+                failures.append(
+                    f"{result['corpus']} size {result['size']} {stage}: "
+                    f"{measured} {memory[measured]:.1f} > {budget:.1f}",
+                )
+    return failures
+
+
+def _key(result: dict[str, Any]) -> tuple[str, str, int]:
+    return result["engine"], result["corpus"], result["size"]
+
+
+def print_results(
+    results: list[dict],
+    baseline: dict[tuple[str, str, int], dict] | None,
+) -> None:
+    header = (
+        f"{'engine':<8}{'corpus':<16}{'KiB in':>8}{'stage':>9}{'peak KiB':>11}"
+        f"{'kept KiB':>11}{'peak/B':>8}{'kept/B':>8}"
+    )
+    if baseline is not None:
+        header += f"{'peak vs base':>14}"
+    print(header)
+    for result in results:
+        for stage, memory in result["stages"].items():
+            line = (
+                f"{result['engine']:<8}{result['corpus']:<16}"
+                f"{result['bytes'] / 1024:>8.1f}{stage:>9}"
+                f"{memory['peak'] / 1024:>11.1f}{memory['retained'] / 1024:>11.1f}"
+                f"{memory['peak_per_byte']:>8.1f}{memory['retained_per_byte']:>8.1f}"
+            )
+            old = (baseline or {}).get(_key(result), {}).get("stages", {}).get(stage)
+            if old is not None:
+                line += f"{memory['peak'] / old['peak']:>13.2f}x"
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("corpora", nargs="*", help=", ".join(CORPORA))
+    arg_parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=list(ENGINES),
+        help=", ".join(ENGINES),
+    )
+    arg_parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 4.0])
+    arg_parser.add_argument("--check", action="store_true", help="fail over budget")
+    arg_parser.add_argument("--output", type=Path)
+    arg_parser.add_argument("--compare", type=Path)
+    args = arg_parser.parse_args(argv)
+    if unknown := set(args.corpora) - set(CORPORA):
+        arg_parser.error(f"unknown corpora: {', '.join(sorted(unknown))}")
+    if unknown := set(args.engines) - set(ENGINES):
+        arg_parser.error(f"unknown engines: {', '.join(sorted(unknown))}")
+
+    results = [
+        bench_corpus(
+            ENGINES[engine],
+            name,
+            max(1, int(DEFAULT_SIZES[name] * scale)),
+        )
+        for engine in args.engines
+        for name in args.corpora or CORPORA
+        for scale in args.scales
+    ]
+    baseline = None
+    if args.compare is not None:
+        previous = json.loads(args.compare.read_text())
+        baseline = {_key(result): result for result in previous["results"]}
+    print_results(results, baseline)
+
+    if args.output is not None:
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "scales": args.scales,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.check:
+        failures = [failure for result in results for failure in over_budget(result)]
+        for failure in failures:
+            print(f"over budget: {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Times each stage on documents nested far deeper than the recursion limit.
+
+    python -m benchmarks.bench_nesting --depths 100 1000 10000
+"""
+
+import argparse
+import sys
+
+from benchmarks.bench_stages import best_of
+from benchmarks.corpus import deep_nesting, deep_one_liner
+from thsl.src.compiler import Compiler
+from thsl.src.lexer import Lexer
+from thsl.src.parser import Parser
+
+DOCUMENTS = {"block": deep_nesting, "one_liner": deep_one_liner}
+
+
+def nesting_depth(result: dict) -> int:
+    depth = 0
+    while "leaf" not in result:
+        (result,) = result.values()
+        depth += 1
+    assert result == {"leaf": 1}
+    return depth
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument(
+        "--depths",
+        type=int,
+        nargs="+",
+        default=[100, 1_000, 10_000],
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    print(f"recursion limit {sys.getrecursionlimit()}")
+    print(
+        f"{'document':<11}{'depth':>7}{'lex ms':>10}{'parse ms':>10}"
+        f"{'compile ms':>12}{'us/level':>10}",
+    )
+    for name, make_text in DOCUMENTS.items():
+        for depth in args.depths:
+            text = make_text(depth)
+            tokens = Lexer(text).parse()
+            tree = Parser(text, tokens=tokens).parse()
+            assert nesting_depth(Compiler(text, tree=tree).compile()) == depth
+            lex = best_of(args.repeat, lambda: Lexer(text), lambda lexer: lexer.parse())
+            parse = best_of(
+                args.repeat,
+                lambda: Parser(text, tokens=tokens),
+                lambda parser: parser.parse(),
+            )
+            compile_ = best_of(
+                args.repeat,
+                lambda: Compiler(text, tree=tree),
+                lambda compiler: compiler.compile(),
+            )
+            per_level = (lex + parse + compile_) / depth * 1_000_000
+            print(
+                f"{name:<11}{depth:>7}{lex * 1000:>10.2f}{parse * 1000:>10.2f}"
+                f"{compile_ * 1000:>12.2f}{per_level:>10.1f}",
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Compares loading a document holding one large base64 value with decoding it directly.
+
+    python -m benchmarks.bench_payloads --megabytes 50
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+
+import thsl
+
+LINE_LENGTH = 76
+
+
+def documents(encoded: str) -> dict[str, str]:
+    lines = "\n".join(
+        encoded[start : start + LINE_LENGTH]
+        for start in range(0, len(encoded), LINE_LENGTH)
+    )
+    return {
+        "unquoted": f"blob :base64: {encoded}\n",
+        "quoted": f'blob :base64: "{encoded}"\n',
+        "multi-line": f'blob :base64: "{lines}"\n',
+    }
+
+
+def best_seconds(repeat: int, function, *args) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--megabytes", type=float, default=50.0)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    # base64 text is 4/3 the size of the bytes it holds
+    payload = os.urandom(int(args.megabytes * 1_000_000 * 3 / 4))
+    encoded = base64.b64encode(payload).decode("ascii")
+    decode_seconds = best_seconds(args.repeat, base64.b64decode, encoded)
+    print(f"{'document':<12}{'MB':>8}{'load s':>10}{'b64decode s':>13}{'ratio':>8}")
+    for name, text in documents(encoded).items():
+        assert thsl.loads(text)["blob"] == payload
+        seconds = best_seconds(args.repeat, thsl.loads, text)
+        print(
+            f"{name:<12}{len(text) / 1_000_000:>8.1f}{seconds:>10.3f}"
+            f"{decode_seconds:>13.3f}{seconds / decode_seconds:>7.1f}x",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
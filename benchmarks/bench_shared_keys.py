@@ -0,0 +1,61 @@
+"""
+Measures the memory held by many similar documents with and without shared keys.
+
+    python -m benchmarks.bench_shared_keys --documents 10000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+import thsl
+
+
+def tenant_config(tenant: int) -> str:
+    return (
+        f"name :str: tenant_{tenant}\n"
+        "debug :bool: false\n"
+        "graphics:\n"
+        f"\ttarget_framerate :int: {30 + tenant % 4 * 30}\n"
+        "\tfullscreen :bool: true\n"
+        "\tresolution:\n"
+        f"\t\twidth :int: {1280 + tenant % 3 * 320}\n"
+        f"\t\theight :int: {720 + tenant % 3 * 180}\n"
+        "limits:\n"
+        f"\trequests :int: {tenant * 10}\n"
+        "\tburst :int: 20\n"
+        "\ttimeout :float: 2.5\n"
+    )
+
+
+def retained_bytes(texts: list[str], shared_keys: bool) -> int:
+    gc.collect()
+    tracemalloc.start()
+    documents = [thsl.loads(text, shared_keys=shared_keys) for text in texts]
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del documents
+    return retained
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--documents", type=int, default=10_000)
+    args = arg_parser.parse_args(argv)
+
+    texts = [tenant_config(tenant) for tenant in range(args.documents)]
+    plain = retained_bytes(texts, shared_keys=False)
+    shared = retained_bytes(texts, shared_keys=True)
+    print(f"{'layout':<8}{'retained MiB':>14}{'bytes/doc':>11}")
+    for layout, retained in (("plain", plain), ("shared", shared)):
+        print(
+            f"{layout:<8}{retained / 2**20:>14.2f}"
+            f"{retained / args.documents:>11.0f}",
+        )
+    print(f"saved {1 - shared / plain:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
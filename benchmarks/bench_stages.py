@@ -0,0 +1,128 @@
+"""
+Times the Lexer, Parser and Compiler stages separately on the synthetic corpora.
+
+    python -m benchmarks.bench_stages --output bench_output.json
+    python -m benchmarks.bench_stages --compare bench_output.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from benchmarks.corpus import CORPORA, DEFAULT_SIZES
+from thsl.src.compiler import Compiler
+from thsl.src.lexer import Lexer
+from thsl.src.parser import Parser
+
+
+def best_of(repeat: int, setup: Callable[[], Any], run: Callable[[Any], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        subject = setup()
+        start = time.perf_counter()
+        run(subject)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_corpus(name: str, size: int, repeat: int) -> dict[str, Any]:
+    text = CORPORA[name](size)
+    num_bytes = len(text.encode("utf-8"))
+    num_tokens = len(Lexer(text).parse())
+    stages = {
+        "lex": best_of(repeat, lambda: Lexer(text), lambda lexer: lexer.parse()),
+        "parse": best_of(repeat, lambda: Parser(text), lambda parser: parser.parse()),
+        "compile": best_of(
+            repeat,
+            lambda: Compiler(text),
+            lambda compiler: compiler.compile(),
+        ),
+    }
+    return {
+        "corpus": name,
+        "size": size,
+        "bytes": num_bytes,
+        "tokens": num_tokens,
+        "stages": {
+            stage: {
+                "seconds": seconds,
+                "mb_per_s": num_bytes / seconds / 1_000_000,
+                "tokens_per_s": num_tokens / seconds,
+            }
+            for stage, seconds in stages.items()
+        },
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S603, S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: list[dict], baseline: dict[str, dict] | None) -> None:
+    header = f"{'corpus':<14}{'stage':<9}{'ms':>10}{'MB/s':>9}{'tokens/s':>12}"
+    if baseline is not None:
+        header += f"{'vs base':>9}"
+    print(header)
+    for result in results:
+        for stage, timing in result["stages"].items():
+            line = (
+                f"{result['corpus']:<14}{stage:<9}"
+                f"{timing['seconds'] * 1000:>10.2f}"
+                f"{timing['mb_per_s']:>9.3f}"
+                f"{timing['tokens_per_s']:>12.0f}"
+            )
+            if baseline is not None and result["corpus"] in baseline:
+                old = baseline[result["corpus"]]["stages"][stage]["seconds"]
+                line += f"{old / timing['seconds']:>8.2f}x"
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("corpora", nargs="*", help=", ".join(CORPORA))
+    arg_parser.add_argument("--scale", type=float, default=1.0)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--output", type=Path)
+    arg_parser.add_argument("--compare", type=Path)
+    args = arg_parser.parse_args(argv)
+    if unknown := set(args.corpora) - set(CORPORA):
+        arg_parser.error(f"unknown corpora: {', '.join(sorted(unknown))}")
+
+    results = [
+        bench_corpus(name, max(1, int(DEFAULT_SIZES[name] * args.scale)), args.repeat)
+        for name in args.corpora or CORPORA
+    ]
+    baseline = None
+    if args.compare is not None:
+        previous = json.loads(args.compare.read_text())
+        baseline = {result["corpus"]: result for result in previous["results"]}
+    print_results(results, baseline)
+
+    if args.output is not None:
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "scale": args.scale,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Loads the synthetic corpora on a growing number of threads and reports the scaling.
+
+    python -m benchmarks.bench_threads --threads 1 2 4 8 --documents 32
+
+Every result is checked against a sequential load. Loads only run in parallel on a
+free-threaded build of Python, with the GIL the threads take turns.
+"""
+
+import argparse
+import sys
+import sysconfig
+import time
+
+import thsl
+from benchmarks.corpus import CORPORA, DEFAULT_SIZES
+
+# corpora whose values are the same on every load
+SHAPES = ("wide_dict", "long_list", "one_liner", "long_string", "regexes", "mixed")
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is None:
+        return True
+    return is_gil_enabled()
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    arg_parser.add_argument("--documents", type=int, default=32)
+    arg_parser.add_argument("--scale", type=float, default=0.25)
+    args = arg_parser.parse_args(argv)
+
+    texts = [
+        CORPORA[shape](max(1, int(DEFAULT_SIZES[shape] * args.scale)))
+        for shape in SHAPES
+    ]
+    texts = (texts * (args.documents // len(texts) + 1))[: args.documents]
+    expected = [repr(thsl.loads(text)) for text in texts]
+
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"free-threaded build: {free_threaded}, GIL enabled: {gil_enabled()}")
+    print(f"{'threads':>7}{'s':>9}{'docs/s':>9}{'speedup':>9}")
+    baseline = None
+    for threads in args.threads:
+        start = time.perf_counter()
+        results = thsl.load_many(texts, max_workers=threads)
+        seconds = time.perf_counter() - start
+        if [repr(result) for result in results] != expected:
+            print(f"results on {threads} threads differ from a sequential load")
+            return 1
+        if baseline is None:
+            baseline = seconds
+        print(
+            f"{threads:>7}{seconds:>9.3f}{len(texts) / seconds:>9.1f}"
+            f"{baseline / seconds:>9.2f}",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
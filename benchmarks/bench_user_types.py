@@ -0,0 +1,65 @@
+"""
+Compares compiling instances of a user type with compiling the same dicts written out.
+
+    python -m benchmarks.bench_user_types --size 2000
+"""
+
+import argparse
+import sys
+
+import thsl
+
+DEFAULTS = (
+    "\tdebug :bool: false\n"
+    "\tname :str: Frank Drebin\n"
+    "\tratio :float: 3.14159\n"
+    "\tsizes :int: [1, 2, 3,]\n"
+    "\tresolution:\n"
+    "\t\twidth :int: 1920\n"
+    "\t\theight :int: 1080\n"
+)
+
+
+def instances(size: int) -> str:
+    return "@section:\n" + DEFAULTS + "".join(
+        f"section_{i} :section:\n\tratio :float: {i}.5\n" for i in range(size)
+    )
+
+
+def written_out(size: int) -> str:
+    return "".join(
+        f"section_{i}:\n" + DEFAULTS.replace("3.14159", f"{i}.5") for i in range(size)
+    )
+
+
+def best_compile_seconds(repeat: int, text: str, frozen: bool) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        seconds: list[float] = []
+        thsl.loads(
+            text,
+            stats=lambda stats: seconds.append(stats.compile_seconds),
+            frozen=frozen,
+        )
+        best = min(best, seconds[0])
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--size", type=int, default=2_000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    texts = {"instances": instances(args.size), "written out": written_out(args.size)}
+    assert thsl.loads(texts["instances"]) == thsl.loads(texts["written out"])
+    print(f"{'document':<14}{'frozen':>8}{'compile s':>11}")
+    for name, text in texts.items():
+        for frozen in (False, True):
+            seconds = best_compile_seconds(args.repeat, text, frozen)
+            print(f"{name:<14}{str(frozen):>8}{seconds:>11.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Synthetic thsl documents used by the benchmarks.
+
+Every generator takes a ``size`` which scales the document roughly linearly so the same
+shape can be measured at several sizes.
+"""
+
+from collections.abc import Callable
+
+TAB = "\t"
+
+
+def wide_dict(size: int) -> str:
+    return "".join(f"key_{i} :int: {i}\n" for i in range(size))
+
+
+def deep_nesting(size: int) -> str:
+    lines = [f"{TAB * level}level_{level}:\n" for level in range(size)]
+    lines.append(f"{TAB * size}leaf :int: 1\n")
+    return "".join(lines)
+
+
+def deep_one_liner(size: int) -> str:
+    opened = "".join(f"{{level_{level}: " for level in range(1, size))
+    return f"level_0: {opened}{{leaf :int: 1{'}' * size}\n"
+
+
+def long_list(size: int) -> str:
+    return "items :int:\n" + "".join(f"\t- {i}\n" for i in range(size))
+
+
+def one_liner(size: int) -> str:
+    return "items :int: [" + ", ".join(str(i) for i in range(size)) + ",]\n"
+
+
+def long_string(size: int) -> str:
+    return f'text :str: "{"lorem ipsum " * size}"\n'
+
+
+def dates(size: int) -> str:
+    return "".join(
+        f"date_{i} :date: 2020-{i % 12 + 1:02d}-{i % 28 + 1:02d}\n"
+        f"datetime_{i} :datetime: 2020-01-01 12:{i % 60:02d}:00 -6\n"
+        for i in range(size)
+    )
+
+
+def regexes(size: int) -> str:
+    return "".join(f"pattern_{i} :regex: ^colou?r_{i}[a-z]+$\n" for i in range(size))
+
+
+def mixed(size: int) -> str:
+    return "".join(
+        f"section_{i}:\n"
+        "\tdebug :bool: false\n"
+        "\tname :str: Frank Drebin\n"
+        "\tratio :float: 3.14159\n"
+        "\tresolution:\n"
+        "\t\twidth :int: 1920\n"
+        "\t\theight :int: 1080\n"
+        "\tsizes :int: [1, 2, 3,]\n"
+        for i in range(size)
+    )
+
+
+def config(size: int) -> str:
+    """
+    Sections shaped like sample.thsl, mostly ``key :type: value`` lines with some
+    comments, quoted strings and collections in between
+    """
+    return "".join(
+        f"# section {i}\n"
+        f"service_{i}:\n"
+        "\tdebug :bool: true\n"
+        f"\tnum :int: -{i}\n"
+        "\tname :str: Frank Drebin  # trimmed\n"
+        '\tname_quotes :str: " My name"\n'
+        "\tgraphics:\n"
+        "\t\ttarget_framerate :int: 60\n"
+        "\t\tfullscreen :bool: false\n"
+        "\t\tresolution:\n"
+        "\t\t\twidth :int: 1920\n"
+        "\t\t\theight :int: 1080\n"
+        "\ta_decimal :dec: 4.2\n"
+        "\tsci_note :float: 1.3e-4\n"
+        "\tbirthday :date: 1986-02-10\n"
+        "\tnew_year :datetime: 2020-01-01 12:00:00 -6\n"
+        "\tip_address :ip: 192.168.1.1\n"
+        "\tmy_page :url: http://www.example.com/index.html\n"
+        "\trange_example :range: 1..5\n"
+        "\tnumber_sep :int: 100_000_000\n"
+        "\tsizes :int: [1, 2, 3,]\n"
+        for i in range(size)
+    )
+
+
+CORPORA: dict[str, Callable[[int], str]] = {
+    "wide_dict": wide_dict,
+    "deep_nesting": deep_nesting,
+    "deep_one_liner": deep_one_liner,
+    "long_list": long_list,
+    "one_liner": one_liner,
+    "long_string": long_string,
+    "dates": dates,
+    "regexes": regexes,
+    "mixed": mixed,
+    "config": config,
+}
+
+# sizes that keep every shape at a comparable amount of text
+DEFAULT_SIZES: dict[str, int] = {
+    "wide_dict": 2_000,
+    "deep_nesting": 100,
+    "deep_one_liner": 100,
+    "long_list": 2_000,
+    "one_liner": 2_000,
+    "long_string": 2_000,
+    "dates": 500,
+    "regexes": 1_000,
+    "mixed": 200,
+    "config": 100,
+}
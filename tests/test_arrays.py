@@ -0,0 +1,77 @@
+from array import array
+from pathlib import Path
+
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+from thsl.src.grammar import ScalarDataType
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def test_array_backend_list():
+    actual = thsl.load(DATA_DIR / "list.thsl", array_backend="array")
+    assert actual["homogeneous_list"] == array("q", [1, 2, 4, 7])
+
+
+def test_array_backend_one_liner():
+    actual = thsl.load(DATA_DIR / "list_one_liner.thsl", array_backend="array")
+    assert actual["list_one_liner"] == array("q", [1, 2, 4, 7])
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    (
+        ("a :float:\n\t- 1.5\n\t- -2\n", array("d", [1.5, -2.0])),
+        ("a :hex: [ff, 10]\n", array("q", [255, 16])),
+        ("a :oct: [17, 10]\n", array("q", [15, 8])),
+    ),
+)
+def test_array_backend_numeric_types(text, expected):
+    assert thsl.loads(text, array_backend="array")["a"] == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        'a :str: ["x", "y"]\n',
+        "a :int: (1, 2)\n",
+        "a :int: <1, 2>\n",
+        "a :int: [1, 99999999999999999999999]\n",
+    ),
+)
+def test_array_backend_falls_back(text):
+    assert thsl.loads(text, array_backend="array") == thsl.loads(text)
+
+
+def test_array_backend_keeps_errors():
+    with pytest.raises(ThslLoadError):
+        thsl.loads("a :int: [1, 2.5]\n", array_backend="array")
+
+
+def test_array_backend_casts_are_counted():
+    collected = []
+    thsl.loads("a :int: [1, 2, 3]\n", stats=collected.append, array_backend="array")
+    assert collected[0].casts[ScalarDataType.INT].count == 3
+
+
+def test_unknown_array_backend():
+    with pytest.raises(ValueError, match="Unknown array backend"):
+        thsl.loads("a :int: [1]\n", array_backend="pandas")
+
+
+def test_numpy_backend():
+    numpy = pytest.importorskip("numpy")
+    actual = thsl.loads(
+        "a :int: [1, 2, 3]\nb :float:\n\t- 0.5\n", array_backend="numpy"
+    )
+    assert isinstance(actual["a"], numpy.ndarray)
+    assert actual["a"].dtype == numpy.int64
+    assert actual["a"].tolist() == [1, 2, 3]
+    assert actual["b"].dtype == numpy.float64
+    assert actual["b"].tolist() == [0.5]
+
+
+def test_numpy_backend_falls_back_to_array(monkeypatch):
+    monkeypatch.setattr("thsl.src.arrays.numpy", None)
+    assert thsl.loads("a :int: [1]\n", array_backend="numpy")["a"] == array("q", [1])
@@ -0,0 +1,93 @@
+import io
+import json
+import pickle
+
+import pytest
+import thsl
+from thsl.__main__ import main
+from thsl.src import batch
+
+GOOD = "name :str: app\nhost :ip: 10.0.0.1\nports :int: [80, 443]\n"
+
+
+@pytest.fixture()
+def configs(tmp_path):
+    directory = tmp_path / "configs"
+    (directory / "team").mkdir(parents=True)
+    (directory / "app.thsl").write_text(GOOD)
+    (directory / "team" / "db.thsl").write_text("port :int: 5432\n")
+    (directory / "team" / "notes.txt").write_text("not a thsl file\n")
+    return directory
+
+
+def test_check(capsys, configs):
+    assert main(["check", str(configs), "--quiet"]) == 0
+    assert capsys.readouterr().out.startswith("checked 2 files")
+
+
+def test_check_reports_failures(capsys, configs, tmp_path):
+    (configs / "team" / "broken.thsl").write_text("port :int: x\n")
+    summary_path = tmp_path / "summary.json"
+    assert main(["check", str(configs), "-j", "2", "--summary", str(summary_path)]) == 1
+    captured = capsys.readouterr()
+    assert "broken.thsl: ValueError: line 1 column 12: Invalid int" in captured.err
+    assert "3/3 files, 1 failed" in captured.err
+    summary = json.loads(summary_path.read_text())
+    assert (summary["command"], summary["files"], summary["failed"]) == ("check", 3, 1)
+    assert [result["ok"] for result in summary["results"]] == [True, False, True]
+
+
+def test_convert_to_json_next_to_source(configs):
+    assert main(["convert", str(configs / "app.thsl"), "-q"]) == 0
+    output = json.loads((configs / "app.json").read_text())
+    assert output == {"name": "app", "host": "10.0.0.1", "ports": [80, 443]}
+
+
+def test_convert_to_pickle(configs, tmp_path):
+    output_dir = tmp_path / "out"
+    assert main(["convert", str(configs), "--to", "pickle", "-o", str(output_dir)]) == 0
+    with (output_dir / "team" / "db.pickle").open("rb") as open_file:
+        assert pickle.load(open_file) == {"port": 5432}
+    with (output_dir / "app.pickle").open("rb") as open_file:
+        assert pickle.load(open_file) == thsl.load(configs / "app.thsl")
+
+
+def test_stats_summary_on_stdout(capsys, configs):
+    assert main(["stats", str(configs), "--summary", "-", "-q"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["stats"]["tokens"] == sum(
+        result["stats"]["tokens"] for result in summary["results"]
+    )
+    assert summary["stats"]["casts"]["ip"]["count"] == 1
+
+
+def test_glob_patterns_keep_their_directories(configs, tmp_path):
+    sources = batch.collect([f"{configs}/**/*.thsl", str(configs / "app.thsl")])
+    assert [source.relative.as_posix() for source in sources] == [
+        "app.thsl",
+        "team/db.thsl",
+    ]
+
+
+def test_nothing_to_load(capsys, tmp_path):
+    with pytest.raises(SystemExit):
+        main(["check", str(tmp_path / "missing")])
+    assert "no thsl files found" in capsys.readouterr().err
+
+
+def test_results_keep_the_order_of_the_files(tmp_path):
+    for i in range(40):
+        (tmp_path / f"{i:02}.thsl").write_text(f"index :int: {i}\n")
+    sources = batch.collect([str(tmp_path)])
+    stream = io.StringIO()
+    results = batch.run(
+        batch.Stats(),
+        sources,
+        jobs=2,
+        progress=batch.Progress(len(sources), stream),
+    )
+    assert [result.path for result in results] == [
+        str(source.path) for source in sources
+    ]
+    assert all(result.stats.tokens for result in results)
+    assert stream.getvalue().splitlines()[-1] == "40/40 files, 0 failed"
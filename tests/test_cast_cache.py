@@ -0,0 +1,105 @@
+import ipaddress
+from dataclasses import dataclass
+
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+from thsl.src.cast_cache import CastCache
+from thsl.src.grammar import ScalarDataType
+
+DOCUMENT = (
+    "primary :ip: 10.0.0.1\n"
+    "replica :ip: 10.0.0.1\n"
+    "pattern :regex: ^[a-z]+$\n"
+    "version :semver: 1.2.3\n"
+    "count :int: 1\n"
+)
+
+
+@dataclass(slots=True)
+class Hosts:
+    primary: ipaddress.IPv4Address
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    thsl.clear_cast_cache()
+    yield
+    thsl.clear_cast_cache()
+
+
+def test_repeated_values_are_cast_once():
+    first = thsl.loads(DOCUMENT)
+    assert thsl.cast_cache_info()[:3] == (0, 2, 2)
+    second = thsl.loads(DOCUMENT)
+    info = thsl.cast_cache_info()
+    assert info[:3] == (2, 2, 2)
+    assert info.hit_rate == 0.5
+    assert second == first
+    assert second["pattern"] is first["pattern"]
+    assert second["primary"] is first["primary"] is first["replica"]
+
+
+def test_uncached_types_are_not_shared():
+    first = thsl.loads("total :dec: 1.5\n")
+    second = thsl.loads("total :dec: 1.5\n")
+    assert second["total"] is not first["total"]
+    assert thsl.cast_cache_info().size == 0
+
+
+def test_mutable_results_are_not_shared():
+    first = thsl.loads(DOCUMENT)
+    first["version"].major = 9
+    second = thsl.loads(DOCUMENT)
+    assert str(second["version"]) == "1.2.3"
+    assert second["version"] is not first["version"]
+
+
+@pytest.mark.parametrize(
+    ("text", "cached"),
+    (
+        ("when :datetime: 2020-01-01 12:00:00 -6\n", True),
+        ("when :date: 2020-01-01\n", True),
+        ("when :time: 12:00\n", True),
+        ("when :datetime: 12:00\n", False),
+        ("when :date: March 5\n", False),
+        ("when :datetime:\n\t- 12:00\n\t- 12:00\n\t- 2020-01-01\n", True),
+    ),
+)
+def test_dates_are_cached_when_written_in_full(text, cached):
+    thsl.loads(text)
+    thsl.loads(text)
+    assert thsl.cast_cache_info().hits == (1 if cached else 0)
+
+
+def test_opt_out():
+    first = thsl.loads(DOCUMENT, cache_casts=False)
+    second = thsl.loads(DOCUMENT, cache_casts=False)
+    assert second == first
+    assert second["primary"] is not first["primary"]
+    assert thsl.cast_cache_info()[:3] == (0, 0, 0)
+
+
+def test_single_casts_are_cached():
+    first = thsl.loads("primary :ip: 10.0.0.1\n", into=Hosts)
+    second = thsl.loads("primary :ip: 10.0.0.1\n", into=Hosts)
+    assert second.primary is first.primary
+
+
+def test_failed_casts_are_not_cached():
+    with pytest.raises(ThslLoadError):
+        thsl.loads("primary :ip: not an address\n")
+    assert thsl.cast_cache_info().size == 0
+
+
+def test_least_recently_used_are_dropped():
+    cache = CastCache(max_size=2)
+    cache.cast("a.com", ScalarDataType.URL, str)
+    cache.cast("b.com", ScalarDataType.URL, str)
+    cache.cast("a.com", ScalarDataType.URL, str)
+    cache.cast("c.com", ScalarDataType.URL, str)
+    assert list(cache._results) == [
+        (ScalarDataType.URL, "a.com"),
+        (ScalarDataType.URL, "c.com"),
+    ]
+    assert cache.info() == (1, 3, 2, 2)
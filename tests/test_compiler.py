@@ -52,16 +52,16 @@ def test_str_escaping():
     assert actual == expected
 
 
-# def test_str_escaping_single_quotes():
-#     actual = thsl.load(DATA_DIR / "str_escaping_single_quotes.thsl")
-#     expected = {"escaping_single_quotes": "My name is {name}"}
-#     assert actual == expected
+def test_str_escaping_single_quotes():
+    actual = thsl.load(DATA_DIR / "str_escaping_single_quotes.thsl")
+    expected = {"escaping_single_quotes": "My name is {name}"}
+    assert actual == expected
 
 
-# def test_str_templating():
-#     actual = thsl.load(DATA_DIR / "str_templating.thsl")
-#     expected = {"template": "My name is Frank Drebin"}
-#     assert actual["template"] == expected["template"]
+def test_str_templating():
+    actual = thsl.load(DATA_DIR / "str_templating.thsl")
+    expected = {"template": "My name is Frank Drebin"}
+    assert actual["template"] == expected["template"]
 
 
 def test_str_multi_line():
@@ -427,3 +427,25 @@ def test_tuple_one_liner():
 #     actual = thsl.load(DATA_DIR / "tuple_heterogeneous_one_liner.thsl")
 #     expected = {"tuple_one_liner": (1, 2.0)}
 #     assert actual == expected
+
+
+def test_nested_tuples():
+    actual = thsl.loads("a :int:\n\t) (1, 2)\n\t) (3, 4)\n")
+    expected = {"a": ((1, 2), (3, 4))}
+    assert actual == expected
+
+
+def test_batched_casts_keep_order():
+    actual = thsl.loads(
+        "a :int: 1\nb :date: 2020-01-02\nc :int:\n\t- 2\n\t- (3, 4)\n\t- [5]\n"
+        "d :date: 2020-01-02\ne :bool: true\n",
+    )
+    expected = {
+        "a": 1,
+        "b": datetime.date(2020, 1, 2),
+        "c": [2, (3, 4), [5]],
+        "d": datetime.date(2020, 1, 2),
+        "e": True,
+    }
+    assert actual == expected
+    assert list(actual) == ["a", "b", "c", "d", "e"]
@@ -0,0 +1,126 @@
+import sys
+import time
+
+import pytest
+import thsl
+from thsl.src.lexer import Lexer
+
+# loading 8x the input may take at most this many times as long as loading 1x, linear
+# growth gives about 8, quadratic growth about 64
+MAX_GROWTH = 20
+SCALES = (1, 2, 4, 8)
+REPEAT = 3
+
+
+def best_time(text):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        thsl.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+CONSTRUCTS = {
+    "keys": (80, lambda n: "".join(f"key_{i} :int: {i}\n" for i in range(n))),
+    "list_items": (
+        120,
+        lambda n: "a :int:\n" + "".join(f"\t- {i}\n" for i in range(n)),
+    ),
+    "set_items": (120, lambda n: "a :int:\n" + "".join(f"\t> {i}\n" for i in range(n))),
+    "tuple_items": (
+        120,
+        lambda n: "a :int:\n" + "".join(f"\t) {i}\n" for i in range(n)),
+    ),
+    "dict_items": (
+        40,
+        lambda n: "a:\n" + "".join(f"\t- {{one :int: {i}}}\n" for i in range(n)),
+    ),
+    "list_one_liner": (
+        150,
+        lambda n: "a :int: [" + ", ".join(str(i) for i in range(n)) + ",]\n",
+    ),
+    "tuple_one_liner": (
+        150,
+        lambda n: "a :int: (" + ", ".join(str(i) for i in range(n)) + ")\n",
+    ),
+    "quoted_string": (200, lambda n: f'a :str: "{"lorem ipsum " * n}"\n'),
+    "unquoted_string": (200, lambda n: f"a :str: {'lorem ipsum ' * n}\n"),
+    "multi_line_string": (200, lambda n: 'a :str: "' + "lorem ipsum\n" * n + '"\n'),
+    "escaped_string": (200, lambda n: 'a :str: "' + 'lorem \\"ipsum\\" ' * n + '"\n'),
+    "continued_line": (200, lambda n: "a :str: " + "lorem ipsum \\\n" * n + "end\n"),
+    "base64": (2000, lambda n: f"a :base64: {'bG9yZW0g' * n}\n"),
+    "nested_dicts": (
+        25,
+        lambda n: "".join(
+            f"section_{i}:\n\tsub:\n\t\tvalue :int: {i}\n\tother :bool: true\n"
+            for i in range(n)
+        ),
+    ),
+    "template_chain": (
+        80,
+        lambda n: "".join(f"key_{i} :str: '{{key_{i + 1}}}'\n" for i in range(n))
+        + f"key_{n} :str: end\n",
+    ),
+}
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("construct", CONSTRUCTS)
+def test_load_time_grows_linearly(construct):
+    size, make_text = CONSTRUCTS[construct]
+    timings = [best_time(make_text(size * scale)) for scale in SCALES]
+    growth = timings[-1] / timings[0]
+    assert growth < MAX_GROWTH, (
+        f"loading {construct} at {SCALES[-1]}x the size took {growth:.1f}x as long "
+        f"({', '.join(f'{timing * 1000:.1f}ms' for timing in timings)})"
+    )
+
+
+@pytest.mark.parametrize("item", ("-", ">", ")"))
+def test_type_stack_does_not_grow_with_items(item):
+    lexer = Lexer("a :int:\n" + "".join(f"\t{item} {i}\n" for i in range(100)))
+    lexer.parse()
+    assert len(lexer._type_stack) <= 2
+
+
+def test_type_stack_is_unwound_after_item_block():
+    lexer = Lexer("a :int:\n\t- 1\n\t- 2\nb :int: 3\n")
+    lexer.parse()
+    assert len(lexer._type_stack) == 1
+
+
+def test_keys_after_item_block():
+    actual = thsl.loads("a :int:\n\t- 1\n\t- 2\nb :str: x\nc :int:\n\t) 1\nd :int: 4\n")
+    assert actual == {"a": [1, 2], "b": "x", "c": (1,), "d": 4}
+
+
+def test_rest_of_line_types_in_item_block():
+    actual = thsl.loads("a :str:\n\t- one two\n\t- three\nb :str:\n\t) four\n")
+    assert actual == {"a": ["one two", "three"], "b": ("four",)}
+
+
+NESTED = {
+    "block": lambda depth: "".join("\t" * i + "a:\n" for i in range(depth))
+    + "\t" * depth
+    + "v :int: 1\n",
+    "one_liner": lambda depth: "a: "
+    + "{a: " * (depth - 1)
+    + "{v :int: 1}"
+    + "}" * (depth - 1)
+    + "\n",
+    "instances": lambda depth: "@node:\n\tv :int: 0\n"
+    + "".join("\t" * i + "a :node:\n" for i in range(depth))
+    + "\t" * depth
+    + "v :int: 1\n",
+}
+
+
+@pytest.mark.parametrize("nesting", NESTED)
+@pytest.mark.parametrize("frozen", (False, True))
+def test_nesting_deeper_than_the_recursion_limit(nesting, frozen):
+    depth = sys.getrecursionlimit() * 3
+    actual = thsl.loads(NESTED[nesting](depth), frozen=frozen)
+    for _ in range(depth):
+        actual = actual["a"]
+    assert actual == {"v": 1}
@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+from thsl.src.decoder import get_decoder
+
+
+@dataclass(slots=True)
+class Resolution:
+    width: int
+    height: int
+
+
+@dataclass(slots=True)
+class Mode:
+    name: str
+
+
+@dataclass(slots=True)
+class Graphics:
+    target_framerate: float
+    resolution: Resolution
+    modes: list[Mode] = field(default_factory=list)
+    sizes: tuple[int, ...] = ()
+
+
+@dataclass
+class Settings:
+    debug: bool
+    graphics: Graphics
+    released: date | None = None
+    extra: Any = None
+
+
+TEXT = (
+    "debug :bool: true\n"
+    "graphics:\n"
+    "\ttarget_framerate :float: 59.9\n"
+    "\tresolution:\n"
+    "\t\twidth :int: 1920\n"
+    "\t\theight :int: 1080\n"
+    "\tmodes:\n"
+    '\t\t- {name :str: "low"}\n'
+    '\t\t- {name :str: "high"}\n'
+    "\tsizes :int: (1, 2)\n"
+    "released :date: 2023-01-02\n"
+)
+
+
+def test_into_dataclass():
+    actual = thsl.loads(TEXT, into=Settings)
+    expected = Settings(
+        debug=True,
+        graphics=Graphics(
+            target_framerate=59.9,
+            resolution=Resolution(width=1920, height=1080),
+            modes=[Mode("low"), Mode("high")],
+            sizes=(1, 2),
+        ),
+        released=date(2023, 1, 2),
+    )
+    assert actual == expected
+
+
+MINIMAL_TEXT = (
+    "debug :bool: false\n"
+    "graphics:\n"
+    "\ttarget_framerate :int: 30\n"
+    "\tresolution:\n"
+    "\t\twidth :int: 1\n"
+    "\t\theight :int: 2\n"
+)
+
+
+def test_into_keeps_defaults():
+    actual = thsl.loads(MINIMAL_TEXT, into=Settings)
+    assert actual.released is None
+    assert actual.graphics.modes == []
+    assert actual.graphics.target_framerate == 30
+
+
+def test_into_any_field():
+    actual = thsl.loads(MINIMAL_TEXT + "extra:\n\ta :int: 1\n", into=Settings)
+    assert actual.extra == {"a": 1}
+
+
+@dataclass(frozen=True)
+class Greeting:
+    name: str
+    greet: str
+    modes: list[Mode] = field(default_factory=list)
+    tags: tuple[str, ...] = ()
+
+
+def test_into_resolves_templates():
+    text = (
+        "name :str: app\n"
+        "greet :str: 'hi {name}'\n"
+        "modes:\n"
+        "\t- {name :str: 'low {greet}'}\n"
+        "tags :str:\n"
+        "\t) '{modes.0.name}'\n"
+        "\t) b\n"
+    )
+    actual = thsl.loads(text, into=Greeting)
+    assert actual == Greeting(
+        name="app",
+        greet="hi app",
+        modes=[Mode("low hi app")],
+        tags=("low hi app", "b"),
+    )
+    assert thsl.loads(text)["tags"] == actual.tags
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        "debug :int: 1\n",
+        "debug :bool: true\nunknown :int: 1\n",
+        'debug :bool: true\ngraphics:\n\tsizes :str: ("a", "b")\n',
+    ),
+)
+def test_into_rejects_mismatches(text):
+    with pytest.raises(ThslLoadError) as error:
+        thsl.loads(text, into=Settings)
+    assert isinstance(error.value.__cause__, TypeError)
+
+
+def test_into_requires_dataclass():
+    with pytest.raises(TypeError, match="is not a dataclass"):
+        thsl.loads("a :int: 1\n", into=dict)
+
+
+def test_decoders_are_cached():
+    assert get_decoder(Settings) is get_decoder(Settings)
+    assert get_decoder(Settings).fields["graphics"].decoder is get_decoder(Graphics)
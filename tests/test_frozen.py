@@ -0,0 +1,79 @@
+import pickle
+
+import pytest
+import thsl
+from thsl import FrozenDict
+
+TEXT = (
+    "a :int: 1\n"
+    "b:\n"
+    "\tc :int: (1, 2)\n"
+    "\td:\n"
+    "\t\t- {x :int: 1}\n"
+    "\t\t- {x :int: 2}\n"
+    "e :int:\n"
+    "\t) [1, 2]\n"
+    "f :int: <1, 2>\n"
+)
+
+
+def test_frozen_containers():
+    actual = thsl.loads(TEXT, frozen=True)
+    assert isinstance(actual, FrozenDict)
+    assert isinstance(actual["b"], FrozenDict)
+    assert actual["b"]["d"] == (FrozenDict({"x": 1}), FrozenDict({"x": 2}))
+    assert actual["e"] == ((1, 2),)
+    assert actual["f"] == frozenset({1, 2})
+
+
+def test_frozen_equals_mutable_load():
+    frozen = thsl.loads(TEXT, frozen=True)
+    assert frozen["b"]["c"] == thsl.loads(TEXT)["b"]["c"]
+    assert FrozenDict({"a": 1}) == {"a": 1}
+
+
+def test_frozen_is_read_only():
+    actual = thsl.loads(TEXT, frozen=True)
+    with pytest.raises(TypeError):
+        actual["a"] = 2  # type: ignore
+    with pytest.raises(AttributeError):
+        actual.update({"a": 2})  # type: ignore
+
+
+def test_frozen_is_hashable():
+    first = thsl.loads(TEXT, frozen=True)
+    second = thsl.loads(TEXT, frozen=True)
+    assert hash(first) == hash(second)
+    assert {first: "cached"}[second] == "cached"
+
+
+def test_frozen_with_shared_keys():
+    assert thsl.loads(TEXT, frozen=True, shared_keys=True) == thsl.loads(
+        TEXT,
+        frozen=True,
+    )
+
+
+def test_frozen_pickles():
+    actual = thsl.loads(TEXT, frozen=True)
+    assert pickle.loads(pickle.dumps(actual)) == actual
+
+
+def test_frozen_json():
+    actual = thsl.loads(TEXT, frozen=True)
+    assert thsl.dumps_json(actual) == (
+        '{"a":1,"b":{"c":[1,2],"d":[{"x":1},{"x":2}]},"e":[[1,2]],"f":[1,2]}'
+    )
+
+
+def test_frozen_array_backend():
+    assert thsl.loads("a :int: [1, 2]\n", frozen=True, array_backend="array") == {
+        "a": (1, 2),
+    }
+
+
+def test_frozen_numpy_backend():
+    pytest.importorskip("numpy")
+    actual = thsl.loads("a :int: [1, 2]\n", frozen=True, array_backend="numpy")
+    with pytest.raises(ValueError):
+        actual["a"][0] = 3
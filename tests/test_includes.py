@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+from thsl.src import includes
+from thsl.src.includes import IncludeGraph
+
+
+@pytest.fixture
+def documents(tmp_path):
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "db.thsl").write_text(
+        "host :str: localhost\nport :int: 5432\n",
+    )
+    (tmp_path / "app.thsl").write_text(
+        "name :str: app\n"
+        "primary :include: shared/db.thsl\n"
+        "replica :include: ./shared/db.thsl\n",
+    )
+    includes.clear_cache()
+    return tmp_path
+
+
+def test_include(documents):
+    actual = thsl.load(documents / "app.thsl")
+    assert actual == {
+        "name": "app",
+        "primary": {"host": "localhost", "port": 5432},
+        "replica": {"host": "localhost", "port": 5432},
+    }
+    assert actual["primary"] is not actual["replica"]
+
+
+def test_include_relative_to_the_including_file(documents):
+    (documents / "shared" / "pool.thsl").write_text("db :include: db.thsl\n")
+    actual = thsl.loads(f"pool :include: {documents / 'shared' / 'pool.thsl'}\n")
+    assert actual == {"pool": {"db": {"host": "localhost", "port": 5432}}}
+
+
+def test_include_parsed_once(documents, monkeypatch):
+    parsed = []
+    parse_cached = includes.parse_cached
+    monkeypatch.setattr(
+        "thsl.src.compiler.parse_cached",
+        lambda text, stats=None: parsed.append(text) or parse_cached(text, stats),
+    )
+    tokens = []
+    thsl.load(documents / "app.thsl", stats=lambda stats: tokens.append(stats.tokens))
+    thsl.load(documents / "app.thsl", stats=lambda stats: tokens.append(stats.tokens))
+    assert len(parsed) == 2
+    # the second load reuses the tree of the included file
+    assert tokens[1] < tokens[0]
+
+
+def test_changed_include_is_parsed_again(documents):
+    thsl.load(documents / "app.thsl")
+    (documents / "shared" / "db.thsl").write_text("host :str: db.internal\n")
+    actual = thsl.load(documents / "app.thsl")
+    assert actual["replica"] == {"host": "db.internal"}
+
+
+def test_include_graph():
+    graph = IncludeGraph(Path("a.thsl"))
+    graph.enter(graph.resolve("b.thsl"))
+    with pytest.raises(ValueError, match="Include cycle"):
+        graph.enter(Path("a.thsl").resolve())
+    graph.exit()
+    assert graph.dependencies == {Path("a.thsl").resolve(): [Path("b.thsl").resolve()]}
+
+
+def test_include_cycle(tmp_path):
+    (tmp_path / "a.thsl").write_text("b :include: b.thsl\n")
+    (tmp_path / "b.thsl").write_text("a :include: a.thsl\n")
+    with pytest.raises(ThslLoadError) as raised:
+        thsl.load(tmp_path / "a.thsl")
+    assert isinstance(raised.value.__cause__, ValueError)
+
+
+def test_include_into_dataclass(documents):
+    @dataclass
+    class Database:
+        host: str
+        port: int
+
+    @dataclass
+    class App:
+        name: str
+        primary: Database
+        replica: dict
+
+    actual = thsl.load(documents / "app.thsl", into=App)
+    assert actual.primary == Database("localhost", 5432)
+    assert actual.replica == {"host": "localhost", "port": 5432}
+
+
+@pytest.mark.parametrize(
+    ("only", "expected"),
+    (
+        (["primary"], {"primary": {"host": "localhost", "port": 5432}}),
+        (["replica.port", "name"], {"name": "app", "replica": {"port": 5432}}),
+    ),
+)
+def test_include_only(documents, only, expected):
+    assert thsl.load(documents / "app.thsl", only=only) == expected
+
+
+def test_include_only_templates(documents):
+    (documents / "greeting.thsl").write_text(
+        "text :str: 'on {primary.host}'\nprimary :include: shared/db.thsl\n",
+    )
+    actual = thsl.load(documents / "greeting.thsl", only=["text"])
+    assert actual == {"text": "on localhost"}
+
+
+def test_include_iterparse_errors(documents):
+    with pytest.raises(ThslLoadError) as raised:
+        list(thsl.iterparse(documents / "app.thsl"))
+    assert isinstance(raised.value.__cause__, ValueError)
+    assert "primary" in str(raised.value.__cause__)
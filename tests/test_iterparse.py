@@ -0,0 +1,170 @@
+import math
+from pathlib import Path
+
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+from thsl.src.event_parser import EventType
+from thsl.src.grammar import ScalarDataType
+
+DATA_DIR = Path(__file__).parent / "data"
+
+STARTS = {
+    EventType.START_DICT: dict,
+    EventType.START_LIST: list,
+    EventType.START_SET: set,
+    EventType.START_TUPLE: tuple,
+}
+
+
+def build(events):
+    stack = []
+    root = None
+    for event in events:
+        if event.type == EventType.KEY:
+            continue
+        if event.type in STARTS:
+            stack.append(
+                (STARTS[event.type], {} if event.type == EventType.START_DICT else [])
+            )
+            continue
+        if event.type == EventType.END_COLLECTION:
+            collection_type, items = stack.pop()
+            value = items if collection_type in (dict, list) else collection_type(items)
+        else:
+            value = event.value
+        if not stack:
+            root = value
+        elif isinstance(stack[-1][1], dict):
+            stack[-1][1][event.path[-1]] = value
+        else:
+            stack[-1][1].append(value)
+    return root
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    (
+        "bool.thsl",
+        "dict.thsl",
+        "dict_one_liner.thsl",
+        "int.thsl",
+        "list.thsl",
+        "list_of_dicts.thsl",
+        "list_one_liner.thsl",
+        "set.thsl",
+        "set_one_liner.thsl",
+        "str.thsl",
+        "str_multi_line.thsl",
+        "tuple.thsl",
+        "tuple_one_liner.thsl",
+        "url.thsl",
+        "user_types.thsl",
+        "version.thsl",
+    ),
+)
+def test_events_rebuild_load(file_name):
+    expected = thsl.load(DATA_DIR / file_name)
+    assert build(thsl.iterparse(DATA_DIR / file_name)) == expected
+
+
+def test_events_rebuild_load_nan():
+    actual = build(thsl.iterparse(DATA_DIR / "float_nan.thsl"))
+    assert all(math.isnan(value) for value in actual.values())
+
+
+def test_event_order():
+    events = list(thsl.iterparse("a:\n\tb :int: 1\nc :str:\n\t- x\n"))
+    assert [(event.type, event.path) for event in events] == [
+        (EventType.START_DICT, ()),
+        (EventType.KEY, ("a",)),
+        (EventType.START_DICT, ("a",)),
+        (EventType.KEY, ("a", "b")),
+        (EventType.VALUE, ("a", "b")),
+        (EventType.END_COLLECTION, ("a",)),
+        (EventType.KEY, ("c",)),
+        (EventType.START_LIST, ("c",)),
+        (EventType.VALUE, ("c", 0)),
+        (EventType.END_COLLECTION, ("c",)),
+        (EventType.END_COLLECTION, ()),
+    ]
+    assert events[4].data_type == ScalarDataType.INT
+    assert events[4].value == 1
+
+
+def test_user_type_events():
+    text = "@point:\n\tx :int: 0\n\ty :int: 0\nmoved :point:\n\ty :int: 3\n"
+    events = list(thsl.iterparse(text))
+    assert [(event.type, event.path, event.value) for event in events] == [
+        (EventType.START_DICT, (), None),
+        (EventType.KEY, ("moved",), "moved"),
+        (EventType.START_DICT, ("moved",), None),
+        (EventType.KEY, ("moved", "y"), "y"),
+        (EventType.VALUE, ("moved", "y"), 3),
+        (EventType.KEY, ("moved", "x"), "x"),
+        (EventType.VALUE, ("moved", "x"), 0),
+        (EventType.END_COLLECTION, ("moved",), None),
+        (EventType.END_COLLECTION, (), None),
+    ]
+    assert events[2].data_type == "point"
+
+
+def test_user_type_errors():
+    with pytest.raises(ThslLoadError) as raised:
+        list(thsl.iterparse("@a -> missing:\n\tx :int: 1\n"))
+    assert isinstance(raised.value.__cause__, TypeError)
+
+
+def test_events_are_produced_lazily():
+    text = "".join(f"key_{i} :int: {i}\n" for i in range(1000)) + "broken :int: [\n"
+    events = thsl.iterparse(text)
+    assert next(events).type == EventType.START_DICT
+    assert next(events).value == "key_0"
+    assert next(events).value == 0
+    with pytest.raises(ThslLoadError):
+        list(events)
+
+
+def test_iterparse_file_object():
+    with (DATA_DIR / "int.thsl").open() as open_file:
+        actual = build(thsl.iterparse(open_file))
+    assert actual == thsl.load(DATA_DIR / "int.thsl")
+
+
+def test_iter_items():
+    expected = thsl.load(DATA_DIR / "list.thsl")["homogeneous_list"]
+    actual = list(thsl.iter_items(DATA_DIR / "list.thsl", "homogeneous_list"))
+    assert actual == expected
+
+
+def test_iter_items_nested_path():
+    text = "a:\n\tb :int:\n\t\t- 1\n\t\t- 2\nc :int: 3\n"
+    assert list(thsl.iter_items(text, "a.b")) == [1, 2]
+    assert list(thsl.iter_items(text, ("a", "b"))) == [1, 2]
+
+
+def test_iter_items_of_dicts():
+    expected = thsl.load(DATA_DIR / "list_of_dicts.thsl")
+    key, items = next(iter(expected.items()))
+    assert list(thsl.iter_items(DATA_DIR / "list_of_dicts.thsl", key)) == items
+
+
+def test_iter_items_batches():
+    text = "a :int:\n" + "".join(f"\t- {i}\n" for i in range(10))
+    actual = list(thsl.iter_items(text, "a", batch_size=4))
+    assert actual == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_iter_items_stops_after_the_list():
+    text = "a :int:\n\t- 1\n\t- 2\nbroken :int: [\n"
+    assert list(thsl.iter_items(text, "a")) == [1, 2]
+
+
+def test_iter_items_does_not_cast_other_keys():
+    text = "a :ip: 999.1.1.1\nb :int:\n\t- 1\n"
+    assert list(thsl.iter_items(text, "b")) == [1]
+
+
+def test_iter_items_missing_key():
+    with pytest.raises(KeyError):
+        list(thsl.iter_items("a :int: 1\n", "a"))
@@ -0,0 +1,148 @@
+import datetime
+import io
+import json
+from collections import namedtuple
+from decimal import Decimal
+from ipaddress import IPv4Address
+from pathlib import Path
+
+import pytest
+import semantic_version
+import thsl
+from thsl.src.json_encoder import JsonEncoder
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def test_plain_values():
+    data = {"debug": True, "num": -3, "name": "Frank", "ratio": 0.5, "nothing": None}
+    assert json.loads(thsl.dumps_json(data)) == data
+
+
+def test_nested_collections():
+    data = {"graphics": {"resolution": {"width": 1920}, "modes": [1, 2, (3, 4)]}}
+    expected = {"graphics": {"resolution": {"width": 1920}, "modes": [1, 2, [3, 4]]}}
+    assert json.loads(thsl.dumps_json(data)) == expected
+
+
+def test_empty_collections():
+    data = {"a": {}, "b": [], "c": ()}
+    assert thsl.dumps_json(data) == '{"a":{},"b":[],"c":[]}'
+
+
+def test_namedtuple_is_an_array():
+    point = namedtuple("point", ["x", "y"])
+    assert thsl.dumps_json({"n": point(1, 2)}) == '{"n":[1,2]}'
+
+
+def test_lossy_without_type_tags():
+    data = {
+        "a_decimal": Decimal("4.2"),
+        "birthday": datetime.date(1986, 2, 10),
+        "ip_address": IPv4Address("192.168.1.1"),
+        "infinity": float("inf"),
+    }
+    expected = {
+        "a_decimal": "4.2",
+        "birthday": "1986-02-10",
+        "ip_address": "192.168.1.1",
+        "infinity": "inf",
+    }
+    assert json.loads(thsl.dumps_json(data)) == expected
+
+
+def test_type_tags():
+    data = {
+        "a_decimal": Decimal("4.2"),
+        "my_version": semantic_version.Version("3.2.1"),
+        "my_tuple": (1, 2),
+        "num": 1,
+    }
+    expected = {
+        "a_decimal": {"$type": "dec", "value": "4.2"},
+        "my_version": {"$type": "semver", "value": "3.2.1"},
+        "my_tuple": {"$type": "tuple", "value": [1, 2]},
+        "num": 1,
+    }
+    assert json.loads(thsl.dumps_json(data, type_tags=True)) == expected
+
+
+def test_type_tags_round_trip_through_thsl_types():
+    data = thsl.load(DATA_DIR / "url.thsl")
+    data.update(thsl.load(DATA_DIR / "range.thsl"))
+    data.update(thsl.load(DATA_DIR / "complex.thsl"))
+    data.update(thsl.load(DATA_DIR / "base64.thsl"))
+    expected = {
+        "my_page": {"$type": "url", "value": "http://www.example.com/index.html"},
+        "my_range": {"$type": "range", "value": "1..5"},
+        "a_complex": {"$type": "complex", "value": "3-2i"},
+        "base_64": {"$type": "base64", "value": "VGhlIFNwYW5pc2ggSW5xdWlzaXRpb24h"},
+    }
+    assert json.loads(thsl.dumps_json(data, type_tags=True)) == expected
+
+
+def test_dump_writes_in_chunks():
+    data = {"items": list(range(1000))}
+    writes = []
+
+    class Recorder(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    file = Recorder()
+    JsonEncoder(chunk_size=256).dump(data, file)
+    assert len(writes) > 1
+    assert json.loads(file.getvalue()) == data
+
+
+def test_dump_json_to_path(tmp_path):
+    output = tmp_path / "out.json"
+    thsl.dump_json(thsl.load(DATA_DIR / "dict.thsl"), output)
+    assert json.loads(output.read_text()) == {
+        "graphics": {
+            "fullscreen": False,
+            "resolution": {"height": 1080, "width": 1920},
+            "target_framerate": 60,
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    (
+        "dict.thsl",
+        "list_of_dicts.thsl",
+        "str_single_quotes.thsl",
+        "tuple.thsl",
+        "url.thsl",
+        "user_types.thsl",
+    ),
+)
+@pytest.mark.parametrize("type_tags", (False, True))
+def test_stream_json_matches_dump_json(file_name, type_tags):
+    file = io.StringIO()
+    thsl.stream_json(DATA_DIR / file_name, file, type_tags=type_tags)
+    expected = thsl.dumps_json(thsl.load(DATA_DIR / file_name), type_tags=type_tags)
+    assert json.loads(file.getvalue()) == json.loads(expected)
+
+
+def test_stream_json_sets():
+    file = io.StringIO()
+    text = "a :int:\n\t> 1\n\t> 2\n\t> 1\nb :int: <3>\n"
+    thsl.stream_json(text, file, type_tags=True)
+    assert json.loads(file.getvalue()) == {
+        "a": {"$type": "set", "value": [1, 2]},
+        "b": {"$type": "set", "value": [3]},
+    }
+
+
+def test_stream_json_to_path(tmp_path):
+    output = tmp_path / "out.json"
+    thsl.stream_json(DATA_DIR / "dict.thsl", output)
+    assert json.loads(output.read_text()) == thsl.load(DATA_DIR / "dict.thsl")
+
+
+def test_stream_json_templates():
+    with pytest.raises(ValueError, match="template at b can not be resolved"):
+        thsl.stream_json("a :str: x\nb :str: '{a}'\n", io.StringIO())
@@ -154,6 +154,10 @@ string is
             "This\nstring is\n    on multiple\n         lines.\n",
             2,
         ),
+        ('my_value :str: "say \\"hi\\""\n', 'say "hi"', 2),
+        ("my_value :str: 'it\\'s'\n", "it's", 2),
+        ("my_value :str: continued \\\n line\n", "continued \n line", 2),
+        ("my_value :str: before # comment\n", "before", 2),
         # (
         #     'my_value :str: escaping\\n new line\n',
         #     "escaping\n new line",
@@ -389,3 +393,36 @@ def test_tokenization(lexer):
     ]
     actual = lexer.parse()
     assert actual == expected
+
+
+class CharacterLexer(Lexer):
+    def _scan_simple_line(self):
+        return None
+
+
+@pytest.mark.parametrize(
+    "config",
+    (
+        "a :int: -12\nb :float: 1.5e3\nc :bool: true\n",
+        "name :str: Frank Drebin   \nurl :url: http://example.com/a?b=c\n",
+        "block:\n\tinner :int: 1\n\tdeeper:  \n\t\tvalue :dec: 4.2\nlast :int: 2",
+        "a :str: no newline at the end",
+        "not_simple :int: [1, 2,]\ncommented :int: 1 # comment\nkey :str: 'quoted'\n",
+        "a :bool: true  \nb :int: 1 \n",
+        "a :str: hello\r\nb :str: hi  \r\nblock:\r\n\tc :int: 1\r\n",
+    ),
+)
+def test_simple_lines(config):
+    def tokens(lexer):
+        return [
+            (token.type, token.value, token.line, token.indent, token.column)
+            for token in lexer.parse()
+        ]
+
+    assert tokens(Lexer(config)) == tokens(CharacterLexer(config))
+
+
+def test_trailing_spaces_end_the_value(lexer):
+    lexer.text = "a :int: 1  \nb :int: 2\n"
+    values = [token.value for token in lexer.parse() if token.type == TokenType.VALUE]
+    assert values == ["1", "2"]
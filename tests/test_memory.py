@@ -0,0 +1,100 @@
+import gc
+import tracemalloc
+
+import pytest
+import thsl
+from thsl.src.compiler import Compiler
+from thsl.src.lexer import Lexer
+from thsl.src.parser import Parser
+
+pytestmark = pytest.mark.slow
+
+# the most memory each stage may have in use at once per byte of input, about 1.5x
+# what they used when these were set
+SHAPES = {
+    "keys": (
+        1000,
+        lambda n: "".join(f"key_{i} :int: {i}\n" for i in range(n)),
+        {"lex": 60, "parse": 25, "compile": 25},
+    ),
+    "list_items": (
+        2000,
+        lambda n: "a :int:\n" + "".join(f"\t- {i}\n" for i in range(n)),
+        {"lex": 100, "parse": 30, "compile": 40},
+    ),
+    "list_one_liner": (
+        2000,
+        lambda n: "a :int: [" + ", ".join(str(i) for i in range(n)) + ",]\n",
+        {"lex": 110, "parse": 35, "compile": 55},
+    ),
+    "nested_dicts": (
+        250,
+        lambda n: "".join(
+            f"section_{i}:\n\tsub:\n\t\tvalue :int: {i}\n\tother :bool: true\n"
+            for i in range(n)
+        ),
+        {"lex": 60, "parse": 25, "compile": 20},
+    ),
+    "long_string": (
+        10000,
+        lambda n: f'a :str: "{"lorem ipsum " * n}"\n',
+        {"lex": 2, "parse": 1, "compile": 1},
+    ),
+}
+# the peaks at 4x the input may be at most this many times the peaks at 1x
+MAX_GROWTH = 6
+
+
+def peaks(text):
+    # keeping a load of the same text alive keeps its keys interned, so the peaks do not
+    # depend on when the interpreter's table of interned strings last grew
+    loaded = thsl.loads(text)
+    stages = {
+        "lex": lambda _: Lexer(text).parse(),
+        "parse": lambda tokens: Parser(text, tokens=tokens).parse(),
+        "compile": lambda tree: Compiler(text, tree=tree).compile(),
+    }
+    result = {}
+    subject = None
+    for name, stage in stages.items():
+        gc.collect()
+        tracemalloc.start()
+        try:
+            subject = stage(subject)
+            result[name] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    del loaded
+    return result
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    thsl.clear_cast_cache()
+    yield
+    thsl.clear_cast_cache()
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_peak_memory_per_byte(shape):
+    size, make_text, budgets = SHAPES[shape]
+    text = make_text(size)
+    num_bytes = len(text.encode("utf-8"))
+    for stage, peak in peaks(text).items():
+        assert peak / num_bytes <= budgets[stage], (
+            f"{stage} of {shape} peaked at {peak / num_bytes:.1f} bytes per input "
+            f"byte, the budget is {budgets[stage]}"
+        )
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_peak_memory_grows_linearly(shape):
+    size, make_text, _ = SHAPES[shape]
+    small = peaks(make_text(size))
+    thsl.clear_cast_cache()
+    large = peaks(make_text(size * 4))
+    for stage in small:
+        growth = large[stage] / small[stage]
+        assert growth < MAX_GROWTH, (
+            f"{stage} of {shape} at 4x the size peaked at {growth:.1f}x the memory"
+        )
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from thsl.__main__ import main
+from thsl.src.profiler import Profiler
+
+DATA_DIR = Path(__file__).parent / "data"
+
+CONFIG = """name :str: Frank
+dates :datetime:
+\t- 2020-01-01 12:00:00
+\t- 2020-01-02 12:00:00
+\t- 2020-01-03 12:00:00
+graphics:
+\tresolution:
+\t\twidth :int: 1920
+\tpattern :regex: colou?r
+"""
+
+
+def test_costs_are_attributed_to_key_paths():
+    report = Profiler(CONFIG).run()
+    assert set(report.costs) >= {
+        ("name",),
+        ("dates",),
+        ("graphics",),
+        ("graphics", "resolution"),
+        ("graphics", "resolution", "width"),
+        ("graphics", "pattern"),
+    }
+    assert report.costs[("dates",)].casts == 3
+    assert report.costs[("graphics", "resolution", "width")].casts == 1
+    assert report.costs[("graphics",)].casts == 0
+
+
+def test_every_stage_is_measured():
+    report = Profiler(CONFIG).run()
+    dates = report.costs[("dates",)]
+    assert dates.lex_seconds > 0
+    assert dates.parse_seconds > 0
+    assert dates.cast_seconds > 0
+    assert dates.total_bytes > 0
+
+
+def test_without_memory():
+    report = Profiler(CONFIG, memory=False).run()
+    assert all(cost.total_bytes == 0 for cost in report.costs.values())
+
+
+def test_ranked():
+    report = Profiler(CONFIG, memory=False).run()
+    ranked = report.ranked()
+    totals = [cost.total_seconds for _, cost in ranked]
+    assert totals == sorted(totals, reverse=True)
+    assert len(report.ranked(limit=2)) == 2
+
+
+def test_list_of_dicts():
+    report = Profiler((DATA_DIR / "list_of_dicts.thsl").read_text()).run()
+    assert report.costs[("list_of_dicts", "one")].casts == 1
+    assert report.costs[("list_of_dicts", "two")].casts == 1
+
+
+def test_profile_command(capsys, tmp_path):
+    config = tmp_path / "config.thsl"
+    config.write_text(CONFIG)
+    assert main(["profile", str(config), "--limit", "3", "--no-memory"]) == 0
+    output = capsys.readouterr().out.splitlines()
+    assert output[0].startswith("key")
+    assert len(output) == 4
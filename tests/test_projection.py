@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+
+TEXT = (
+    "debug :bool: true\n"
+    "other:\n"
+    "\tx :int: 1\n"
+    "\ty :int:\n"
+    "\t\t- 1\n"
+    "\t\t- 2\n"
+    "graphics:\n"
+    "\tpattern :regex: [a-z]+\n"
+    "\tresolution:\n"
+    "\t\twidth :int: 1920\n"
+    "\t\theight :int: 1080\n"
+    "\tsizes :int: [1, 2]\n"
+    "name :str: hi\n"
+)
+
+
+@pytest.mark.parametrize(
+    ("only", "expected"),
+    (
+        (
+            ["graphics.resolution", "debug"],
+            {"debug": True, "graphics": {"resolution": {"width": 1920, "height": 1080}}},
+        ),
+        (
+            ["graphics.resolution.width", "other.y"],
+            {"other": {"y": [1, 2]}, "graphics": {"resolution": {"width": 1920}}},
+        ),
+        (["graphics.sizes", "name"], {"graphics": {"sizes": [1, 2]}, "name": "hi"}),
+        (["missing"], {}),
+    ),
+)
+def test_only(only, expected):
+    assert thsl.loads(TEXT, only=only) == expected
+
+
+def test_only_matches_full_load():
+    full = thsl.loads(TEXT)
+    assert thsl.loads(TEXT, only=["graphics"]) == {"graphics": full["graphics"]}
+
+
+def test_only_skips_unrelated_blocks_unlexed():
+    text = "skipped:\n\tbroken :no_such_type: 1\nwanted :int: 1\n"
+    assert thsl.loads(text, only=["wanted"]) == {"wanted": 1}
+
+
+def test_only_stops_after_the_last_root_key():
+    text = "wanted :int: 1\n\t\tbroken :no_such_type: 1\n"
+    assert thsl.loads(text, only=["wanted"]) == {"wanted": 1}
+
+
+def test_only_reads_quoted_blocks():
+    text = 'skipped:\n\tquoted :str: "a\nb"\nwanted :int: 1\n'
+    assert thsl.loads(text, only=["wanted"]) == {"wanted": 1}
+
+
+def test_only_user_types():
+    path = Path(__file__).parent / "data" / "user_types.thsl"
+    full = thsl.load(path)
+    assert thsl.load(path, only=["lifted", "moved.y"]) == {
+        "moved": {"y": full["moved"]["y"]},
+        "lifted": full["lifted"],
+    }
+
+
+def test_only_errors():
+    with pytest.raises(ThslLoadError):
+        thsl.loads("wanted :int: x\n", only=["wanted"])
+    with pytest.raises(ValueError, match="can not be combined"):
+        thsl.loads(TEXT, only=["debug"], frozen=True)
+
+
+TEMPLATES = (
+    "name :str: app\n"
+    "other:\n"
+    "\tgreet :str: 'hi {name}'\n"
+    "\tx :int: 1\n"
+    "modes :str:\n"
+    "\t- '{other.greet}!'\n"
+    "\t- b\n"
+    "tags :str:\n"
+    "\t) '{modes.0} {other.x}'\n"
+    "\t) '\\{x\\}'\n"
+)
+
+
+@pytest.mark.parametrize(
+    ("only", "expected"),
+    (
+        (["other.greet"], {"other": {"greet": "hi app"}}),
+        (["modes"], {"modes": ["hi app!", "b"]}),
+        (["tags", "name"], {"name": "app", "tags": ("hi app! 1", "{x}")}),
+    ),
+)
+def test_only_resolves_templates(only, expected):
+    assert thsl.loads(TEMPLATES, only=only) == expected
+
+
+def test_only_template_errors():
+    with pytest.raises(ThslLoadError) as error:
+        thsl.loads("a :str: '{missing}'\nb :int: 1\n", only=["a"])
+    assert isinstance(error.value.__cause__, KeyError)
@@ -0,0 +1,117 @@
+import sys
+
+import pytest
+import thsl
+from thsl import Changes, FrozenDict
+from thsl.exceptions import ThslLoadError
+from thsl.src.shared_keys import share_keys
+
+OLD = (
+    "name :str: app\n"
+    "ratio :float: nan\n"
+    "database:\n"
+    "\thost :str: localhost\n"
+    "\tport :int: 5432\n"
+    "graphics:\n"
+    "\tresolution:\n"
+    "\t\twidth :int: 1920\n"
+    "\t\theight :int: 1080\n"
+    "\tsizes :int: [1, 2, 3,]\n"
+)
+
+
+def test_reload_reuses_unchanged_subtrees():
+    old = thsl.loads(OLD)
+    new, changes = thsl.reload(
+        old,
+        OLD.replace("5432", "5433") + "debug :bool: true\n",
+    )
+    assert new["database"] == {"host": "localhost", "port": 5433}
+    assert new["debug"] is True
+    assert new["ratio"] is old["ratio"]
+    assert new["graphics"] is old["graphics"]
+    assert new["database"] is not old["database"]
+    assert new["database"]["host"] is old["database"]["host"]
+    assert changes == Changes(added=[("debug",)], changed=[("database", "port")])
+
+
+def test_reload_unchanged_document():
+    old = thsl.loads(OLD)
+    new, changes = thsl.reload(old, OLD)
+    assert new is old
+    assert not changes
+
+
+def test_reload_removed_and_retyped_keys():
+    old = thsl.loads(OLD)
+    new, changes = thsl.reload(
+        old,
+        "name :str: app\nratio :float: nan\ndatabase :str: sqlite\n",
+    )
+    assert new["database"] == "sqlite"
+    assert changes.removed == [("graphics",)]
+    assert changes.changed == [("database",)]
+
+
+def test_reload_frozen():
+    old = thsl.loads(OLD, frozen=True)
+    new, changes = thsl.reload(old, OLD.replace("1080", "1200"))
+    assert isinstance(new, FrozenDict)
+    assert new["database"] is old["database"]
+    assert new["graphics"]["sizes"] is old["graphics"]["sizes"]
+    assert changes.changed == [("graphics", "resolution", "height")]
+
+
+@pytest.mark.parametrize(
+    ("before", "after"),
+    (
+        ("a :float: 0.0\n", "a :float: -0.0\n"),
+        ("a :dec: 1.0\n", "a :dec: 1.00\n"),
+    ),
+)
+def test_reload_equal_numbers_that_differ(before, after):
+    new, changes = thsl.reload(thsl.loads(before), after)
+    assert repr(new["a"]) == repr(thsl.loads(after)["a"])
+    assert changes.changed == [("a",)]
+
+
+def test_reload_deeper_than_the_recursion_limit():
+    depth = sys.getrecursionlimit() * 3
+    text = "".join("\t" * i + "a:\n" for i in range(depth)) + "\t" * depth
+    old = thsl.loads(text + "v :int: 1\n")
+    new, changes = thsl.reload(old, text + "v :int: 2\n")
+    assert changes.changed == [("a",) * depth + ("v",)]
+    for _ in range(depth):
+        new = new["a"]
+    assert new == {"v": 2}
+
+
+def test_reload_only_dicts():
+    with pytest.raises(TypeError):
+        thsl.reload([1, 2], "a :int: 1\n")
+
+
+def test_reload_error():
+    with pytest.raises(ThslLoadError):
+        thsl.reload({}, "a :int: x\n")
+
+
+@pytest.mark.parametrize("frozen", (False, True))
+def test_reload_shared_keys(monkeypatch, frozen):
+    shared = []
+
+    def spy(data):
+        shared.append(list(data))
+        return share_keys(data)
+
+    monkeypatch.setattr("thsl.src.shared_keys.share_keys", spy)
+    old = thsl.loads(OLD, frozen=frozen)
+    old_resolution = old["graphics"]["resolution"]
+    text = OLD.replace("5432", "5433")
+    new, changes = thsl.reload(old, text, shared_keys=True)
+    assert new["database"] == {"host": "localhost", "port": 5433}
+    assert new["graphics"] is old["graphics"]
+    assert old["graphics"]["resolution"] is old_resolution
+    assert changes.changed == [("database", "port")]
+    # only the dicts that were loaded again are shared, not the old ones kept
+    assert shared == [list(new), ["host", "port"]]
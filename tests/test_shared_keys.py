@@ -0,0 +1,42 @@
+import thsl
+from thsl.src.shared_keys import share_keys
+
+TEXT = (
+    "graphics:\n"
+    "\tresolution:\n"
+    "\t\twidth :int: 1920\n"
+    "\t\theight :int: 1080\n"
+    "\tsizes :int: (1, 2)\n"
+    "\tmodes:\n"
+    '\t\t- {name :str: "low"}\n'
+    '\t\t- {name :str: "high"}\n'
+)
+
+
+def test_shared_keys_load_the_same_data():
+    assert thsl.loads(TEXT, shared_keys=True) == thsl.loads(TEXT)
+
+
+def test_keys_are_interned_across_documents():
+    first = thsl.loads("graphics :int: 1\n")
+    second = thsl.loads("graphics :int: 2\n")
+    assert next(iter(first)) is next(iter(second))
+
+
+def test_shared_keys_share_key_objects():
+    first = thsl.loads(TEXT, shared_keys=True)
+    second = thsl.loads(TEXT, shared_keys=True)
+    first_keys = list(first["graphics"]["resolution"])
+    second_keys = list(second["graphics"]["resolution"])
+    assert all(a is b for a, b in zip(first_keys, second_keys))
+
+
+def test_share_keys_keeps_order_and_values():
+    shared = share_keys({"b": 1, "a": [2]})
+    assert type(shared) is dict
+    assert list(shared.items()) == [("b", 1), ("a", [2])]
+
+
+def test_share_keys_leaves_non_str_keys():
+    data = {1: "one"}
+    assert share_keys(data) is data
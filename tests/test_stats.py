@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import thsl
+from thsl.src.grammar import ScalarDataType
+from thsl.src.stats import count_nodes, LoadStats
+from thsl.src.parser import Parser
+
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def load_with_stats(file_name):
+    collected = []
+    actual = thsl.load(DATA_DIR / file_name, stats=collected.append)
+    assert len(collected) == 1
+    return actual, collected[0]
+
+
+def test_stats_callback():
+    actual, stats = load_with_stats("dict.thsl")
+    assert actual["graphics"]["resolution"]["width"] == 1920
+    assert isinstance(stats, LoadStats)
+    assert stats.lex_seconds > 0
+    assert stats.parse_seconds > 0
+    assert stats.compile_seconds > 0
+    assert stats.total_seconds >= stats.cast_seconds
+
+
+def test_token_and_node_counts():
+    _, stats = load_with_stats("bool.thsl")
+    # KEY, TYPE, VALUE, NEWLINE, EOF
+    assert stats.tokens == 5
+    # root Collection, Key, Value
+    assert stats.nodes == 3
+
+
+def test_cast_counts_per_type():
+    _, stats = load_with_stats("dict.thsl")
+    assert set(stats.casts) == {ScalarDataType.INT, ScalarDataType.BOOL}
+    assert stats.casts[ScalarDataType.INT].count == 3
+    assert stats.casts[ScalarDataType.BOOL].count == 1
+    assert stats.casts[ScalarDataType.INT].seconds > 0
+
+
+def test_list_items_are_counted():
+    _, stats = load_with_stats("list.thsl")
+    assert stats.casts[ScalarDataType.INT].count == 4
+
+
+def test_count_nodes():
+    tree = Parser("a:\n\tb :int: 1\n\tc :int: [1, 2]\n").parse()
+    # root, a, a's dict, b, 1, c, c's list, 1, 2
+    assert count_nodes(tree) == 9
+
+
+def test_no_stats_by_default():
+    compiler = thsl.Compiler("debug :bool: true\n")
+    assert compiler.stats is None
+    assert compiler.compile() == {"debug": True}
@@ -0,0 +1,61 @@
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+from thsl.src.templating import compile_template
+
+
+def test_compile_template():
+    assert compile_template("a {b.c} \\{d\\}") == ("a ", ("b", "c"), " {d}")
+
+
+@pytest.mark.parametrize("text", ("{a", "a}", "{}"))
+def test_compile_template_errors(text):
+    with pytest.raises(SyntaxError):
+        compile_template(text)
+
+
+def test_templates_resolve_in_dependency_order():
+    actual = thsl.loads(
+        "a :str: '{b}-{c.d}'\n"
+        "b :str: '{c.d}!'\n"
+        "c:\n"
+        "\td :int: 3\n"
+        "e :str:\n"
+        "\t- '{a}'\n"
+        "\t- x\n"
+        "f :str: '{e.1}'\n",
+    )
+    assert actual == {
+        "a": "3!-3",
+        "b": "3!",
+        "c": {"d": 3},
+        "e": ["3!-3", "x"],
+        "f": "x",
+    }
+
+
+def test_templates_in_frozen_tuples():
+    actual = thsl.loads("a :str:\n\t) '{b}'\nb :int: 1\n", frozen=True)
+    assert actual == {"a": ("1",), "b": 1}
+
+
+def test_long_template_chain():
+    size = 2000
+    text = "".join(f"key_{i} :str: '{{key_{i + 1}}}'\n" for i in range(size))
+    actual = thsl.loads(text + f"key_{size} :str: end\n")
+    assert actual["key_0"] == "end"
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    (
+        ("a :str: '{b}'\nb :str: '{c}'\nc :str: '{a}'\n", ValueError),
+        ("a :str: '{a}'\n", ValueError),
+        ("a :str: '{missing}'\n", KeyError),
+        ("a :str: '{b}'\nb:\n\tc :int: 1\n", TypeError),
+    ),
+)
+def test_template_errors(text, error):
+    with pytest.raises(ThslLoadError) as raised:
+        thsl.loads(text)
+    assert isinstance(raised.value.__cause__, error)
@@ -0,0 +1,79 @@
+import dataclasses
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import thsl
+from thsl.src import decoder
+
+DATA_DIR = Path(__file__).parent / "data"
+THREADS = 8
+ROUNDS = 4
+
+# documents whose values are the same on every load
+STABLE_FILES = sorted(
+    path
+    for path in DATA_DIR.glob("*.thsl")
+    if path.stem not in ("date", "datetime", "env", "time")
+)
+
+
+def load_or_error(path):
+    # compared by repr, nan is not equal to itself
+    try:
+        return repr(thsl.load(path))
+    except Exception as error:  # noqa: BLE001
+        return type(error)
+
+
+def test_concurrent_loads_match_sequential_loads():
+    expected = [load_or_error(path) for path in STABLE_FILES]
+    barrier = threading.Barrier(THREADS)
+
+    def run():
+        barrier.wait()
+        return [
+            [load_or_error(path) for path in STABLE_FILES] for _ in range(ROUNDS)
+        ]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        futures = [executor.submit(run) for _ in range(THREADS)]
+        for future in futures:
+            assert all(actual == expected for actual in future.result())
+
+
+def test_load_many():
+    texts = [f"key_{i} :int: {i}\n" for i in range(50)]
+    actual = thsl.load_many(texts, max_workers=4)
+    assert actual == [{f"key_{i}": i} for i in range(50)]
+
+
+def test_load_many_passes_options():
+    actual = thsl.load_many(["a :int: [1, 2]\n"] * 3, frozen=True)
+    assert actual == [thsl.FrozenDict({"a": (1, 2)})] * 3
+
+
+@dataclasses.dataclass
+class Inner:
+    value: int
+
+
+@dataclasses.dataclass
+class Outer:
+    inner: Inner
+
+
+def test_decoders_are_compiled_once_across_threads(monkeypatch):
+    monkeypatch.setattr(decoder, "_DECODERS", {})
+    barrier = threading.Barrier(THREADS)
+
+    def run():
+        barrier.wait()
+        return thsl.loads("inner:\n\tvalue :int: 1\n", into=Outer)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(lambda _: run(), range(THREADS)))
+    assert results == [Outer(Inner(1))] * THREADS
+    assert decoder.get_decoder(Outer).fields["inner"].decoder is decoder.get_decoder(
+        Inner,
+    )
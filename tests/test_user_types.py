@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+import thsl
+from thsl import FrozenDict
+from thsl.exceptions import ThslLoadError
+
+DATA = Path(__file__).parent / "data"
+
+
+def test_user_types():
+    actual = thsl.load(DATA / "user_types.thsl")
+    assert actual == {
+        "origin": {"x": 0, "y": 0, "label": "origin"},
+        "moved": {"x": 3, "y": 0, "label": "origin"},
+        "lifted": {"x": 0, "y": 0, "label": "origin in space", "z": 2},
+    }
+
+
+def test_instances_share_immutable_defaults():
+    actual = thsl.loads(
+        "@entry:\n"
+        "\tname :str: unnamed\n"
+        "\ttags :int: [1, 2,]\n"
+        "\tlimits:\n"
+        "\t\tmax :int: 10\n"
+        "a :entry:\n"
+        "b :entry:\n",
+    )
+    assert actual["a"]["name"] is actual["b"]["name"]
+    assert actual["a"]["tags"] is not actual["b"]["tags"]
+    actual["a"]["limits"]["max"] = 20
+    assert actual["b"]["limits"] == {"max": 10}
+
+
+def test_frozen_instances_share_nested_defaults():
+    actual = thsl.loads(
+        "@entry:\n\tlimits:\n\t\tmax :int: 10\na :entry:\nb :entry:\n",
+        frozen=True,
+    )
+    assert isinstance(actual["a"], FrozenDict)
+    assert actual["a"]["limits"] is actual["b"]["limits"]
+
+
+def test_type_names_do_not_clash_with_keys():
+    actual = thsl.loads("@point:\n\tx :int: 0\npoint :point:\n")
+    assert actual == {"point": {"x": 0}}
+
+
+def test_many_instances():
+    size = 1000
+    text = "@item:\n\ta :int: 1\n\tb :str: default\n" + "".join(
+        f"key_{i} :item: {{a :int: {i}}}\n" for i in range(size)
+    )
+    actual = thsl.loads(text)
+    assert len(actual) == size
+    assert actual[f"key_{size - 1}"] == {"a": size - 1, "b": "default"}
+
+
+def test_declarations_leave_earlier_tuples_pending():
+    actual = thsl.loads(
+        "name :str: bob\n"
+        "greeting :str:\n"
+        "\t) 'hi {name}'\n"
+        "\t) 'bye'\n"
+        "@point:\n"
+        "\tx :int: 1\n"
+        "p :point:\n"
+        "\tx :int: 2\n",
+    )
+    assert actual["greeting"] == ("hi bob", "bye")
+    assert actual["p"] == {"x": 2}
+
+
+def test_user_types_into_dataclasses():
+    @dataclass
+    class Point:
+        x: int
+        y: int
+
+    @dataclass
+    class Line:
+        start: Point
+        end: Point
+
+    actual = thsl.loads(
+        "@point:\n\tx :int: 0\n\ty :int: 0\nstart :point:\nend :point: {x :int: 1}\n",
+        into=Line,
+    )
+    assert actual == Line(Point(0, 0), Point(1, 0))
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    (
+        ("@a -> missing:\n\tx :int: 1\n", TypeError),
+        ("name :str: a\n@a:\n\tx :str: '{name}'\n", ValueError),
+    ),
+)
+def test_user_type_errors(text, error):
+    with pytest.raises(ThslLoadError) as raised:
+        thsl.loads(text)
+    assert isinstance(raised.value.__cause__, error)
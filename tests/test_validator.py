@@ -0,0 +1,109 @@
+import re
+from pathlib import Path
+
+import pytest
+import thsl
+from thsl.exceptions import ThslLoadError
+
+DATA = Path(__file__).parent / "data"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    thsl.clear_cast_cache()
+    yield
+    thsl.clear_cast_cache()
+
+
+def errors(text):
+    return [(error.line, error.column, error.message) for error in thsl.validate(text)]
+
+
+@pytest.mark.parametrize(
+    "path",
+    sorted(DATA.glob("*.thsl")),
+    ids=lambda path: path.stem,
+)
+def test_agrees_with_load(path):
+    try:
+        thsl.load(path)
+    except (ThslLoadError, SyntaxError, ValueError):
+        assert thsl.validate(path)
+    else:
+        assert thsl.validate(path) == []
+
+
+def test_every_value_error_is_reported():
+    text = (
+        "port :int: x\n"
+        "host :ip: 10.0.0.300\n"
+        "ok :int: 3\n"
+        "when :datetime: 2020-01-01 12:00:00 -6\n"
+        "ports :int: [80, http, 443]\n"
+        "nested:\n"
+        "\tflag :bool: maybe\n"
+        "\tpattern :regex: (ab\n"
+    )
+    assert [(line, column) for line, column, _ in errors(text)] == [
+        (1, 12),
+        (2, 11),
+        (5, 18),
+        (7, 14),
+        (8, 18),
+    ]
+    assert errors(text)[0][2] == (
+        "Invalid int value: invalid literal for int() with base 10: 'x'"
+    )
+
+
+def test_values_in_item_blocks_and_sets():
+    text = "a :int:\n\t- 1\n\t- xy\nb :int:\n\t> y\nc :semver: 1.2\n"
+    assert [(line, column) for line, column, _ in errors(text)] == [
+        (3, 4),
+        (5, 4),
+        (6, 12),
+    ]
+
+
+def test_lexer_syntax_error():
+    assert errors('a :int: 1\nb :str: "unterminated\n') == [
+        (2, 9, "Unterminated string"),
+    ]
+    assert errors("a :int: 1\n  b :int: 2\n") == [
+        (2, 1, "Only tab characters can indent"),
+    ]
+
+
+def test_parser_syntax_error():
+    assert errors("a :foo: 1\n") == [
+        (1, 7, "'foo' is not a valid CompoundDataType"),
+    ]
+
+
+def test_user_types():
+    text = (
+        "@screen:\n"
+        "\trate :int: 60\n"
+        "\tname :str: 'screen {rate}'\n"
+        "main :screen:\n"
+        "\trate :int: fast\n"
+    )
+    assert errors(text) == [
+        (3, 14, "The defaults of type 'screen' can not reference other keys"),
+        (5, 13, "Invalid int value: invalid literal for int() with base 10: 'fast'"),
+    ]
+    unknown = errors("@screen:\n\trate :int: 60\nside :window: {rate :int: 1}\n")
+    assert [message for _, _, message in unknown] == [
+        "'window' is not a valid CompoundDataType",
+    ]
+
+
+def test_nothing_is_built_or_cached():
+    text = "pattern :regex: ^[a-z]+$\nwhen :datetime: 2020-01-01\nhost :ip: 10.0.0.1\n"
+    re.compile("[0-9]+")
+    assert errors(text) == []
+    assert thsl.cast_cache_info().size == 0
+    cached = [key[1] for key in re._cache]  # noqa: SLF001
+    assert "^[a-z]+$" not in cached
+    # the patterns other code compiled stay cached
+    assert "[0-9]+" in cached
@@ -1,20 +1,297 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import TextIO
+from typing import Any, TextIO
 
 from thsl.exceptions import ThslLoadError
+from thsl.src.cast_cache import CacheInfo, CAST_CACHE
 from thsl.src.compiler import Compiler
+from thsl.src.decoder import DataclassCompiler
+from thsl.src.event_parser import Event, EventParser, EventType
+from thsl.src.frozen import FrozenDict
+from thsl.src.grammar import CompoundDataType
+from thsl.src.json_encoder import JsonEncoder
+from thsl.src.projection import project
+from thsl.src.reload import Changes, ReloadingCompiler
+from thsl.src.stats import CastStats, LoadStats
+from thsl.src.validator import ValidationError, Validator
 
+__all__ = [
+    "CacheInfo",
+    "cast_cache_info",
+    "CastStats",
+    "Changes",
+    "clear_cast_cache",
+    "Compiler",
+    "dump_json",
+    "dumps_json",
+    "Event",
+    "EventType",
+    "FrozenDict",
+    "iter_items",
+    "iterparse",
+    "load",
+    "load_many",
+    "loads",
+    "LoadStats",
+    "reload",
+    "StatsCallback",
+    "stream_json",
+    "ThslLoadError",
+    "validate",
+    "ValidationError",
+]
 
-def loads(text: str) -> dict:
-    compiler = Compiler(text)
+StatsCallback = Callable[[LoadStats], None]
+
+
+def loads(
+    text: str,
+    stats: StatsCallback | None = None,
+    array_backend: str | None = None,
+    shared_keys: bool = False,
+    frozen: bool = False,
+    into: type | None = None,
+    only: Iterable[str] | None = None,
+    cache_casts: bool = True,
+) -> Any:
+    return _loads(
+        text,
+        None,
+        stats,
+        array_backend,
+        shared_keys,
+        frozen,
+        into,
+        only,
+        cache_casts,
+    )
+
+
+def _loads(
+    text: str,
+    source: Path | None = None,
+    stats: StatsCallback | None = None,
+    array_backend: str | None = None,
+    shared_keys: bool = False,
+    frozen: bool = False,
+    into: type | None = None,
+    only: Iterable[str] | None = None,
+    cache_casts: bool = True,
+) -> Any:
+    """
+    Loads the text of a document, includes are resolved relative to the file it was
+    read from when there is one
+    """
+    if only is not None:
+        return _load_only(
+            text,
+            source,
+            only,
+            stats,
+            array_backend,
+            shared_keys,
+            frozen,
+            into,
+        )
+    load_stats = None if stats is None else LoadStats()
+    options: dict[str, Any] = {
+        "stats": load_stats,
+        "array_backend": array_backend,
+        "shared_keys": shared_keys,
+        "frozen": frozen,
+        "source": source,
+        "cache_casts": cache_casts,
+    }
+    if into is None:
+        compiler = Compiler(text, **options)
+    else:
+        compiler = DataclassCompiler(text, into=into, **options)
+    try:
+        result = compiler.compile()
+    except Exception as err:  # noqa: BLE001
+        raise ThslLoadError from err
+    if stats is not None:
+        stats(load_stats)  # type: ignore
+    return result
+
+
+def load(
+    file_path: TextIO | Path,
+    stats: StatsCallback | None = None,
+    array_backend: str | None = None,
+    shared_keys: bool = False,
+    frozen: bool = False,
+    into: type | None = None,
+    only: Iterable[str] | None = None,
+    cache_casts: bool = True,
+) -> Any:
+    return _loads(
+        _read(file_path),
+        _source(file_path),
+        stats=stats,
+        array_backend=array_backend,
+        shared_keys=shared_keys,
+        frozen=frozen,
+        into=into,
+        only=only,
+        cache_casts=cache_casts,
+    )
+
+
+def load_many(
+    sources: Iterable[str | TextIO | Path],
+    max_workers: int | None = None,
+    **options: Any,
+) -> list[Any]:
+    """
+    Loads every source on a pool of threads and returns the results in order. The
+    options are passed on to ``loads``. Loads share no mutable state, so on a
+    free-threaded build of Python they run in parallel.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda source: _loads(_read(source), _source(source), **options),
+                sources,
+            ),
+        )
+
+
+def reload(
+    old: Any,
+    source: str | TextIO | Path,
+    stats: StatsCallback | None = None,
+    array_backend: str | None = None,
+    shared_keys: bool = False,
+) -> tuple[Any, Changes]:
+    """
+    Loads a new version of a document that was loaded before. Parts of the result that
+    did not change are the objects of the old result, the key paths that were added,
+    removed or changed are returned with it. A frozen result is reloaded frozen.
+    """
+    load_stats = None if stats is None else LoadStats()
+    compiler = ReloadingCompiler(
+        _read(source),
+        old,
+        stats=load_stats,
+        array_backend=array_backend,
+        shared_keys=shared_keys,
+        source=_source(source),
+    )
     try:
-        return compiler.compile()
+        result = compiler.compile()
     except Exception as err:  # noqa: BLE001
         raise ThslLoadError from err
+    if stats is not None:
+        stats(load_stats)  # type: ignore
+    return result, compiler.changes
+
+
+def validate(source: str | TextIO | Path) -> list[ValidationError]:
+    """
+    Returns the errors of a document with their line and column, empty when it is
+    valid. The document is lexed and parsed and every value is checked against its
+    type without being cast, so nothing is built and the cast cache is not touched.
+    Lexing and parsing stop at the first syntax error, the values are all checked.
+    Templates and includes are not resolved.
+    """
+    return Validator(_read(source)).validate()
+
+
+def cast_cache_info() -> CacheInfo:
+    """
+    The hits and misses of the cache of cast results that loads share, and its size
+    """
+    return CAST_CACHE.info()
+
+
+def clear_cast_cache() -> None:
+    CAST_CACHE.clear()
+
+
+def _load_only(
+    text: str,
+    source: Path | None,
+    only: Iterable[str],
+    *options: Any,
+) -> dict:
+    if any(options):
+        raise ValueError("only can not be combined with other load options")
+    try:
+        return project(text, only, source)
+    except Exception as err:  # noqa: BLE001
+        raise ThslLoadError from err
+
+
+def _read(source: str | TextIO | Path) -> str:
+    if isinstance(source, Path):
+        with source.open() as open_file:
+            return open_file.read()
+    if isinstance(source, str):
+        return source
+    return source.read()
+
+
+def _source(source: str | TextIO | Path) -> Path | None:
+    return source if isinstance(source, Path) else None
+
+
+def iterparse(source: str | TextIO | Path) -> Iterator[Event]:
+    try:
+        for event in EventParser(_read(source)):
+            if event.data_type == CompoundDataType.INCLUDE:
+                path = ".".join(map(str, event.path))
+                raise ValueError(f"The include at {path} can not be read while parsing")
+            yield event
+    except Exception as err:  # noqa: BLE001
+        raise ThslLoadError from err
+
+
+def iter_items(
+    source: str | TextIO | Path,
+    key_path: str | tuple[str, ...],
+    batch_size: int | None = None,
+) -> Iterator[Any]:
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if isinstance(key_path, str):
+        key_path = tuple(key_path.split("."))
+    items = EventParser(_read(source)).items(key_path)
+    try:
+        if batch_size is None:
+            yield from items
+            return
+        while batch := list(islice(items, batch_size)):
+            yield batch
+    except KeyError:
+        raise
+    except Exception as err:  # noqa: BLE001
+        raise ThslLoadError from err
+
+
+def dumps_json(data: Any, type_tags: bool = False) -> str:
+    return JsonEncoder(type_tags=type_tags).encode(data)
+
+
+def dump_json(data: Any, file_path: TextIO | Path, type_tags: bool = False) -> None:
+    encoder = JsonEncoder(type_tags=type_tags)
+    if isinstance(file_path, Path):
+        with file_path.open("w") as open_file:
+            encoder.dump(data, open_file)
+        return
+    encoder.dump(data, file_path)
 
 
-def load(file_path: TextIO | Path) -> dict:
+def stream_json(
+    source: str | TextIO | Path,
+    file_path: TextIO | Path,
+    type_tags: bool = False,
+) -> None:
+    encoder = JsonEncoder(type_tags=type_tags)
     if isinstance(file_path, Path):
-        with file_path.open() as open_file:
-            return loads(open_file.read())
-    return loads(file_path.read())
+        with file_path.open("w") as open_file:
+            encoder.dump_events(iterparse(source), open_file)
+        return
+    encoder.dump_events(iterparse(source), file_path)
@@ -0,0 +1,196 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from thsl.src import batch
+from thsl.src.profiler import Profiler
+
+
+def profile(args: argparse.Namespace) -> int:
+    report = Profiler(args.file.read_text(), memory=args.memory).run()
+    print(report.format(limit=args.limit))
+    return 0
+
+
+def run_batch(
+    args: argparse.Namespace,
+    task: batch.Check,
+) -> tuple[list[batch.FileResult], float]:
+    try:
+        sources = batch.collect(args.paths)
+    except FileNotFoundError as err:
+        args.arg_parser.error(str(err))
+    progress = None if args.quiet else batch.Progress(len(sources))
+    start = time.perf_counter()
+    results = batch.run(task, sources, jobs=args.jobs, progress=progress)
+    seconds = time.perf_counter() - start
+    for result in results:
+        if not result.ok:
+            print(f"{result.path}: {result.error}", file=sys.stderr)
+    if args.summary is not None:
+        report = json.dumps(batch.summary(args.name, results, seconds), indent=2)
+        if args.summary == "-":
+            print(report)
+        else:
+            Path(args.summary).write_text(report)
+    return results, seconds
+
+
+def _outcome(results: list[batch.FileResult], seconds: float) -> str:
+    failed = sum(not result.ok for result in results)
+    kib = sum(result.bytes for result in results) / 1024
+    return f"{len(results)} files ({kib:.1f} KiB) in {seconds:.2f}s, {failed} failed"
+
+
+def _exit_code(results: list[batch.FileResult]) -> int:
+    return 0 if all(result.ok for result in results) else 1
+
+
+def check(args: argparse.Namespace) -> int:
+    results, seconds = run_batch(args, batch.Check())
+    if args.summary != "-":
+        print(f"checked {_outcome(results, seconds)}")
+    return _exit_code(results)
+
+
+def convert(args: argparse.Namespace) -> int:
+    task = batch.Convert(
+        to=args.to,
+        output_dir=args.output_dir,
+        type_tags=args.type_tags,
+    )
+    results, seconds = run_batch(args, task)
+    if args.summary != "-":
+        print(f"converted to {args.to} {_outcome(results, seconds)}")
+    return _exit_code(results)
+
+
+def stats(args: argparse.Namespace) -> int:
+    results, seconds = run_batch(args, batch.Stats())
+    if args.summary == "-":
+        return _exit_code(results)
+    total = batch.total_stats(results)
+    print(f"loaded {_outcome(results, seconds)}")
+    print(
+        f"lex {total.lex_seconds * 1000:.1f}ms, "
+        f"parse {total.parse_seconds * 1000:.1f}ms, "
+        f"compile {total.compile_seconds * 1000:.1f}ms, "
+        f"{total.tokens} tokens, {total.nodes} nodes",
+    )
+    slowest = sorted(
+        (result for result in results if result.stats is not None),
+        key=lambda result: result.stats.total_seconds,  # type: ignore
+        reverse=True,
+    )[: args.limit]
+    if slowest:
+        print(f"{'file':<50}{'total ms':>10}{'KiB':>9}{'tokens':>9}")
+    for result in slowest:
+        name = result.path if len(result.path) < 50 else f"...{result.path[-46:]}"
+        print(
+            f"{name:<50}"
+            f"{result.stats.total_seconds * 1000:>10.2f}"  # type: ignore
+            f"{result.bytes / 1024:>9.1f}"
+            f"{result.stats.tokens:>9}",  # type: ignore
+        )
+    return _exit_code(results)
+
+
+def _add_batch_parser(
+    subparsers: argparse._SubParsersAction,
+    name: str,
+    help_text: str,
+) -> argparse.ArgumentParser:
+    batch_parser = subparsers.add_parser(name, help=help_text)
+    batch_parser.add_argument(
+        "paths",
+        nargs="+",
+        help="files, directories searched for .thsl files, or glob patterns",
+    )
+    batch_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="worker processes, one per CPU by default",
+    )
+    batch_parser.add_argument(
+        "--summary",
+        help="write a JSON summary of every file to this path, or to stdout with -",
+    )
+    batch_parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="do not write progress to stderr",
+    )
+    batch_parser.set_defaults(name=name, arg_parser=batch_parser)
+    return batch_parser
+
+
+def make_arg_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(prog="thsl")
+    subparsers = arg_parser.add_subparsers(required=True)
+
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="rank the keys of a document by the time spent loading them",
+    )
+    profile_parser.add_argument("file", type=Path)
+    profile_parser.add_argument("--limit", type=int, default=20)
+    profile_parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="skip tracing allocations, which makes the timings more accurate",
+    )
+    profile_parser.set_defaults(command=profile)
+
+    check_parser = _add_batch_parser(
+        subparsers,
+        "check",
+        "validate files and report the ones that fail",
+    )
+    check_parser.set_defaults(command=check)
+
+    convert_parser = _add_batch_parser(
+        subparsers,
+        "convert",
+        "load files and write them as JSON or pickle",
+    )
+    convert_parser.add_argument(
+        "--to",
+        choices=list(batch.OUTPUT_SUFFIXES),
+        default="json",
+    )
+    convert_parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        help="write the files here instead of next to their source",
+    )
+    convert_parser.add_argument(
+        "--type-tags",
+        action="store_true",
+        help="tag JSON values that have no JSON equivalent with their type",
+    )
+    convert_parser.set_defaults(command=convert)
+
+    stats_parser = _add_batch_parser(
+        subparsers,
+        "stats",
+        "load files and report the time spent on each stage",
+    )
+    stats_parser.add_argument("--limit", type=int, default=10)
+    stats_parser.set_defaults(command=stats)
+    return arg_parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = make_arg_parser().parse_args(argv)
+    return args.command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
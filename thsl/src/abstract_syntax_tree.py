@@ -28,6 +28,7 @@ class Void(AST):
 class Value(AST):
     value: str | Void
     type: DataType | None = None
+    template: bool = False
 
 
 @dataclass
@@ -57,9 +58,13 @@ class Key(AST):
     type: DataType
     items: Value | Collection
     subtype: DataType | None = None
+    # the name of the user type of the key, its items are the overrides
+    user_type: str | None = None
 
 
 @dataclass
 class AliasDeclaration(AST):
     name: str
     collection: Collection
+    # the name of the user type it extends
+    base: str | None = None
@@ -0,0 +1,75 @@
+from array import array
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from thsl.src.grammar import ScalarDataType
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+NUMPY_BACKEND = "numpy"
+ARRAY_BACKEND = "array"
+ARRAY_BACKENDS = (NUMPY_BACKEND, ARRAY_BACKEND)
+
+PARSERS: dict[ScalarDataType, Callable[[str], int | float]] = {
+    ScalarDataType.INT: int,
+    ScalarDataType.HEX: partial(int, base=16),
+    ScalarDataType.OCT: partial(int, base=8),
+    ScalarDataType.FLOAT: float,
+}
+
+TYPECODES = {
+    ScalarDataType.INT: "q",
+    ScalarDataType.HEX: "q",
+    ScalarDataType.OCT: "q",
+    ScalarDataType.FLOAT: "d",
+}
+
+NUMPY_DTYPES = {
+    ScalarDataType.INT: "int64",
+    ScalarDataType.HEX: "int64",
+    ScalarDataType.OCT: "int64",
+    ScalarDataType.FLOAT: "float64",
+}
+
+
+def check_backend(backend: str | None) -> str | None:
+    """
+    Falls back to ``array.array`` when numpy is asked for but not installed
+    """
+    if backend is None:
+        return None
+    if backend not in ARRAY_BACKENDS:
+        raise ValueError(
+            f"Unknown array backend {backend!r}, expected one of "
+            f"{', '.join(ARRAY_BACKENDS)}",
+        )
+    if backend == NUMPY_BACKEND and numpy is None:
+        return ARRAY_BACKEND
+    return backend
+
+
+def make_array(values: list[str], cast_type: ScalarDataType, backend: str) -> Any:
+    """
+    Converts the raw values of a homogeneous numeric list in one call, returns None
+    when the values can not be converted so a plain list is built (and the error
+    raised) the usual way. The values have already been lexed and parsed one by one,
+    only their cast is done in bulk.
+    """
+    try:
+        if backend == NUMPY_BACKEND:
+            return _make_numpy_array(values, cast_type)
+        return array(TYPECODES[cast_type], map(PARSERS[cast_type], values))
+    except (OverflowError, ValueError):
+        return None
+
+
+def _make_numpy_array(values: list[str], cast_type: ScalarDataType) -> Any:
+    dtype = NUMPY_DTYPES[cast_type]
+    if cast_type in (ScalarDataType.INT, ScalarDataType.FLOAT):
+        # numpy parses decimal numbers in C, hex and oct need Python's int
+        return numpy.array(values).astype(dtype)
+    return numpy.fromiter(map(PARSERS[cast_type], values), dtype, len(values))
@@ -0,0 +1,280 @@
+import glob
+import os
+import pickle
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import as_completed, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, TextIO
+
+import thsl
+from thsl.exceptions import ThslLoadError
+from thsl.src.stats import LoadStats
+
+SUFFIX = ".thsl"
+OUTPUT_SUFFIXES = {"json": ".json", "pickle": ".pickle"}
+
+# files are sent to the worker processes in chunks of at most this many, small enough
+# that progress is reported often and the last chunks do not leave workers idle
+MAX_CHUNK_SIZE = 64
+# seconds between progress lines when they are not rewritten in place
+PROGRESS_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class SourceFile:
+    path: Path
+    # where its output goes under an output directory
+    relative: Path
+
+
+@dataclass
+class FileResult:
+    path: str
+    bytes: int = 0
+    error: str | None = None
+    output: str | None = None
+    stats: LoadStats | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def collect(patterns: list[str]) -> list[SourceFile]:
+    """
+    The files named by paths, directories and glob patterns, each one once and in the
+    order they were named. Directories are searched for thsl files recursively. The
+    path a file is written to under an output directory is relative to the directory
+    or to the part of the pattern before its first wildcard.
+    """
+    sources: dict[Path, SourceFile] = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            found = [
+                (file, file.relative_to(path))
+                for file in sorted(path.rglob(f"*{SUFFIX}"))
+                if file.is_file()
+            ]
+        elif glob.has_magic(pattern):
+            root = _glob_root(path)
+            found = [
+                (file, file.relative_to(root))
+                for file in map(Path, sorted(glob.glob(pattern, recursive=True)))
+                if file.is_file()
+            ]
+        elif path.is_file():
+            found = [(path, Path(path.name))]
+        else:
+            found = []
+        if not found:
+            raise FileNotFoundError(f"no thsl files found at {pattern}")
+        for file, relative in found:
+            sources.setdefault(file.resolve(), SourceFile(file, relative))
+    return list(sources.values())
+
+
+def _glob_root(pattern: Path) -> Path:
+    """
+    The directories of a glob pattern before its first wildcard
+    """
+    root = Path()
+    for part in pattern.parts[:-1]:
+        if glob.has_magic(part):
+            break
+        root /= part
+    return root
+
+
+def describe(err: BaseException) -> str:
+    if isinstance(err, ThslLoadError) and err.__cause__ is not None:
+        err = err.__cause__
+    message = str(err).strip()
+    return f"{type(err).__name__}: {message}" if message else type(err).__name__
+
+
+@dataclass(frozen=True)
+class Check:
+    """
+    Validates each file without building its values and keeps only whether it is
+    valid, the tasks that subclass it load the files. Instances are sent to the worker
+    processes, so tasks hold only options that can be pickled.
+    """
+
+    def __call__(self, source: SourceFile) -> FileResult:
+        result = FileResult(str(source.path))
+        try:
+            result.bytes = source.path.stat().st_size
+            self.run(source, result)
+        except Exception as err:  # noqa: BLE001
+            result.error = describe(err)
+        return result
+
+    def run(self, source: SourceFile, _: FileResult) -> None:
+        errors = thsl.validate(source.path)
+        if errors:
+            raise ValueError(str(errors[0]))
+
+
+@dataclass(frozen=True)
+class Stats(Check):
+    def run(self, source: SourceFile, result: FileResult) -> None:
+        thsl.load(source.path, stats=lambda stats: setattr(result, "stats", stats))
+
+
+@dataclass(frozen=True)
+class Convert(Check):
+    """
+    Writes each file as JSON or pickle, next to it or under an output directory
+    """
+
+    to: str = "json"
+    output_dir: Path | None = None
+    type_tags: bool = False
+
+    def output_path(self, source: SourceFile) -> Path:
+        suffix = OUTPUT_SUFFIXES[self.to]
+        if self.output_dir is None:
+            return source.path.with_suffix(suffix)
+        return (self.output_dir / source.relative).with_suffix(suffix)
+
+    def run(self, source: SourceFile, result: FileResult) -> None:
+        data = thsl.load(source.path)
+        output = self.output_path(source)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if self.to == "json":
+            thsl.dump_json(data, output, type_tags=self.type_tags)
+        else:
+            with output.open("wb") as open_file:
+                pickle.dump(data, open_file, protocol=pickle.HIGHEST_PROTOCOL)
+        result.output = str(output)
+
+
+def _run_chunk(
+    task: Callable[[SourceFile], FileResult],
+    sources: list[SourceFile],
+) -> list[FileResult]:
+    return [task(source) for source in sources]
+
+
+def run(
+    task: Callable[[SourceFile], FileResult],
+    sources: list[SourceFile],
+    jobs: int | None = None,
+    progress: Callable[[list[FileResult]], None] | None = None,
+) -> list[FileResult]:
+    """
+    Runs a task on every file and returns the results in the order of the files. The
+    files are handed to a pool of processes in chunks, or run in this process when
+    there is one job or one chunk.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(sources) // (jobs * 4)))
+    chunks = [
+        sources[start : start + chunk_size]
+        for start in range(0, len(sources), chunk_size)
+    ]
+    results: list[list[FileResult]] = [[] for _ in chunks]
+    if jobs == 1 or len(chunks) <= 1:
+        for index, chunk in enumerate(chunks):
+            results[index] = _run_chunk(task, chunk)
+            if progress is not None:
+                progress(results[index])
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+            futures = {
+                executor.submit(_run_chunk, task, chunk): index
+                for index, chunk in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if progress is not None:
+                    progress(results[futures[future]])
+    return [result for chunk in results for result in chunk]
+
+
+@dataclass
+class Progress:
+    """
+    Counts finished files and writes how many are done, in place on a terminal and as
+    a line at most every PROGRESS_INTERVAL seconds otherwise
+    """
+
+    total: int
+    stream: TextIO = field(default_factory=lambda: sys.stderr)
+    done: int = 0
+    failed: int = 0
+    _written: float = 0.0
+
+    def __call__(self, results: list[FileResult]) -> None:
+        self.done += len(results)
+        self.failed += sum(not result.ok for result in results)
+        line = f"{self.done}/{self.total} files, {self.failed} failed"
+        if self.stream.isatty():
+            end = "\n" if self.done == self.total else ""
+            self.stream.write(f"\r{line}{end}")
+        elif (
+            self.done == self.total
+            or time.perf_counter() - self._written >= PROGRESS_INTERVAL
+        ):
+            self._written = time.perf_counter()
+            self.stream.write(f"{line}\n")
+        self.stream.flush()
+
+
+def total_stats(results: list[FileResult]) -> LoadStats:
+    total = LoadStats()
+    for result in results:
+        if result.stats is None:
+            continue
+        total.lex_seconds += result.stats.lex_seconds
+        total.parse_seconds += result.stats.parse_seconds
+        total.compile_seconds += result.stats.compile_seconds
+        total.tokens += result.stats.tokens
+        total.nodes += result.stats.nodes
+        for cast_type, cast_stats in result.stats.casts.items():
+            total.add_cast(cast_type, cast_stats.seconds, cast_stats.count)
+    return total
+
+
+def _stats_summary(stats: LoadStats) -> dict[str, Any]:
+    summary = asdict(stats)
+    summary["casts"] = {
+        cast_type.value: asdict(cast_stats)
+        for cast_type, cast_stats in stats.casts.items()
+    }
+    summary["total_seconds"] = stats.total_seconds
+    return summary
+
+
+def summary(command: str, results: list[FileResult], seconds: float) -> dict:
+    """
+    A summary of a batch that can be written as JSON
+    """
+    report: dict[str, Any] = {
+        "command": command,
+        "files": len(results),
+        "failed": sum(not result.ok for result in results),
+        "bytes": sum(result.bytes for result in results),
+        "seconds": seconds,
+        "results": [],
+    }
+    for result in results:
+        file_summary: dict[str, Any] = {
+            "path": result.path,
+            "ok": result.ok,
+            "bytes": result.bytes,
+        }
+        if result.error is not None:
+            file_summary["error"] = result.error
+        if result.output is not None:
+            file_summary["output"] = result.output
+        if result.stats is not None:
+            file_summary["stats"] = _stats_summary(result.stats)
+        report["results"].append(file_summary)
+    if command == "stats":
+        report["stats"] = _stats_summary(total_stats(results))
+    return report
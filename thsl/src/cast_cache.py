@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from thsl.src.grammar import ScalarDataType
+
+# results of casting the same text to the same type, the least recently used ones are
+# dropped. Only types whose results can not be changed are cached, so loads on any
+# thread can share them
+MAX_CACHED_CASTS = 4096
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CastCache:
+    def __init__(self, max_size: int = MAX_CACHED_CASTS) -> None:
+        self.max_size = max_size
+        self._results: OrderedDict[tuple[ScalarDataType, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def cast(
+        self,
+        value: str,
+        cast_type: ScalarDataType,
+        caster: Callable[[str], Any],
+    ) -> Any:
+        return self.cast_many([value], cast_type, caster)[value]
+
+    def cast_many(
+        self,
+        values: list[str],
+        cast_type: ScalarDataType,
+        caster: Callable[[str], Any],
+    ) -> dict[str, Any]:
+        """
+        Returns the result for each of a batch of distinct values, only the ones not
+        cached are cast
+        """
+        results: dict[str, Any] = {}
+        missing = []
+        with self._lock:
+            for value in values:
+                key = (cast_type, value)
+                result = self._results.get(key, _MISSING)
+                if result is _MISSING:
+                    missing.append(value)
+                    continue
+                self._results.move_to_end(key)
+                results[value] = result
+            self._hits += len(results)
+            self._misses += len(missing)
+        if not missing:
+            return results
+        cast = {value: caster(value) for value in missing}
+        results.update(cast)
+        with self._lock:
+            for value, result in cast.items():
+                self._results[(cast_type, value)] = result
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return results
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                len(self._results),
+                self.max_size,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+CAST_CACHE = CastCache()
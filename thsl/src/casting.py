@@ -0,0 +1,246 @@
+import base64
+import binascii
+import ipaddress
+import os
+import re
+import struct
+import urllib.parse
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import semantic_version
+import tempora
+from dateutil import parser as dateutil
+
+from thsl.src.abstract_syntax_tree import Void
+from thsl.src.cast_cache import CastCache
+from thsl.src.grammar import CompoundDataType, DataType, ScalarDataType
+
+
+def cast_scalar(
+    value: str | Void,
+    cast_type: ScalarDataType,
+    cache: CastCache | None = None,
+) -> Any:
+    if cache is not None and not isinstance(value, Void) and _cached(value, cast_type):
+        return cache.cast(value, cast_type, BATCH_CASTERS[cast_type])
+    result: Any = None
+    if not isinstance(value, Void):
+        match cast_type:
+            case ScalarDataType.INT:
+                result = int(value)
+            case ScalarDataType.STR:
+                result = str(value)
+            case ScalarDataType.CHAR:
+                if len(value) > 1:
+                    raise ValueError("Char type can only be a single character")
+                result = str(value)
+            case ScalarDataType.DEC:
+                result = Decimal(value)
+            case ScalarDataType.FLOAT:
+                result = float(value)
+            case ScalarDataType.HEX:
+                result = int(value, 16)
+            case ScalarDataType.OCT:
+                result = int(value, 8)
+            case ScalarDataType.COMPLEX:
+                result = complex(value.replace("i", "j"))
+            case ScalarDataType.BASE64:
+                # reads the text of an ascii str in place where b64decode would
+                # encode a copy of it first
+                result = binascii.a2b_base64(value)
+            case ScalarDataType.BASE64E:
+                result = base64.b64encode(value.encode("utf-8"))
+            case ScalarDataType.BOOL:
+                if value == "true":
+                    result = True
+                elif value == "false":
+                    result = False
+                else:
+                    raise SyntaxError
+            case ScalarDataType.BYTES:
+                intermediary = int(value, 2)
+                result = struct.pack("!H", intermediary)
+            case ScalarDataType.DATETIME:
+                result = dateutil.parse(value)
+            case ScalarDataType.DATE:
+                result = dateutil.parse(value).date()
+            case ScalarDataType.TIME:
+                result = dateutil.parse(value).time()
+            case ScalarDataType.INTERVAL:
+                result = tempora.parse_timedelta(value)
+            case ScalarDataType.IP_ADDRESS:
+                result = ipaddress.ip_address(value)
+            case ScalarDataType.IP_NETWORK:
+                result = ipaddress.ip_network(value)
+            case ScalarDataType.URL:
+                result = urllib.parse.urlparse(value)
+            case ScalarDataType.RANGE:
+                if "..." in value:
+                    result = range(int(value[0]), int(value[-1]) + 1)
+                else:
+                    result = range(int(value[0]), int(value[-1]))
+            case ScalarDataType.ENV:
+                result = os.getenv(value)
+            case ScalarDataType.PATH:
+                result = Path(value)
+            case ScalarDataType.SEMVER:
+                result = semantic_version.Version(value)
+            case ScalarDataType.REGEX:
+                result = re.compile(value)
+        if result is None:
+            print("THIS SHOULDN'T HAPPEN")
+        return result
+    return get_default_value(cast_type)
+
+
+def _parse_bool(value: str) -> bool:
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    raise SyntaxError
+
+
+def _parse_date(value: str) -> Any:
+    return dateutil.parse(value).date()
+
+
+def _parse_time(value: str) -> Any:
+    return dateutil.parse(value).time()
+
+
+BATCH_CASTERS: dict[ScalarDataType, Callable[[str], Any]] = {
+    ScalarDataType.INT: int,
+    ScalarDataType.STR: str,
+    ScalarDataType.DEC: Decimal,
+    ScalarDataType.FLOAT: float,
+    ScalarDataType.HEX: partial(int, base=16),
+    ScalarDataType.OCT: partial(int, base=8),
+    ScalarDataType.BOOL: _parse_bool,
+    ScalarDataType.DATETIME: dateutil.parse,
+    ScalarDataType.DATE: _parse_date,
+    ScalarDataType.TIME: _parse_time,
+    ScalarDataType.INTERVAL: tempora.parse_timedelta,
+    ScalarDataType.IP_ADDRESS: ipaddress.ip_address,
+    ScalarDataType.IP_NETWORK: ipaddress.ip_network,
+    ScalarDataType.PATH: Path,
+    ScalarDataType.ENV: os.getenv,
+    ScalarDataType.URL: urllib.parse.urlparse,
+    ScalarDataType.SEMVER: semantic_version.Version,
+    ScalarDataType.REGEX: re.compile,
+}
+
+# results that are slow to parse and not changed once made, repeated values are only
+# parsed once per batch and looked up in the cast cache across loads
+CACHED_TYPES = (
+    ScalarDataType.DATETIME,
+    ScalarDataType.DATE,
+    ScalarDataType.TIME,
+    ScalarDataType.INTERVAL,
+    ScalarDataType.IP_ADDRESS,
+    ScalarDataType.IP_NETWORK,
+    ScalarDataType.URL,
+    ScalarDataType.REGEX,
+)
+# dateutil fills the parts of a date that are left out from today's date, so only
+# values that start with a full date give the same result on every day
+DATE_TYPES = (ScalarDataType.DATETIME, ScalarDataType.DATE)
+_FULL_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}(?![0-9])")
+
+
+def _cached(value: str, cast_type: ScalarDataType) -> bool:
+    if cast_type in DATE_TYPES:
+        return _FULL_DATE.match(value) is not None
+    return cast_type in CACHED_TYPES
+
+
+def cast_scalars(
+    values: list[str],
+    cast_type: ScalarDataType,
+    cache: CastCache | None = None,
+) -> list[Any]:
+    """
+    Casts a batch of values of the same type, the type is only dispatched on once
+    """
+    caster = BATCH_CASTERS.get(cast_type)
+    if caster is None:
+        return [cast_scalar(value, cast_type) for value in values]
+    if cast_type in CACHED_TYPES:
+        unique = list(dict.fromkeys(values))
+        parsed = {}
+        if cache is not None:
+            cached = [value for value in unique if _cached(value, cast_type)]
+            parsed = cache.cast_many(cached, cast_type, caster)
+        for value in unique:
+            if value not in parsed:
+                parsed[value] = caster(value)
+        return [parsed[value] for value in values]
+    return list(map(caster, values))
+
+
+def get_default_value(cast_type: DataType) -> Any:
+    match cast_type:
+        case ScalarDataType.INT:
+            return 0
+        case ScalarDataType.STR:
+            return ""
+        case ScalarDataType.CHAR:
+            return ""
+        case ScalarDataType.DEC:
+            return Decimal("0")
+        case ScalarDataType.FLOAT:
+            return float(0)
+        case ScalarDataType.HEX:
+            return hex(0)
+        case ScalarDataType.OCT:
+            return oct(0)
+        case ScalarDataType.COMPLEX:
+            return complex("0")
+        case ScalarDataType.BASE64:
+            return ""
+        case ScalarDataType.BASE64E:
+            return bytes("".encode("utf-8"))
+        case ScalarDataType.BOOL:
+            return False
+        case ScalarDataType.BYTES:
+            return bytes("".encode("utf-8"))
+        case ScalarDataType.DATETIME:
+            return datetime.now()
+        case ScalarDataType.DATE:
+            return datetime.now().date()
+        case ScalarDataType.TIME:
+            return datetime.now().time()
+        case ScalarDataType.INTERVAL:
+            return timedelta(seconds=0)
+        case ScalarDataType.IP_ADDRESS:
+            return ipaddress.ip_address("0.0.0.0")
+        case ScalarDataType.IP_NETWORK:
+            return ipaddress.ip_network("0.0.0.0/1")
+        case ScalarDataType.URL:
+            return urllib.parse.urlparse("")
+        case ScalarDataType.RANGE:
+            return range(1)
+        case ScalarDataType.ENV:
+            return ""
+        case ScalarDataType.PATH:
+            return Path()
+        case ScalarDataType.SEMVER:
+            return semantic_version.Version("0.0.0")
+        case ScalarDataType.REGEX:
+            return re.compile("")
+        case CompoundDataType.DICT:
+            return {}
+        case CompoundDataType.LIST:
+            return []
+        case CompoundDataType.SET:
+            return set()
+        case CompoundDataType.TUPLE:
+            return tuple()
+    raise NotImplementedError(
+        f"Still need to add default for type {cast_type.value}",
+    )
@@ -1,58 +1,232 @@
-import base64
-import ipaddress
-import os
-import re
-import struct
-import urllib.parse
-from datetime import datetime, timedelta
-from decimal import Decimal
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
 
-import semantic_version
-import tempora
-from dateutil import parser as dateutil
-
-from thsl.src.abstract_syntax_tree import Collection, Key, Value, Void
+from thsl.src.abstract_syntax_tree import (
+    AliasDeclaration,
+    AST,
+    Collection,
+    Key,
+    Value,
+    Void,
+)
+from thsl.src.arrays import ARRAY_BACKEND, check_backend, make_array, TYPECODES
+from thsl.src.cast_cache import CAST_CACHE
+from thsl.src.casting import cast_scalar, cast_scalars, get_default_value
+from thsl.src.frozen import FrozenDict
 from thsl.src.grammar import CompoundDataType, DataType, ScalarDataType
+from thsl.src.includes import content_hash, IncludeGraph, parse_cached
 from thsl.src.parser import Parser
+from thsl.src.prototypes import copy_mutable, Prototype
+from thsl.src.shared_keys import share_nested_keys
+from thsl.src.stats import LoadStats
+from thsl.src.templating import TemplateResolver
+
+
+class _PendingTuple(list):
+    """
+    The items of a tuple, turned into a tuple once its deferred casts and templates
+    are done
+    """
+
+
+@dataclass(slots=True)
+class _Frame:
+    """
+    A collection being visited, its items still to do and where its result goes
+    """
+
+    items: Iterator[AST]
+    root: Any
+    pending_tuple: bool
+    container: Any
+    slot: Any
 
 
 class Compiler:
-    def __init__(self, file_path: Path | str):
-        self._parser = Parser(file_path)
-        self.tree = self._parser.parse()
+    # casts are collected per type and done in one pass per type after the visit,
+    # subclasses that need to see every single cast turn this off
+    batch_casts = True
+
+    def __init__(
+        self,
+        file_path: Path | str,
+        stats: LoadStats | None = None,
+        parser: Parser | None = None,
+        array_backend: str | None = None,
+        shared_keys: bool = False,
+        frozen: bool = False,
+        source: Path | None = None,
+        tree: Collection | None = None,
+        includes: IncludeGraph | None = None,
+        cache_casts: bool = True,
+    ):
+        self.stats = stats
+        self.cast_cache = CAST_CACHE if cache_casts else None
+        self.shared_keys = shared_keys
+        self.frozen = frozen
+        self.array_backend = check_backend(array_backend)
+        if frozen and self.array_backend == ARRAY_BACKEND:
+            # array.array can not be made read-only, frozen lists become tuples
+            self.array_backend = None
+        if tree is None:
+            parser = parser or Parser(file_path, stats=stats)
+            tree = parser.parse()
+        self._parser = parser
+        self.tree = tree
+        if isinstance(file_path, Path) and source is None:
+            source = file_path
+        # shared with the compilers of the included files
+        self._includes = includes or IncludeGraph(source)
         self._current_key: Key | None = None
+        self._pending_casts: dict[ScalarDataType, list[tuple[Any, Any, str]]] = {}
+        self._pending_tuples: list[tuple[Any, Any, _PendingTuple]] = []
+        self._templates = TemplateResolver()
+        self._prototypes: dict[str, Prototype] = {}
+        if stats is not None:
+            self.cast_scalar = self._timed_cast_scalar  # type: ignore
 
     def compile(self) -> dict:
-        return self._visit()  # type: ignore
+        if self.stats is None:
+            return self._compile()
+        start = time.perf_counter()
+        result = self._compile()
+        self.stats.compile_seconds += time.perf_counter() - start
+        return result
+
+    def _compile(self) -> dict:
+        result = self._visit()
+        self._flush_casts()
+        self._templates.resolve(result)
+        replaced: dict[int, tuple[dict, dict]] = {}
+        if self.shared_keys:
+            result = share_nested_keys(result, replaced)  # type: ignore
+        self._flush_tuples(replaced)
+        return result  # type: ignore
 
     @property
     def user_types(self) -> list[str]:
+        if self._parser is None:
+            return []
         return self._parser.user_types
 
-    def _visit(self, current_node: Collection | None = None) -> Iterable:
+    def _visit(
+        self,
+        current_node: Collection | None = None,
+        root: Any = None,
+        container: Any = None,
+        slot: Any = None,
+    ) -> Any:
         if current_node is None:
             current_node = self.tree
-        root = self.cast_compound(current_node.type)  # type: ignore
-        for item in current_node.items:
+        # the collections being visited, innermost last. A nested collection is put on
+        # top and its result placed in its parent once all its items are done
+        stack = [self._enter(current_node, root, container, slot)]
+        result = None
+        while stack:
+            frame = stack[-1]
+            nested = self._visit_items(frame)
+            if nested is not None:
+                stack.append(nested)
+                continue
+            stack.pop()
+            result = self._exit(frame)
+            if frame.container is not None:
+                self._place(frame.container, frame.slot, result)
+        return result
+
+    def _enter(
+        self,
+        collection: Collection,
+        root: Any = None,
+        container: Any = None,
+        slot: Any = None,
+    ) -> _Frame:
+        if root is None:
+            if self.frozen and collection.type == CompoundDataType.LIST:
+                root = tuple()
+            else:
+                root = self.cast_compound(collection.type)  # type: ignore
+        pending_tuple = isinstance(root, tuple)
+        if pending_tuple:
+            # tuples are collected in a list first, extending a tuple copies it
+            root = _PendingTuple()
+        return _Frame(iter(collection.items), root, pending_tuple, container, slot)
+
+    def _exit(self, frame: _Frame) -> Any:
+        root = frame.root
+        if frame.pending_tuple:
+            # templates in the tuple are resolved before it is made
+            return root
+        if self.frozen:
+            if isinstance(root, dict):
+                return FrozenDict(root)
+            if isinstance(root, set):
+                return frozenset(root)
+        return root
+
+    def _visit_items(self, frame: _Frame) -> _Frame | None:
+        """
+        Visits the items of a collection until one of them is a collection itself,
+        which is returned to be visited next. Returns None once all items are done.
+        """
+        root = frame.root
+        for item in frame.items:
             if isinstance(item, Key):
                 self._current_key = item
             match item:
+                case AliasDeclaration() as alias:
+                    self._declare(alias)
+                case Key(user_type=str() as user_type) as key:
+                    prototype = self._get_prototype(user_type, key.line)
+                    return self._enter(
+                        key.items,  # type: ignore
+                        prototype.instantiate(),
+                        root,
+                        sys.intern(key.name),
+                    )
+                case Key(type=CompoundDataType.INCLUDE) as key:
+                    root[sys.intern(key.name)] = self._include(key)  # type: ignore
                 case Key(items=Value()) as key:
-                    # noinspection PyTupleItemAssignment
-                    root[key.name] = self.cast_scalar(  # type: ignore
+                    self._place_scalar(
+                        root,
+                        sys.intern(key.name),
                         key.items.value,  # type: ignore
-                        key.type,
+                        key.type,  # type: ignore
+                        key.items.template,  # type: ignore
                     )
+                case Key(
+                    items=Collection(type=CompoundDataType.LIST) as collection,
+                ) as key if (
+                    self.array_backend and key.type in TYPECODES
+                ):
+                    array = self._make_array(collection, key.type)  # type: ignore
+                    if array is None:
+                        return self._enter(
+                            collection,
+                            container=root,
+                            slot=sys.intern(key.name),
+                        )
+                    root[sys.intern(key.name)] = array  # type: ignore
                 case Key(
                     items=Collection(type=CompoundDataType()),
                 ) as key:
-                    # noinspection PyTupleItemAssignment
-                    root[key.name] = self._visit(key.items)  # type: ignore
+                    return self._enter(
+                        key.items,  # type: ignore
+                        container=root,
+                        slot=sys.intern(key.name),
+                    )
                 case Collection() as collection:
                     if isinstance(root, list):
-                        root.append(self._visit(collection))
+                        root.append(None)
+                        return self._enter(
+                            collection,
+                            container=root,
+                            slot=len(root) - 1,
+                        )
                 case Value() as value:
                     if self._current_key is not None:
                         subtype = self._current_key.subtype
@@ -63,19 +237,131 @@ class Compiler:
                         if value.type is not None:
                             subtype = value.type
                         if isinstance(root, list):
-                            root.append(
-                                self.cast_scalar(value.value, subtype),
+                            root.append(None)
+                            self._place_scalar(
+                                root,
+                                len(root) - 1,
+                                value.value,
+                                subtype,  # type: ignore
+                                value.template,
                             )
                         if isinstance(root, set):
                             root.add(
                                 self.cast_scalar(value.value, subtype),
                             )
-                        if isinstance(root, tuple):
-                            root = (
-                                *root,
-                                self.cast_scalar(value.value, subtype),
-                            )
-        return root
+        return None
+
+    def _declare(self, alias: AliasDeclaration) -> None:
+        """
+        Compiles a user type into its prototype, starting from the defaults of the
+        prototype of its base type
+        """
+        if alias.base is None:
+            defaults = {}
+        else:
+            defaults = self._get_prototype(alias.base, alias.line).defaults.copy()
+        templates = len(self._templates.templates)
+        # instances copy the defaults, so they have to hold their final values;
+        # work pending from the rest of the document waits for its templates
+        pending = self._pending_casts, self._pending_tuples
+        self._pending_casts, self._pending_tuples = {}, []
+        try:
+            self._visit(alias.collection, root=defaults)
+            if len(self._templates.templates) != templates:
+                raise ValueError(
+                    f"The defaults of type {alias.name!r} can not reference other "
+                    f"keys line={alias.line}",
+                )
+            self._flush_casts()
+            self._flush_tuples({})
+        finally:
+            self._pending_casts, self._pending_tuples = pending
+        self._prototypes[alias.name] = Prototype(alias.name, defaults)
+
+    def _instantiate(self, key: Key) -> Any:
+        prototype = self._get_prototype(key.user_type, key.line)  # type: ignore
+        instance = prototype.instantiate()
+        return self._visit(key.items, root=instance)  # type: ignore
+
+    def _get_prototype(self, name: str, line: int) -> Prototype:
+        prototype = self._prototypes.get(name)
+        if prototype is None:
+            raise TypeError(f"Unknown type {name!r} line={line}")
+        return prototype
+
+    def _include(self, key: Key) -> Any:
+        name = key.items.value  # type: ignore
+        if isinstance(name, Void):
+            raise SyntaxError(f"Expected a file to include line={key.line}")
+        return compile_include(
+            self._includes,
+            name,
+            stats=self.stats,
+            array_backend=self.array_backend,
+            frozen=self.frozen,
+            cache_casts=self.cast_cache is not None,
+        )
+
+    def _place(self, container: Any, slot: Any, result: Any) -> None:
+        container[slot] = result
+        if isinstance(result, _PendingTuple):
+            self._pending_tuples.append((container, slot, result))
+
+    def _place_scalar(
+        self,
+        container: Any,
+        slot: Any,
+        value: str | Void,
+        cast_type: ScalarDataType,
+        template: bool = False,
+    ) -> None:
+        if template and cast_type == ScalarDataType.STR:
+            self._templates.add(container, slot, value)  # type: ignore
+            return
+        if not self.batch_casts or isinstance(value, Void):
+            container[slot] = self.cast_scalar(value, cast_type)
+            return
+        container[slot] = None
+        pending = self._pending_casts.get(cast_type)
+        if pending is None:
+            pending = self._pending_casts[cast_type] = []
+        pending.append((container, slot, value))
+
+    def _flush_casts(self) -> None:
+        for cast_type, pending in self._pending_casts.items():
+            containers, slots, values = zip(*pending)
+            results = self.cast_scalars(list(values), cast_type)
+            for container, slot, result in zip(containers, slots, results):
+                container[slot] = result
+        self._pending_casts.clear()
+
+    def _flush_tuples(self, replaced: dict[int, tuple[dict, dict]]) -> None:
+        # tuples are registered innermost first, so nested tuples are done before
+        # the tuple holding them
+        for container, slot, items in self._pending_tuples:
+            if id(container) in replaced:
+                container = replaced[id(container)][1]
+            container[slot] = tuple(items)
+        self._pending_tuples.clear()
+
+    def _make_array(self, collection: Collection, cast_type: ScalarDataType) -> Any:
+        values = []
+        for item in collection.items:
+            if (
+                not isinstance(item, Value)
+                or isinstance(item.value, Void)
+                or item.type not in (None, cast_type)
+            ):
+                return None
+            values.append(item.value)
+        start = time.perf_counter()
+        array = make_array(values, cast_type, self.array_backend)  # type: ignore
+        if self.frozen and array is not None:
+            array.flags.writeable = False
+        if self.stats is not None:
+            seconds = time.perf_counter() - start
+            self.stats.add_cast(cast_type, seconds, count=len(values))
+        return array
 
     @staticmethod
     def cast_compound(collection_type: CompoundDataType) -> Iterable:
@@ -92,131 +378,51 @@ class Compiler:
                 return {}
 
     def cast_scalar(self, value: str | Void, cast_type: ScalarDataType) -> Any:
-        result: Any = None
-        if not isinstance(value, Void):
-            match cast_type:
-                case ScalarDataType.INT:
-                    result = int(value)
-                case ScalarDataType.STR:
-                    result = str(value)
-                case ScalarDataType.CHAR:
-                    if len(value) > 1:
-                        raise ValueError("Char type can only be a single character")
-                    result = str(value)
-                case ScalarDataType.DEC:
-                    result = Decimal(value)
-                case ScalarDataType.FLOAT:
-                    result = float(value)
-                case ScalarDataType.HEX:
-                    result = int(value, 16)
-                case ScalarDataType.OCT:
-                    result = int(value, 8)
-                case ScalarDataType.COMPLEX:
-                    result = complex(value.replace("i", "j"))
-                case ScalarDataType.BASE64:
-                    result = base64.b64decode(value)
-                case ScalarDataType.BASE64E:
-                    result = base64.b64encode(value.encode("utf-8"))
-                case ScalarDataType.BOOL:
-                    if value == "true":
-                        result = True
-                    elif value == "false":
-                        result = False
-                    else:
-                        raise SyntaxError
-                case ScalarDataType.BYTES:
-                    intermediary = int(value, 2)
-                    result = struct.pack("!H", intermediary)
-                case ScalarDataType.DATETIME:
-                    result = dateutil.parse(value)
-                case ScalarDataType.DATE:
-                    result = dateutil.parse(value).date()
-                case ScalarDataType.TIME:
-                    result = dateutil.parse(value).time()
-                case ScalarDataType.INTERVAL:
-                    result = tempora.parse_timedelta(value)
-                case ScalarDataType.IP_ADDRESS:
-                    result = ipaddress.ip_address(value)
-                case ScalarDataType.IP_NETWORK:
-                    result = ipaddress.ip_network(value)
-                case ScalarDataType.URL:
-                    result = urllib.parse.urlparse(value)
-                case ScalarDataType.RANGE:
-                    if "..." in value:
-                        result = range(int(value[0]), int(value[-1]) + 1)
-                    else:
-                        result = range(int(value[0]), int(value[-1]))
-                case ScalarDataType.ENV:
-                    result = os.getenv(value)
-                case ScalarDataType.PATH:
-                    result = Path(value)
-                case ScalarDataType.SEMVER:
-                    result = semantic_version.Version(value)
-                case ScalarDataType.REGEX:
-                    result = re.compile(value)
-            if result is None:
-                print("THIS SHOULDN'T HAPPEN")
-            return result
-        return self.get_default_value(cast_type)
+        return cast_scalar(value, cast_type, self.cast_cache)
+
+    def cast_scalars(self, values: list[str], cast_type: ScalarDataType) -> list:
+        if self.stats is None:
+            return cast_scalars(values, cast_type, self.cast_cache)
+        start = time.perf_counter()
+        results = cast_scalars(values, cast_type, self.cast_cache)
+        seconds = time.perf_counter() - start
+        self.stats.add_cast(cast_type, seconds, count=len(values))
+        return results
+
+    def _timed_cast_scalar(
+        self,
+        value: str | Void,
+        cast_type: ScalarDataType,
+    ) -> Any:
+        start = time.perf_counter()
+        result = Compiler.cast_scalar(self, value, cast_type)
+        self.stats.add_cast(cast_type, time.perf_counter() - start)  # type: ignore
+        return result
 
     def get_default_value(self, cast_type: DataType) -> Any:
-        match cast_type:
-            case ScalarDataType.INT:
-                return 0
-            case ScalarDataType.STR:
-                return ""
-            case ScalarDataType.CHAR:
-                return ""
-            case ScalarDataType.DEC:
-                return Decimal("0")
-            case ScalarDataType.FLOAT:
-                return float(0)
-            case ScalarDataType.HEX:
-                return hex(0)
-            case ScalarDataType.OCT:
-                return oct(0)
-            case ScalarDataType.COMPLEX:
-                return complex("0")
-            case ScalarDataType.BASE64:
-                return ""
-            case ScalarDataType.BASE64E:
-                return bytes("".encode("utf-8"))
-            case ScalarDataType.BOOL:
-                return False
-            case ScalarDataType.BYTES:
-                return bytes("".encode("utf-8"))
-            case ScalarDataType.DATETIME:
-                return datetime.now()
-            case ScalarDataType.DATE:
-                return datetime.now().date()
-            case ScalarDataType.TIME:
-                return datetime.now().time()
-            case ScalarDataType.INTERVAL:
-                return timedelta(seconds=0)
-            case ScalarDataType.IP_ADDRESS:
-                return ipaddress.ip_address("0.0.0.0")
-            case ScalarDataType.IP_NETWORK:
-                return ipaddress.ip_network("0.0.0.0/1")
-            case ScalarDataType.URL:
-                return urllib.parse.urlparse("")
-            case ScalarDataType.RANGE:
-                return range(1)
-            case ScalarDataType.ENV:
-                return ""
-            case ScalarDataType.PATH:
-                return Path()
-            case ScalarDataType.SEMVER:
-                return semantic_version.Version("0.0.0")
-            case ScalarDataType.SEMVER:
-                return re.compile("")
-            case CompoundDataType.DICT:
-                return {}
-            case CompoundDataType.LIST:
-                return []
-            case CompoundDataType.SET:
-                return set()
-            case CompoundDataType.TUPLE:
-                return tuple()
-        raise NotImplementedError(
-            f"Still need to add default for type {cast_type.value}",
+        return get_default_value(cast_type)
+
+
+def compile_include(includes: IncludeGraph, name: str, **options: Any) -> Any:
+    """
+    Compiles the file named by an include. A file included again in the same load is
+    copied from its first result instead of being read again, parsed trees are cached
+    across loads by the hash of the text
+    """
+    path = includes.resolve(name)
+    includes.enter(path)
+    try:
+        if path in includes.results:
+            return copy_mutable(includes.results[path])
+        text = path.read_text()
+        includes.hashes[path] = content_hash(text)
+        included = Compiler(
+            path,
+            tree=parse_cached(text, options.get("stats")),
+            includes=includes,
+            **options,
         )
+        result = includes.results[path] = included._compile()
+        return result
+    finally:
+        includes.exit()
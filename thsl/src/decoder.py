@@ -0,0 +1,332 @@
+import dataclasses
+import re
+import threading
+import types
+import typing
+from collections.abc import Mapping
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
+from pathlib import Path
+from typing import Any, Union
+from urllib.parse import ParseResult
+
+import semantic_version
+
+from thsl.src.abstract_syntax_tree import AliasDeclaration, Collection, Key, Value
+from thsl.src.compiler import Compiler
+from thsl.src.grammar import CompoundDataType, DataType, ScalarDataType
+from thsl.src.templating import Template
+
+PYTHON_TYPES: dict[DataType, tuple[type, ...]] = {
+    ScalarDataType.BOOL: (bool,),
+    ScalarDataType.BYTES: (bytes,),
+    ScalarDataType.INT: (int,),
+    ScalarDataType.DEC: (Decimal,),
+    ScalarDataType.FLOAT: (float,),
+    ScalarDataType.HEX: (int,),
+    ScalarDataType.OCT: (int,),
+    ScalarDataType.COMPLEX: (complex,),
+    ScalarDataType.BASE64: (bytes,),
+    ScalarDataType.BASE64E: (bytes,),
+    ScalarDataType.CHAR: (str,),
+    ScalarDataType.STR: (str,),
+    ScalarDataType.RANGE: (range,),
+    ScalarDataType.DATE: (date,),
+    ScalarDataType.DATETIME: (datetime,),
+    ScalarDataType.TIME: (time,),
+    ScalarDataType.INTERVAL: (timedelta,),
+    ScalarDataType.IP_ADDRESS: (IPv4Address, IPv6Address),
+    ScalarDataType.IP_NETWORK: (IPv4Network, IPv6Network),
+    ScalarDataType.URL: (ParseResult,),
+    ScalarDataType.ENV: (str,),
+    ScalarDataType.PATH: (Path,),
+    ScalarDataType.SEMVER: (semantic_version.Version,),
+    ScalarDataType.REGEX: (re.Pattern,),
+    CompoundDataType.LIST: (list,),
+    CompoundDataType.SET: (set, frozenset),
+    CompoundDataType.TUPLE: (tuple,),
+    CompoundDataType.DICT: (dict,),
+    CompoundDataType.UNKNOWN: (dict,),
+    CompoundDataType.INCLUDE: (dict,),
+}
+
+INT_TYPES = (ScalarDataType.INT, ScalarDataType.HEX, ScalarDataType.OCT)
+
+
+@dataclasses.dataclass
+class FieldDecoder:
+    """
+    What a key has to hold to be decoded into a field, worked out from its annotation
+    """
+
+    name: str
+    # the classes the value may be an instance of, empty when anything goes
+    accepts: tuple[type, ...]
+    # the classes the items of a collection may be instances of
+    item_accepts: tuple[type, ...]
+    # decoders for a dataclass value or for dataclass items of a collection
+    decoder: "Decoder | None" = None
+    item_decoder: "Decoder | None" = None
+
+    def check(self, data_type: DataType, item_type: DataType | None = None) -> None:
+        if not _accepts(self.accepts, data_type):
+            raise TypeError(
+                f"Field {self.name!r} can not hold a value of type {data_type.value}",
+            )
+        if item_type is not None and not _accepts(self.item_accepts, item_type):
+            raise TypeError(
+                f"Field {self.name!r} can not hold items of type {item_type.value}",
+            )
+
+
+class Decoder:
+    """
+    Maps the keys of a dict straight to the fields of a dataclass. Decoders are
+    compiled once per dataclass by ``get_decoder``
+    """
+
+    def __init__(self, cls: type) -> None:
+        self.cls = cls
+        self.fields: dict[str, FieldDecoder] = {}
+
+    def _compile(self) -> None:
+        hints = typing.get_type_hints(self.cls)
+        for field in dataclasses.fields(self.cls):
+            if field.init:
+                self.fields[field.name] = _field_decoder(field.name, hints[field.name])
+
+
+_DECODERS: dict[type, Decoder] = {}
+# decoders being compiled, only published to _DECODERS together once the outermost
+# compile is done so no thread sees a decoder that refers to an unfinished one
+_COMPILING: dict[type, Decoder] = {}
+# reentrant because compiling a decoder compiles the decoders of its fields
+_DECODERS_LOCK = threading.RLock()
+
+
+def get_decoder(cls: type) -> Decoder:
+    decoder = _DECODERS.get(cls)
+    if decoder is not None:
+        return decoder
+    if not (isinstance(cls, type) and dataclasses.is_dataclass(cls)):
+        raise TypeError(f"{cls!r} is not a dataclass")
+    with _DECODERS_LOCK:
+        decoder = _DECODERS.get(cls)
+        if decoder is not None:
+            return decoder
+        outermost = not _COMPILING
+        decoder = _COMPILING.get(cls)
+        try:
+            if decoder is None:
+                # known before its fields are compiled so recursive dataclasses resolve
+                decoder = _COMPILING[cls] = Decoder(cls)
+                decoder._compile()
+            if outermost:
+                _DECODERS.update(_COMPILING)
+        finally:
+            if outermost:
+                _COMPILING.clear()
+        return decoder
+
+
+def _field_decoder(name: str, annotation: Any) -> FieldDecoder:
+    accepts: list[type] = []
+    item_accepts: list[type] = []
+    decoder = None
+    item_decoder = None
+    for option in _union_members(annotation):
+        if option is Any:
+            return FieldDecoder(name, (), ())
+        origin = typing.get_origin(option) or option
+        if not isinstance(origin, type):
+            return FieldDecoder(name, (), ())
+        if dataclasses.is_dataclass(origin):
+            decoder = get_decoder(origin)
+            accepts.append(dict)
+            continue
+        accepts.append(origin)
+        arguments = typing.get_args(option)
+        if not arguments or origin is dict:
+            continue
+        for item_option in _union_members(arguments[0]):
+            item_origin = typing.get_origin(item_option) or item_option
+            if item_option is Any or not isinstance(item_origin, type):
+                item_accepts.clear()
+                break
+            if dataclasses.is_dataclass(item_origin):
+                item_decoder = get_decoder(item_origin)
+                item_origin = dict
+            item_accepts.append(item_origin)
+    return FieldDecoder(
+        name,
+        tuple(accepts),
+        tuple(item_accepts),
+        decoder,
+        item_decoder,
+    )
+
+
+def _union_members(annotation: Any) -> tuple[Any, ...]:
+    if typing.get_origin(annotation) in (Union, types.UnionType):
+        return tuple(
+            member
+            for member in typing.get_args(annotation)
+            if member is not type(None)
+        )
+    return (annotation,)
+
+
+def _accepts(accepts: tuple[type, ...], data_type: DataType) -> bool:
+    if not accepts:
+        return True
+    if data_type in INT_TYPES and float in accepts:
+        # an int is acceptable where a float is expected
+        return True
+    return any(
+        issubclass(python_type, accepts)
+        for python_type in PYTHON_TYPES.get(data_type, (object,))
+    )
+
+
+class _Fields:
+    """
+    The values of the fields of a dataclass being decoded, by name. Templates are
+    placed here and are resolved into the dataclass once it has been built.
+    """
+
+    __slots__ = ("values", "instance")
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.instance: Any = None
+
+    def __getitem__(self, name: str) -> Any:
+        if self.instance is None:
+            return self.values[name]
+        return getattr(self.instance, name)
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        if self.instance is None:
+            self.values[name] = value
+        else:
+            # frozen dataclasses are set the way their own __init__ sets them
+            object.__setattr__(self.instance, name, value)
+
+    def build(self, cls: type) -> Any:
+        self.instance = cls(**self.values)
+        return self.instance
+
+
+class DataclassCompiler(Compiler):
+    """
+    Compiles a document into a dataclass without building the dict for it first.
+    Values of fields that are not dataclasses are compiled as usual
+    """
+
+    # values are placed into the dataclass as they are cast
+    batch_casts = False
+
+    def __init__(self, file_path: Path | str, into: type, **kwargs: Any) -> None:
+        self.decoder = get_decoder(into)
+        super().__init__(file_path, **kwargs)
+
+    def _compile(self) -> Any:
+        result = self._decode(self.decoder, self.tree)
+        self._templates.resolve(result)
+        self._flush_tuples({})
+        return result
+
+    def _decode(self, decoder: Decoder, collection: Collection) -> Any:
+        fields = _Fields()
+        for item in collection.items:
+            if isinstance(item, AliasDeclaration):
+                self._declare(item)
+            if not isinstance(item, Key):
+                continue
+            field = decoder.fields.get(item.name)
+            if field is None:
+                raise TypeError(
+                    f"{decoder.cls.__name__} has no field for the key {item.name!r}",
+                )
+            self._current_key = item
+            fields[item.name] = self._decode_key(field, item, fields)
+        return fields.build(decoder.cls)
+
+    def _decode_key(self, field: FieldDecoder, key: Key, fields: _Fields) -> Any:
+        if key.user_type is not None or key.type == CompoundDataType.INCLUDE:
+            field.check(key.type)
+            if key.user_type is not None:
+                mapping = self._instantiate(key)
+            else:
+                mapping = self._include(key)
+            if field.decoder is None:
+                return mapping
+            return self._from_mapping(field.decoder, mapping)
+        match key.items:
+            case Value(template=True) as value if key.type == ScalarDataType.STR:
+                field.check(key.type)
+                self._templates.add(fields, key.name, value.value)  # type: ignore
+                return fields[key.name]
+            case Value() as value:
+                field.check(key.type)
+                return self.cast_scalar(value.value, key.type)  # type: ignore
+            case Collection(
+                type=CompoundDataType.DICT | CompoundDataType.UNKNOWN,
+            ) as collection if field.decoder is not None:
+                return self._decode(field.decoder, collection)
+            case Collection() as collection:
+                collection_type = collection.type
+                if self.frozen and collection_type == CompoundDataType.LIST:
+                    collection_type = CompoundDataType.TUPLE
+                item_type = key.type if isinstance(key.type, ScalarDataType) else None
+                field.check(collection_type, item_type)  # type: ignore
+                if field.item_decoder is None:
+                    # placed in the fields, so a tuple is only made once the templates
+                    # in it are resolved
+                    self._visit(collection, container=fields, slot=key.name)
+                    return fields[key.name]
+                return self._container(
+                    collection.type,  # type: ignore
+                    [
+                        self._decode_item(field.item_decoder, item)
+                        for item in collection.items
+                    ],
+                )
+        raise TypeError(f"Can not decode the key {key.name!r}")
+
+    def _from_mapping(self, decoder: Decoder, mapping: Mapping) -> Any:
+        """
+        Builds a dataclass from an instance of a user type or an included file, which
+        are compiled before they are decoded
+        """
+        fields = _Fields()
+        for name, value in mapping.items():
+            field = decoder.fields.get(name)
+            if field is None:
+                raise TypeError(
+                    f"{decoder.cls.__name__} has no field for the key {name!r}",
+                )
+            if field.decoder is not None and isinstance(value, Mapping):
+                value = self._from_mapping(field.decoder, value)
+            elif isinstance(value, Template):
+                # the template is resolved into the dataclass instead of the mapping
+                value.container = fields
+            fields[name] = value
+        return fields.build(decoder.cls)
+
+    def _decode_item(self, decoder: Decoder, item: Any) -> Any:
+        if not isinstance(item, Collection) or item.type not in (
+            CompoundDataType.DICT,
+            CompoundDataType.UNKNOWN,
+        ):
+            raise TypeError(f"Items of {decoder.cls.__name__} have to be dicts")
+        return self._decode(decoder, item)
+
+    def _container(self, collection_type: CompoundDataType, items: list) -> Any:
+        match collection_type:
+            case CompoundDataType.SET:
+                return frozenset(items) if self.frozen else set(items)
+            case CompoundDataType.TUPLE:
+                return tuple(items)
+        return tuple(items) if self.frozen else items
@@ -0,0 +1,451 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any
+
+from thsl.src.abstract_syntax_tree import Void
+from thsl.src.casting import cast_scalar, get_default_value
+from thsl.src.grammar import (
+    COMPOUND_ITEM_VALUES,
+    CompoundDataType,
+    DataType,
+    Operator,
+    SCALAR_DATA_TYPE_VALUES,
+    ScalarDataType,
+    TokenType,
+)
+from thsl.src.lexer import Lexer, Token
+
+# the key names and item indexes leading to an event
+EventPath = tuple[str | int, ...]
+
+
+class EventType(Enum):
+    START_DICT = "start_dict"
+    START_LIST = "start_list"
+    START_SET = "start_set"
+    START_TUPLE = "start_tuple"
+    KEY = "key"
+    VALUE = "value"
+    END_COLLECTION = "end_collection"
+
+
+START_EVENTS = {
+    CompoundDataType.DICT: EventType.START_DICT,
+    CompoundDataType.LIST: EventType.START_LIST,
+    CompoundDataType.SET: EventType.START_SET,
+    CompoundDataType.TUPLE: EventType.START_TUPLE,
+}
+
+OPENING_COLLECTIONS = {
+    Operator.LCURLYBRACKET.value: (CompoundDataType.DICT, Operator.RCURLYBRACKET.value),
+    Operator.LSQUAREBRACKET.value: (
+        CompoundDataType.LIST,
+        Operator.RSQUAREBRACKET.value,
+    ),
+    Operator.LANGLEBRACKET.value: (CompoundDataType.SET, Operator.RANGLEBRACKET.value),
+    Operator.LPAREN.value: (CompoundDataType.TUPLE, Operator.RPAREN.value),
+}
+
+ITEM_START_EVENTS = (
+    EventType.START_LIST,
+    EventType.START_SET,
+    EventType.START_TUPLE,
+)
+
+ITEM_COLLECTIONS = {
+    Operator.LIST_ITEM.value: CompoundDataType.LIST,
+    Operator.SET_ITEM.value: CompoundDataType.SET,
+    Operator.TUPLE_ITEM.value: CompoundDataType.TUPLE,
+}
+
+
+@dataclass
+class Event:
+    """
+    ``path`` holds the key names and item indexes leading to the event. ``KEY`` events
+    carry the key name as the value, ``VALUE`` events the declared type and the cast
+    value. ``template`` is set on the values of single-quoted strings, their text is
+    passed on without resolving the template. The ``START_DICT`` events of instances
+    of user types carry the name of the type as their ``data_type``.
+    """
+
+    type: EventType
+    path: EventPath
+    data_type: DataType | str | None = None
+    value: Any = None
+    template: bool = False
+
+
+class EventParser:
+    """
+    Turns the token stream of the Lexer straight into events without building an AST
+    or the resulting containers, so only the current path is kept in memory
+    """
+
+    def __init__(self, text: str, cast: bool = True) -> None:
+        """
+        With ``cast`` unset scalar values are passed on as the raw string (or Void when
+        left empty) together with their type
+        """
+        self._lexer = Lexer(text)
+        self._tokens = self._lexer.analyze()
+        self._peeked: Token | None = None
+        self.cast = cast
+        # the events of the keys of each user type, by key name, repeated for every
+        # key of an instance that is left at its default
+        self._prototypes: dict[str, dict[str, list[Event]]] = {}
+        # the user type whose defaults are being read
+        self._declaring: str | None = None
+
+    def __iter__(self) -> Iterator[Event]:
+        return self.parse()
+
+    def parse(self) -> Iterator[Event]:
+        yield Event(EventType.START_DICT, ())
+        yield from self._dict_block((), 0)
+        token = self._peek_line_start()
+        if token.type != TokenType.EOF:
+            raise self._error(token, "Unexpected indentation")
+        yield Event(EventType.END_COLLECTION, ())
+
+    def items(self, path: EventPath) -> Iterator[Any]:
+        """
+        Yields the items of the list, set or tuple at ``path`` one by one and stops
+        reading the document once it has been closed. Only the values of the items are
+        cast, everything before them is just lexed.
+        """
+        self.cast = False
+        events = self.parse()
+        for event in events:
+            if event.path == path and event.type in ITEM_START_EVENTS:
+                break
+        else:
+            raise KeyError(f"No list, set or tuple at {'.'.join(map(str, path))}")
+        for event in events:
+            if event.type == EventType.END_COLLECTION and event.path == path:
+                return
+            yield self._build(event, events)
+
+    def _build(self, first: Event, events: Iterator[Event]) -> Any:
+        if first.type == EventType.VALUE:
+            if isinstance(first.data_type, ScalarDataType):
+                return cast_scalar(first.value, first.data_type)
+            return first.value
+        items: list[Any] = []
+        keys: list[str | int] = []
+        for event in events:
+            if event.type == EventType.END_COLLECTION:
+                break
+            if event.type == EventType.KEY:
+                keys.append(event.value)
+                continue
+            items.append(self._build(event, events))
+        match first.type:
+            case EventType.START_DICT:
+                return dict(zip(keys, items, strict=True))
+            case EventType.START_SET:
+                return set(items)
+            case EventType.START_TUPLE:
+                return tuple(items)
+        return items
+
+    def _peek(self) -> Token:
+        if self._peeked is None:
+            self._peeked = next(self._tokens)
+        return self._peeked
+
+    def _next(self) -> Token:
+        token = self._peek()
+        if token.type != TokenType.EOF:
+            self._peeked = None
+        return token
+
+    def _peek_line_start(self) -> Token:
+        while self._peek().type == TokenType.NEWLINE:
+            self._next()
+        return self._peek()
+
+    @staticmethod
+    def _error(token: Token, message: str) -> SyntaxError:
+        return SyntaxError(f"{message} line={token.line} column={token.column}")
+
+    def _value(
+        self, path: EventPath, value: Token | Void, data_type: DataType | None
+    ) -> Event:
+        template = False
+        text: str | Void
+        if isinstance(value, Token):
+            template = (
+                data_type == ScalarDataType.STR
+                and value.meta_data is not None
+                and value.meta_data.single_quote
+            )
+            text = value.value
+        else:
+            text = value
+        if not isinstance(data_type, ScalarDataType):
+            if isinstance(text, Void) and data_type is not None:
+                return Event(
+                    EventType.VALUE, path, data_type, get_default_value(data_type)
+                )
+            return Event(EventType.VALUE, path, data_type, text)
+        if self.cast:
+            cast = cast_scalar(text, data_type)
+            return Event(EventType.VALUE, path, data_type, cast, template)
+        return Event(EventType.VALUE, path, data_type, text, template)
+
+    def _dict_block(self, path: EventPath, indent: int) -> Iterator[Event]:
+        token = self._peek_line_start()
+        while _starts_key(token) and token.indent == indent:
+            if token.type == TokenType.KEY:
+                yield from self._key(path)
+            else:
+                self._declaration(indent)
+            token = self._peek_line_start()
+
+    def _declaration(self, indent: int) -> None:
+        """
+        Reads ``@name:`` or ``@name -> base:`` and the block of defaults under it
+        without making events for them. The events of the defaults are kept, starting
+        from those of the base type.
+        """
+        self._next()
+        name_token = self._next()
+        if name_token.type != TokenType.KEY:
+            raise self._error(name_token, "Expected a type name")
+        name = name_token.value
+        defaults: dict[str, list[Event]] = {}
+        token = self._next()
+        if token.type == TokenType.OPERATOR and token.value == Operator.EXTENDS.value:
+            base = self._next()
+            if base.type != TokenType.KEY:
+                raise self._error(base, "Expected the name of a base type")
+            defaults = self._prototype(base).copy()
+            token = self._next()
+        if (
+            token.type != TokenType.TYPE
+            or token.value != CompoundDataType.UNKNOWN.value
+        ):
+            raise self._error(token, f"Expected a colon after type {name!r}")
+        token = self._peek_line_start()
+        if token.type != TokenType.KEY or token.indent <= indent:
+            self._prototypes[name] = defaults
+            return
+        self._declaring = name
+        try:
+            for event in self._dict_block((), token.indent):
+                if event.template:
+                    raise ValueError(
+                        f"The defaults of type {name!r} can not reference other keys "
+                        f"line={name_token.line}",
+                    )
+                if event.type == EventType.KEY and len(event.path) == 1:
+                    key_events = defaults[event.value] = []
+                key_events.append(event)
+        finally:
+            self._declaring = None
+        self._prototypes[name] = defaults
+
+    def _prototype(self, token: Token) -> dict[str, list[Event]]:
+        defaults = self._prototypes.get(token.value)
+        if defaults is None:
+            raise TypeError(f"Unknown type {token.value!r} line={token.line}")
+        return defaults
+
+    def _instance(
+        self,
+        path: EventPath,
+        type_token: Token,
+        indent: int | None,
+    ) -> Iterator[Event]:
+        """
+        The keys of an instance of a user type as they are read, followed by the
+        defaults of the keys it leaves out. ``indent`` is None for an instance in a
+        one-liner, which has no block.
+        """
+        defaults = self._prototype(type_token)
+        yield Event(EventType.START_DICT, path, type_token.value)
+        token = self._peek()
+        if token.type == TokenType.OPERATOR and token.value in OPENING_COLLECTIONS:
+            events = self._one_liner(path, None)
+        elif indent is not None:
+            events = self._nested(path, indent, CompoundDataType.DICT)
+        else:
+            events = iter(())
+        next(events, None)
+        names = set()
+        for event in events:
+            if event.type == EventType.END_COLLECTION and event.path == path:
+                break
+            if event.type == EventType.KEY and len(event.path) == len(path) + 1:
+                names.add(event.value)
+            yield event
+        for name, key_events in defaults.items():
+            if name not in names:
+                for event in key_events:
+                    yield replace(event, path=(*path, *event.path))
+        yield Event(EventType.END_COLLECTION, path)
+
+    def _key(self, path: EventPath) -> Iterator[Event]:
+        key_token = self._next()
+        key_path = (*path, key_token.value)
+        yield Event(EventType.KEY, key_path, value=key_token.value)
+        data_type: DataType | None = None
+        if self._peek().type == TokenType.TYPE:
+            type_token = self._next()
+            if type_token.value in self._prototypes:
+                yield from self._instance(key_path, type_token, key_token.indent)
+                return
+            data_type = self._data_type(type_token)
+        token = self._peek()
+        if token.type == TokenType.VALUE:
+            yield self._value(key_path, self._next(), data_type)
+        elif token.type == TokenType.OPERATOR and token.value in OPENING_COLLECTIONS:
+            yield from self._one_liner(key_path, self._scalar_or_none(data_type))
+        else:
+            yield from self._nested(key_path, key_token.indent, data_type)
+
+    def _nested(
+        self,
+        path: EventPath,
+        indent: int,
+        data_type: DataType | None,
+    ) -> Iterator[Event]:
+        token = self._peek_line_start()
+        if token.indent > indent and _starts_key(token):
+            yield Event(EventType.START_DICT, path)
+            yield from self._dict_block(path, token.indent)
+            yield Event(EventType.END_COLLECTION, path)
+        elif token.indent > indent and token.value in COMPOUND_ITEM_VALUES:
+            yield from self._items(path, self._scalar_or_none(data_type))
+        elif isinstance(data_type, ScalarDataType):
+            yield self._value(
+                path, Void(line=token.line, column=token.column), data_type
+            )
+        else:
+            collection_type = data_type
+            if collection_type not in START_EVENTS:
+                collection_type = CompoundDataType.DICT
+            yield Event(START_EVENTS[collection_type], path)  # type: ignore
+            yield Event(EventType.END_COLLECTION, path)
+
+    def _items(
+        self,
+        path: EventPath,
+        subtype: ScalarDataType | None,
+    ) -> Iterator[Event]:
+        first = self._peek()
+        collection_type = ITEM_COLLECTIONS[first.value]
+        yield Event(START_EVENTS[collection_type], path)
+        index = 0
+        token = first
+        while (
+            token.type == TokenType.OPERATOR
+            and token.value == first.value
+            and token.indent == first.indent
+        ):
+            self._next()
+            yield from self._item((*path, index), subtype, first.indent)
+            index += 1
+            token = self._peek_line_start()
+        yield Event(EventType.END_COLLECTION, path)
+
+    def _item(
+        self,
+        path: EventPath,
+        subtype: ScalarDataType | None,
+        indent: int,
+    ) -> Iterator[Event]:
+        token = self._peek()
+        if token.type == TokenType.NEWLINE:
+            token = self._peek_line_start()
+            yield Event(EventType.START_DICT, path)
+            if token.type == TokenType.KEY and token.indent > indent:
+                yield from self._dict_block(path, token.indent)
+            yield Event(EventType.END_COLLECTION, path)
+            return
+        yield from self._inline_value(path, subtype)
+
+    def _inline_value(
+        self,
+        path: EventPath,
+        subtype: ScalarDataType | None,
+    ) -> Iterator[Event]:
+        token = self._peek()
+        data_type: DataType | None = subtype
+        if token.type == TokenType.TYPE:
+            data_type = self._data_type(self._next())
+            token = self._peek()
+        if token.type == TokenType.VALUE:
+            yield self._value(path, self._next(), data_type)
+        elif token.type == TokenType.OPERATOR and token.value in OPENING_COLLECTIONS:
+            yield from self._one_liner(path, self._scalar_or_none(data_type))
+        elif isinstance(data_type, ScalarDataType):
+            yield self._value(
+                path, Void(line=token.line, column=token.column), data_type
+            )
+        else:
+            raise self._error(token, "Expected a value")
+
+    def _one_liner(
+        self,
+        path: EventPath,
+        subtype: ScalarDataType | None,
+    ) -> Iterator[Event]:
+        opening = self._next()
+        collection_type, closing = OPENING_COLLECTIONS[opening.value]
+        yield Event(START_EVENTS[collection_type], path)
+        index = 0
+        while True:
+            token = self._peek_line_start()
+            if token.type == TokenType.EOF:
+                raise self._error(token, f"Expected {closing}")
+            if token.type == TokenType.OPERATOR and token.value == closing:
+                self._next()
+                break
+            if (
+                token.type == TokenType.OPERATOR
+                and token.value == Operator.LIST_DELIMITER.value
+            ):
+                self._next()
+                continue
+            if collection_type == CompoundDataType.DICT:
+                if token.type != TokenType.KEY:
+                    raise self._error(token, "Expected a key")
+                yield from self._inline_key(path)
+            else:
+                yield from self._inline_value((*path, index), subtype)
+                index += 1
+        yield Event(EventType.END_COLLECTION, path)
+
+    def _inline_key(self, path: EventPath) -> Iterator[Event]:
+        key_token = self._next()
+        key_path = (*path, key_token.value)
+        yield Event(EventType.KEY, key_path, value=key_token.value)
+        token = self._peek()
+        if token.type == TokenType.TYPE and token.value in self._prototypes:
+            yield from self._instance(key_path, self._next(), None)
+            return
+        yield from self._inline_value(key_path, None)
+
+    @staticmethod
+    def _data_type(token: Token) -> DataType:
+        if token.value in SCALAR_DATA_TYPE_VALUES:
+            return ScalarDataType(token.value)
+        return CompoundDataType(token.value)
+
+    @staticmethod
+    def _scalar_or_none(data_type: DataType | None) -> ScalarDataType | None:
+        if isinstance(data_type, ScalarDataType):
+            return data_type
+        return None
+
+
+def _starts_key(token: Token) -> bool:
+    """
+    Whether a line starting with the token holds a key or declares a user type
+    """
+    return token.type == TokenType.KEY or (
+        token.type == TokenType.OPERATOR and token.value == Operator.DECORATOR.value
+    )
@@ -0,0 +1,49 @@
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+
+class FrozenDict(Mapping):
+    """
+    A read-only and hashable mapping, returned in place of dicts by a frozen load.
+
+    It wraps the dict it is given without copying it, the compiler fills that dict
+    before the load returns. The hash is computed on first use.
+    """
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, data: dict | None = None) -> None:
+        self._data = {} if data is None else data
+        self._hash: int | None = None
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenDict):
+            return self._data == other._data
+        if isinstance(other, dict):
+            return self._data == other
+        if isinstance(other, Mapping):
+            return self._data == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self._data,)
@@ -48,9 +48,12 @@ class CompoundDataType(DataType):
     DICT = "dict"
     TUPLE = "tuple"
     UNKNOWN = "unknown"
+    # a dict loaded from the file named by the value
+    INCLUDE = "include"
 
 
-ALL_DATA_TYPE_VALUES = (*ScalarDataType.values(), *CompoundDataType.values())
+SCALAR_DATA_TYPE_VALUES = tuple(ScalarDataType.values())
+ALL_DATA_TYPE_VALUES = (*SCALAR_DATA_TYPE_VALUES, *CompoundDataType.values())
 
 
 class Operator(EnumDict):
@@ -78,6 +81,8 @@ class Operator(EnumDict):
     EXTENDS = "->"
 
 
+OPERATOR_VALUES = tuple(Operator.values())
+
 OPENING_BRACKETS = (Operator.LPAREN, Operator.LSQUAREBRACKET, Operator.LCURLYBRACKET)
 OPENING_BRACKET_VALUES = tuple(item.value for item in OPENING_BRACKETS)
 CLOSING_BRACKETS = (Operator.RPAREN, Operator.RSQUAREBRACKET, Operator.RCURLYBRACKET)
@@ -96,6 +101,7 @@ MULTI_CHAR_OPERATORS = (
     Operator.ELLIPSIS,
     Operator.EXTENDS,
 )
+MULTI_CHAR_OPERATOR_VALUES = tuple(item.value for item in MULTI_CHAR_OPERATORS)
 
 COMPOUND_ITEMS = (Operator.LIST_ITEM, Operator.TUPLE_ITEM, Operator.SET_ITEM)
 COMPOUND_ITEM_VALUES = tuple(item.value for item in COMPOUND_ITEMS)
@@ -0,0 +1,92 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from thsl.src.abstract_syntax_tree import Collection
+from thsl.src.parser import Parser
+from thsl.src.stats import LoadStats
+
+# parsed trees of included files by the hash of their text, the least recently used
+# ones are dropped. Trees are not changed by compiling them so loads on any thread
+# can share them
+MAX_CACHED_TREES = 256
+
+_TREES: OrderedDict[bytes, Collection] = OrderedDict()
+_TREES_LOCK = threading.Lock()
+
+
+def content_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode()).digest()
+
+
+def parse_cached(text: str, stats: LoadStats | None = None) -> Collection:
+    """
+    Returns the tree of a document, parsing it only when no document with the same
+    text has been parsed before
+    """
+    digest = content_hash(text)
+    with _TREES_LOCK:
+        tree = _TREES.get(digest)
+        if tree is not None:
+            _TREES.move_to_end(digest)
+            return tree
+    tree = Parser(text, stats=stats).parse()
+    with _TREES_LOCK:
+        _TREES[digest] = tree
+        if len(_TREES) > MAX_CACHED_TREES:
+            _TREES.popitem(last=False)
+    return tree
+
+
+def clear_cache() -> None:
+    with _TREES_LOCK:
+        _TREES.clear()
+
+
+class IncludeGraph:
+    """
+    The files included by one load. Every file is read and compiled once, the files
+    being compiled are kept in include order to find cycles.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        if root is not None:
+            root = root.resolve()
+        self.root = root
+        # the files each document includes, the root document is keyed by None when
+        # it was not read from a file
+        self.dependencies: dict[Path | None, list[Path]] = {}
+        # the hash of the text of every file included
+        self.hashes: dict[Path, bytes] = {}
+        self.results: dict[Path, Any] = {}
+        self._active: list[Path | None] = [root]
+
+    @property
+    def current(self) -> Path | None:
+        return self._active[-1]
+
+    def resolve(self, name: str) -> Path:
+        """
+        The path of an included file, relative paths are relative to the directory of
+        the including document, or to the working directory for text
+        """
+        path = Path(name).expanduser()
+        if not path.is_absolute() and self.current is not None:
+            path = self.current.parent / path
+        return path.resolve()
+
+    def enter(self, path: Path) -> None:
+        if path in self._active:
+            cycle = self._active[self._active.index(path) :] + [path]
+            raise ValueError(
+                "Include cycle " + " -> ".join(str(file) for file in cycle),
+            )
+        dependencies = self.dependencies.setdefault(self.current, [])
+        if path not in dependencies:
+            dependencies.append(path)
+        self._active.append(path)
+
+    def exit(self) -> None:
+        self._active.pop()
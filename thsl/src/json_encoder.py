@@ -0,0 +1,261 @@
+import base64
+import ipaddress
+import json
+import math
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from pathlib import PurePath
+from typing import Any, TextIO
+from urllib.parse import ParseResult
+
+import semantic_version
+
+from thsl.src.event_parser import Event, EventType
+from thsl.src.grammar import CompoundDataType, DataType, ScalarDataType
+from thsl.src.templating import compile_template
+
+CHUNK_SIZE = 64 * 1024
+
+TYPE_TAG = "$type"
+VALUE_TAG = "value"
+
+
+class _Close:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+
+_CLOSE_OBJECT = _Close("}")
+_CLOSE_ARRAY = _Close("]")
+
+EVENT_COLLECTION_TYPES = {
+    EventType.START_DICT: CompoundDataType.DICT,
+    EventType.START_LIST: CompoundDataType.LIST,
+    EventType.START_SET: CompoundDataType.SET,
+    EventType.START_TUPLE: CompoundDataType.TUPLE,
+}
+
+
+class JsonEncoder:
+    """
+    Encodes a compiled thsl document to JSON, writing the output in chunks.
+
+    The compiled document is already fully in memory, only the JSON text is produced
+    incrementally. ``iterencode_events`` encodes the events of a document as they are
+    read instead, without compiling it.
+
+    When ``type_tags`` is set, every value that has no lossless JSON equivalent is
+    written as ``{"$type": "<thsl type>", "value": ...}`` so it can be restored by a
+    consumer that knows the thsl type names. The compiler produces ``bytes`` for the
+    ``bytes``, ``base64`` and ``base64e`` types alike, so all of them are tagged as
+    ``base64`` with the base64 encoded bytes as the value.
+    """
+
+    def __init__(self, type_tags: bool = False, chunk_size: int = CHUNK_SIZE) -> None:
+        self.type_tags = type_tags
+        self.chunk_size = chunk_size
+
+    def dump(self, data: Any, file: TextIO) -> None:
+        self._write(self.iterencode(data), file)
+
+    def dump_events(self, events: Iterable[Event], file: TextIO) -> None:
+        self._write(self.iterencode_events(events), file)
+
+    def _write(self, chunks: Iterator[str], file: TextIO) -> None:
+        buffer: list[str] = []
+        buffered = 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= self.chunk_size:
+                file.write("".join(buffer))
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            file.write("".join(buffer))
+
+    def encode(self, data: Any) -> str:
+        return "".join(self.iterencode(data))
+
+    def iterencode(self, data: Any) -> Iterator[str]:
+        stack: list[Iterator[Any]] = [iter((data,))]
+        first = [True]
+        while stack:
+            try:
+                item = next(stack[-1])
+            except StopIteration:
+                stack.pop()
+                first.pop()
+                continue
+            if isinstance(item, _Close):
+                yield item.value
+                continue
+            if not first[-1]:
+                yield ","
+            first[-1] = False
+            key, value = item if isinstance(item, _Entry) else (None, item)
+            if key is not None:
+                yield f"{json.dumps(key)}:"
+            opening = self._open(value)
+            if opening is None:
+                yield self.encode_scalar(value)
+                continue
+            prefix, children, closing = opening
+            yield prefix
+            stack.append(_chain(children, closing))
+            first.append(True)
+
+    def iterencode_events(self, events: Iterable[Event]) -> Iterator[str]:
+        """
+        Encodes the events of an EventParser as they come. Only the values of the sets
+        that are open are kept, to leave out repeated items. Templates and includes
+        can not be resolved without the rest of the document and are an error.
+        """
+        # for each open collection, whether it is a dict, its closing text, whether
+        # it has no items yet and the values of a set
+        keyed: list[bool] = []
+        closing: list[str] = []
+        first: list[bool] = [True]
+        seen: list[set | None] = []
+        for event in events:
+            if event.type == EventType.END_COLLECTION:
+                yield closing.pop()
+                keyed.pop()
+                first.pop()
+                seen.pop()
+                continue
+            if event.type == EventType.KEY:
+                if not first[-1]:
+                    yield ","
+                first[-1] = False
+                yield f"{json.dumps(str(event.value))}:"
+                continue
+            if event.type == EventType.VALUE and seen and seen[-1] is not None:
+                if event.value in seen[-1]:
+                    continue
+                seen[-1].add(event.value)
+            if not keyed or not keyed[-1]:
+                if not first[-1]:
+                    yield ","
+                first[-1] = False
+            if event.type == EventType.VALUE:
+                yield from self.iterencode(_streamed_value(event))
+                continue
+            collection_type = EVENT_COLLECTION_TYPES[event.type]
+            if collection_type == CompoundDataType.DICT:
+                prefix, suffix = "{", "}"
+            elif collection_type == CompoundDataType.LIST or not self.type_tags:
+                prefix, suffix = "[", "]"
+            else:
+                prefix = f'{{"{TYPE_TAG}":"{collection_type.value}","{VALUE_TAG}":['
+                suffix = "]}"
+            yield prefix
+            keyed.append(collection_type == CompoundDataType.DICT)
+            closing.append(suffix)
+            first.append(True)
+            seen.append(set() if collection_type == CompoundDataType.SET else None)
+
+    def _open(self, value: Any) -> tuple[str, Iterator[Any], _Close] | None:
+        if isinstance(value, Mapping):
+            return "{", (_Entry(str(k), v) for k, v in value.items()), _CLOSE_OBJECT
+        if isinstance(value, list):
+            return "[", iter(value), _CLOSE_ARRAY
+        if isinstance(value, tuple | set | frozenset):
+            if isinstance(value, ParseResult):
+                return None
+            if not self.type_tags:
+                return "[", iter(value), _CLOSE_ARRAY
+            collection_type = self.collection_type(value)
+            prefix = f'{{"{TYPE_TAG}":"{collection_type.value}","{VALUE_TAG}":['
+            return prefix, iter(value), _Close("]}")
+        return None
+
+    @staticmethod
+    def collection_type(value: Any) -> CompoundDataType:
+        match value:
+            case Mapping():
+                return CompoundDataType.DICT
+            case list():
+                return CompoundDataType.LIST
+            case set() | frozenset():
+                return CompoundDataType.SET
+            case tuple():
+                return CompoundDataType.TUPLE
+        raise TypeError(f"{type(value).__name__} is not a thsl collection")
+
+    def encode_scalar(self, value: Any) -> str:
+        if value is None or isinstance(value, bool | int | str):
+            return json.dumps(value)
+        if isinstance(value, float) and math.isfinite(value):
+            return json.dumps(value)
+        data_type, text = self.scalar_to_text(value)
+        if not self.type_tags:
+            return json.dumps(text)
+        return f'{{"{TYPE_TAG}":"{data_type.value}","{VALUE_TAG}":{json.dumps(text)}}}'
+
+    @staticmethod
+    def scalar_to_text(value: Any) -> tuple[DataType, str]:  # noqa: PLR0911
+        match value:
+            case float():
+                return ScalarDataType.FLOAT, repr(value)
+            case Decimal():
+                return ScalarDataType.DEC, str(value)
+            case complex():
+                return ScalarDataType.COMPLEX, _complex_to_text(value)
+            case bytes():
+                return ScalarDataType.BASE64, base64.b64encode(value).decode("ascii")
+            case datetime():
+                return ScalarDataType.DATETIME, value.isoformat()
+            case date():
+                return ScalarDataType.DATE, value.isoformat()
+            case time():
+                return ScalarDataType.TIME, value.isoformat()
+            case timedelta():
+                return ScalarDataType.INTERVAL, f"{value.total_seconds()} seconds"
+            case ipaddress.IPv4Address() | ipaddress.IPv6Address():
+                return ScalarDataType.IP_ADDRESS, str(value)
+            case ipaddress.IPv4Network() | ipaddress.IPv6Network():
+                return ScalarDataType.IP_NETWORK, str(value)
+            case ParseResult():
+                return ScalarDataType.URL, value.geturl()
+            case range() if value.step == 1:
+                return ScalarDataType.RANGE, f"{value.start}..{value.stop}"
+            case PurePath():
+                return ScalarDataType.PATH, str(value)
+            case semantic_version.Version():
+                return ScalarDataType.SEMVER, str(value)
+            case re.Pattern():
+                return ScalarDataType.REGEX, value.pattern
+        raise TypeError(f"{type(value).__name__} can not be encoded to JSON")
+
+
+class _Entry(tuple):
+    __slots__ = ()
+
+    def __new__(cls, key: str, value: Any) -> "_Entry":
+        return super().__new__(cls, (key, value))
+
+
+def _chain(children: Iterator[Any], closing: _Close) -> Iterator[Any]:
+    yield from children
+    yield closing
+
+
+def _streamed_value(event: Event) -> Any:
+    path = ".".join(map(str, event.path))
+    if event.data_type == CompoundDataType.INCLUDE:
+        raise ValueError(f"The include at {path} can not be read while streaming")
+    if not event.template:
+        return event.value
+    parts = compile_template(event.value)
+    if not all(isinstance(part, str) for part in parts):
+        raise ValueError(f"The template at {path} can not be resolved while streaming")
+    return "".join(parts)  # type: ignore
+
+
+def _complex_to_text(value: complex) -> str:
+    real = f"{value.real:g}"
+    imag = f"{value.imag:+g}"
+    return f"{real}{imag}i"
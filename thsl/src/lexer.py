@@ -1,3 +1,4 @@
+import re
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from enum import auto, Enum
@@ -6,11 +7,14 @@ from typing import Literal
 from thsl.src.grammar import (
     ALL_DATA_TYPE_VALUES,
     CLOSING_BRACKET_VALUES,
+    COMPOUND_ITEM_VALUES,
     CompoundDataType,
-    MULTI_CHAR_OPERATORS,
+    MULTI_CHAR_OPERATOR_VALUES,
     Operator,
+    OPERATOR_VALUES,
     OPERATORS_TO_IGNORE,
     OTHER_NUMERIC_CHARACTERS,
+    SCALAR_DATA_TYPE_VALUES,
     ScalarDataType,
     TokenType,
 )
@@ -68,6 +72,54 @@ TypeContentState = Homogeneous | Heterogeneous
 class LexerState:
     type: TypeState = TypeState.DICT
     contents: TypeContentState = field(default_factory=lambda: Heterogeneous())
+    item: bool = False
+    indent: int = 0
+
+
+# characters that start or end something other than a plain key or value, a minus is
+# part of words
+_OPERATOR_CHARACTERS = re.escape(
+    "".join(
+        sorted(
+            {character for value in Operator.values() for character in value}
+            - {Operator.MINUS.value},
+        ),
+    ),
+)
+_KEY = rf"([A-Za-z_][^\s#\\{_OPERATOR_CHARACTERS}]*)"
+# a line that is nothing but ``key :type: value``, read with a single match when the
+# value is one the type's pattern below accepts
+_SIMPLE_LINE = re.compile(rf"{_KEY} +:([a-z0-9]+): +((?:.*[^ \t\r])?)[ \t\r]*")
+# a line that is nothing but ``key:``, the key of a block
+_SIMPLE_BLOCK_KEY = re.compile(rf"{_KEY}:[ \t]*")
+_REST_OF_LINE = re.compile(rf"[^\s#'\"{_OPERATOR_CHARACTERS}][^#]*(?<!\\)")
+_ANY_REST_OF_LINE = re.compile(r"[^\s#'\":][^#]*(?<!\\)")
+_INDENT = re.compile(rf"{TokenType.INDENT.value}*")
+_FLOAT = re.compile(r"-?(?:\d+(?:\.\d+)?(?:e-?\d+)?|inf|nan)")
+SIMPLE_VALUES: dict[str, tuple[ScalarDataType, re.Pattern]] = {
+    ScalarDataType.INT.value: (ScalarDataType.INT, re.compile(r"-?\d+")),
+    ScalarDataType.FLOAT.value: (ScalarDataType.FLOAT, _FLOAT),
+    ScalarDataType.DEC.value: (ScalarDataType.DEC, _FLOAT),
+    ScalarDataType.BOOL.value: (ScalarDataType.BOOL, re.compile("true|false")),
+    **{
+        data_type.value: (data_type, _REST_OF_LINE)
+        for data_type in (
+            ScalarDataType.STR,
+            ScalarDataType.DATE,
+            ScalarDataType.DATETIME,
+            ScalarDataType.TIME,
+            ScalarDataType.INTERVAL,
+            ScalarDataType.URL,
+            ScalarDataType.IP_ADDRESS,
+            ScalarDataType.IP_NETWORK,
+            ScalarDataType.BASE64,
+            ScalarDataType.BASE64E,
+            ScalarDataType.RANGE,
+        )
+    },
+    ScalarDataType.PATH.value: (ScalarDataType.PATH, _ANY_REST_OF_LINE),
+    ScalarDataType.REGEX.value: (ScalarDataType.REGEX, _ANY_REST_OF_LINE),
+}
 
 
 class Lexer:
@@ -80,11 +132,14 @@ class Lexer:
         self._current_data_type: ScalarDataType | None
         self._last_data_type: ScalarDataType | None
         self._current_key: Token | None
-        self._word: str
+        self._word_parts: list[str]
         self._word_type: TokenType | None
         self._line_num: int
         self._indent_level: int
-        self._type_stack = [LexerState()]
+        self._line_has_tokens: bool
+        self._type_stack: list[LexerState]
+        self._declaring_type: bool
+        self._pending_tokens: list[Token]
         self.user_types: list[str]
         self.text = text
 
@@ -109,7 +164,9 @@ class Lexer:
         self._current_char = self.text[self._pos]
         self._line_num = 1
         self._indent_level = 0
-        self._word = ""
+        self._line_has_tokens = False
+        self._type_stack = [LexerState()]
+        self._word_parts = []
         self._word_type = None
         self._column = 1
         self._char_type = None
@@ -117,6 +174,8 @@ class Lexer:
         self._last_data_type = None
         self._current_data_type = None
         self._current_key = None
+        self._declaring_type = False
+        self._pending_tokens = []
         self.user_types = []
 
     @property
@@ -136,6 +195,8 @@ class Lexer:
     ) -> Token:
         if not line_num:
             line_num = self._line_num
+        if token_type != TokenType.NEWLINE:
+            self._line_has_tokens = True
         return Token(
             type=token_type,
             value=value,
@@ -155,6 +216,16 @@ class Lexer:
             self._current_char = self.text[self._pos]
             self._char_type = self._get_type(self._current_char)
 
+    def _advance(self, count: int) -> None:
+        """
+        Moves ``count`` characters ahead at once, like calling _next_char that often
+        """
+        if count < 1:
+            return
+        self._pos += count - 1
+        self._column += count - 1
+        self._next_char()
+
     def _skip_char(self) -> None:
         self._pos += 1
         self._column += 1
@@ -164,9 +235,17 @@ class Lexer:
         else:
             self._current_char = self.text[self._pos]
 
+    @property
+    def _word(self) -> str:
+        return "".join(self._word_parts)
+
+    @_word.setter
+    def _word(self, word: str) -> None:
+        self._word_parts = [word] if word else []
+
     def _reset_word(self) -> str:
         old_word = self._word
-        self._word = ""
+        self._word_parts = []
         self._word_type = None
         return old_word
 
@@ -191,25 +270,92 @@ class Lexer:
         current_pos = self._pos
         current_char = self._current_char
         current_char_type = self._char_type
-        current_word = self._word
+        current_word_parts = list(self._word_parts)
         current_word_type = self._word_type
         current_line_num = self._line_num
         current_indent_level = self._indent_level
+        current_line_has_tokens = self._line_has_tokens
+        current_type_stack = list(self._type_stack)
+        current_pending_tokens = list(self._pending_tokens)
         for _ in range(num):
             next_token = self._get_next_token()
         self._pos = current_pos
         self._current_char = current_char
         self._char_type = current_char_type
-        self._word = current_word
+        self._word_parts = current_word_parts
         self._word_type = current_word_type
         self._line_num = current_line_num
         self._indent_level = current_indent_level
+        self._line_has_tokens = current_line_has_tokens
+        self._type_stack = current_type_stack
+        self._pending_tokens = current_pending_tokens
         return next_token
 
+    def skip_block(self, indent: int) -> bool:
+        """
+        Skips the lines indented deeper than ``indent`` without lexing them, the lexer
+        has to be at the start of a line. Blank and comment lines in between are skipped
+        too. A block holding quotes, escaped newlines or unbalanced brackets may go on
+        over less indented lines, it is left in place and False is returned.
+        """
+        deeper = TokenType.INDENT.value * (indent + 1)
+        end = self._pos
+        lines = 0
+        while end < self._len:
+            newline = self._text.find(TokenType.NEWLINE.value, end)
+            line_end = self._len if newline == -1 else newline + 1
+            line = self._text[end:line_end]
+            stripped = line.strip()
+            if not (
+                line.startswith(deeper)
+                or not stripped
+                or stripped.startswith(TokenType.COMMENT.value)
+            ):
+                break
+            end = line_end
+            lines += newline != -1
+        block = self._text[self._pos : end]
+        if not self._is_skippable(block):
+            return False
+        self._pos = end
+        self._column = 1
+        self._line_num += lines
+        self._last_data_type = None
+        if self._pos > self._len - 1:
+            self._current_char = None
+            self._char_type = None
+        else:
+            self._current_char = self.text[self._pos]
+            self._char_type = self._get_type(self._current_char)
+        return True
+
+    @staticmethod
+    def _is_skippable(block: str) -> bool:
+        if (
+            Operator.DOUBLE_QUOTE.value in block
+            or Operator.SINGLE_QUOTE.value in block
+            or TokenType.ESCAPE.value + TokenType.NEWLINE.value in block
+        ):
+            return False
+        return all(
+            block.count(opening.value) == block.count(closing.value)
+            for opening, closing in (
+                (Operator.LSQUAREBRACKET, Operator.RSQUAREBRACKET),
+                (Operator.LPAREN, Operator.RPAREN),
+                (Operator.LCURLYBRACKET, Operator.RCURLYBRACKET),
+                (Operator.LANGLEBRACKET, Operator.RANGLEBRACKET),
+            )
+        )
+
     def _skip_whitespace(self) -> None:
         if self._peek(-1) == TokenType.NEWLINE.value:
             raise SyntaxError("Only tab characters can indent")
-        while self._current_char is not None and self._current_char.isspace():
+        # the newline ending the line is a token of its own
+        while (
+            self._current_char is not None
+            and self._current_char.isspace()
+            and self._current_char != TokenType.NEWLINE.value
+        ):
             self._next_char()
             self._reset_word()
 
@@ -231,6 +377,7 @@ class Lexer:
         )
         self._column = 0
         self._indent_level = 0
+        self._line_has_tokens = False
         self._increment_line_num()
         self._last_data_type = self._current_data_type
         self._current_data_type = None
@@ -239,13 +386,13 @@ class Lexer:
         return token
 
     def _skip_indent(self) -> None:
-        while (
-            self._current_char is not None
-            and self._current_char == TokenType.INDENT.value
-        ):
-            self._reset_word()
-            self._indent_level += 1
-            self._next_char()
+        if self._current_char != TokenType.INDENT.value:
+            return
+        # deeply nested lines start with a long run of tabs, skipped in one go
+        end = _INDENT.match(self._text, self._pos).end()  # type: ignore
+        self._reset_word()
+        self._indent_level += end - self._pos
+        self._advance(end - self._pos)
 
     def _eof(self) -> Token:
         return self._make_token(
@@ -258,18 +405,25 @@ class Lexer:
             return self._eat_string(Operator.SINGLE_QUOTE)
         if self._current_char == Operator.DOUBLE_QUOTE.value:
             return self._eat_string(Operator.DOUBLE_QUOTE)
-        while (
-            self._current_char != TokenType.NEWLINE.value
-            and self._current_char != TokenType.COMMENT.value
-        ):
-            if (
-                self._current_char == TokenType.ESCAPE.value
-                and self._peek(1) == TokenType.NEWLINE.value
-            ):
-                self._next_char()
-            if self._current_char is not None:
-                self._word += self._current_char
-            self._next_char()
+        # the value runs to the end of the line or a comment, a backslash before the
+        # newline carries it over to the next line
+        start = self._pos
+        while True:
+            end = self._text.find(TokenType.NEWLINE.value, start)
+            escaped = end > start and self._text[end - 1] == TokenType.ESCAPE.value
+            if end == -1:
+                end = self._len
+            comment = self._text.find(TokenType.COMMENT.value, start, end)
+            if comment != -1:
+                end = comment
+            elif escaped:
+                self._word_parts.append(self._text[start : end - 1])
+                self._word_parts.append(TokenType.NEWLINE.value)
+                start = end + 1
+                continue
+            self._word_parts.append(self._text[start:end])
+            break
+        self._advance(end - self._pos)
         self._word = self._word.strip()
         return self._eat_value(
             self._reset_word(),
@@ -279,20 +433,22 @@ class Lexer:
         self,
         quote: Literal[Operator.DOUBLE_QUOTE, Operator.SINGLE_QUOTE],
     ) -> Token:
-        self._next_char()
-        while self._current_char != quote.value:
-            if (
-                self._current_char == TokenType.ESCAPE.value
-                and self._peek(1) == quote.value
-            ):
-                self._next_char()
-            if self._current_char == TokenType.NEWLINE.value:
-                self._line_num += 1
-            if self._current_char is not None:
-                self._word += self._current_char
-            self._next_char()
-        self._next_char()
-        if not self._current_key:
+        # the string runs to the next quote without a backslash before it
+        start = self._pos + 1
+        while True:
+            end = self._text.find(quote.value, start)
+            if end == -1:
+                raise SyntaxError(f"Unterminated string line={self._line_num}")
+            if end > start and self._text[end - 1] == TokenType.ESCAPE.value:
+                self._word_parts.append(self._text[start : end - 1])
+                self._word_parts.append(quote.value)
+                start = end + 1
+                continue
+            self._word_parts.append(self._text[start:end])
+            break
+        self._line_num += self._text.count(TokenType.NEWLINE.value, self._pos, end)
+        self._advance(end + 1 - self._pos)
+        if not self._current_key and self._current_state.type == TypeState.DICT:
             token = self._eat_key(
                 self._reset_word(),
             )
@@ -304,27 +460,33 @@ class Lexer:
         )
 
     def _eat_operator(self, value: str | None = None) -> Token:
+        is_item = not self._line_has_tokens
         if value:
             token = self._make_token(TokenType.OPERATOR, value)
         else:
             if (
-                self._current_char in MULTI_CHAR_OPERATORS
-                and self.preview_token(1).value in MULTI_CHAR_OPERATORS  # type: ignore
+                self._current_char in MULTI_CHAR_OPERATOR_VALUES
+                and self._peek(1) in MULTI_CHAR_OPERATOR_VALUES
             ):
                 self._next_char()
-                self._word += " "
+                self._word_parts.append(" ")
                 while (
                     self._char_type == TokenType.ALPHANUMERIC
                     or self._char_type == TokenType.NUMBER
                 ):
                     if self._current_char is not None:
-                        self._word += self._current_char
+                        self._word_parts.append(self._current_char)
                     self._next_char()
                 token = self._make_token(TokenType.OPERATOR, self._reset_word())
             else:
-                if self._current_char in Operator.values():
-                    self._word += self._current_char
+                if self._current_char in OPERATOR_VALUES:
+                    self._word_parts.append(self._current_char)
                     self._next_char()
+                if not self._word_parts:
+                    raise SyntaxError(
+                        f"Unexpected character {self._current_char!r} "
+                        f"line={self._line_num} column={self._column}",
+                    )
                 token = self._make_token(
                     TokenType.OPERATOR,
                     self._reset_word(),
@@ -333,6 +495,10 @@ class Lexer:
         if token.value == Operator.LIST_DELIMITER.value:
             self._current_data_type = None
 
+        if is_item and token.value == Operator.DECORATOR.value:
+            # the key that follows names a user type
+            self._declaring_type = True
+
         type_content_state: TypeContentState
 
         if (
@@ -346,49 +512,68 @@ class Lexer:
         if token.value in CLOSING_BRACKET_VALUES:
             self._current_data_type = None
 
-        if token.value == Operator.LCURLYBRACKET.value:
-            self._type_stack.append(LexerState(TypeState.DICT, type_content_state))
-
-        if token.value == Operator.LSQUAREBRACKET.value:
-            self._type_stack.append(LexerState(TypeState.LIST, type_content_state))
-
         if token.value == Operator.LIST_ITEM.value:
-            type_content_state = Homogeneous(self._last_data_type)
+            self._enter_item_block(TypeState.LIST)
+        elif is_item and token.value == Operator.SET_ITEM.value:
+            self._enter_item_block(TypeState.SET)
+        elif is_item and token.value == Operator.TUPLE_ITEM.value:
+            self._enter_item_block(TypeState.TUPLE)
+        elif token.value == Operator.LCURLYBRACKET.value:
+            self._type_stack.append(LexerState(TypeState.DICT, type_content_state))
+        elif token.value == Operator.LSQUAREBRACKET.value:
             self._type_stack.append(LexerState(TypeState.LIST, type_content_state))
-
-        if token.value == Operator.LANGLEBRACKET.value:
-            self._type_stack.append(LexerState(TypeState.SET, type_content_state))
-
-        if token.value == Operator.SET_ITEM.value:
-            type_content_state = Homogeneous(self._last_data_type)
+        elif token.value == Operator.LANGLEBRACKET.value:
             self._type_stack.append(LexerState(TypeState.SET, type_content_state))
-
-        if token.value == Operator.LPAREN.value:
-            self._type_stack.append(LexerState(TypeState.TUPLE, type_content_state))
-
-        if token.value == Operator.TUPLE_ITEM.value:
-            type_content_state = Homogeneous(self._last_data_type)
+        elif token.value == Operator.LPAREN.value:
             self._type_stack.append(LexerState(TypeState.TUPLE, type_content_state))
+        elif token.value == Operator.RSQUAREBRACKET.value:
+            self._close_bracket(TypeState.LIST)
+        elif token.value == Operator.RANGLEBRACKET.value:
+            self._close_bracket(TypeState.SET)
+        elif token.value == Operator.RCURLYBRACKET.value:
+            self._close_bracket(TypeState.DICT)
+        elif token.value == Operator.RPAREN.value:
+            self._close_bracket(TypeState.TUPLE)
+        return token
 
-        if token.value == Operator.RSQUAREBRACKET.value:
-            if self._current_state.type != TypeState.LIST:
-                raise SyntaxError
+    def _enter_item_block(self, type_state: TypeState) -> None:
+        """
+        All the items of an item block (lines starting with -, > or ) at the same
+        indentation) share a single state, which is dropped again once a line at that
+        indentation starts with anything else
+        """
+        while self._current_state.item and self._current_state.indent > (
+            self._indent_level
+        ):
             self._type_stack.pop()
-        if token.value == Operator.RANGLEBRACKET.value:
-            if self._current_state.type != TypeState.SET:
-                raise SyntaxError
-            if not isinstance(type_content_state, Homogeneous):
-                self._type_stack.pop()
-        if token.value == Operator.RCURLYBRACKET.value:
-            if self._current_state.type != TypeState.DICT:
-                raise SyntaxError
+        if (
+            self._current_state.item
+            and self._current_state.indent == self._indent_level
+            and self._current_state.type == type_state
+        ):
+            return
+        self._type_stack.append(
+            LexerState(
+                type_state,
+                Homogeneous(self._last_data_type),  # type: ignore
+                item=True,
+                indent=self._indent_level,
+            ),
+        )
+
+    def _exit_item_blocks(self) -> None:
+        while self._current_state.item and self._current_state.indent >= (
+            self._indent_level
+        ):
             self._type_stack.pop()
-        if token.value == Operator.RPAREN.value:
-            if self._current_state.type != TypeState.TUPLE:
-                raise SyntaxError
-            if not isinstance(type_content_state, Homogeneous):
-                self._type_stack.pop()
-        return token
+
+    def _close_bracket(self, type_state: TypeState) -> None:
+        if self._current_state.type != type_state or self._current_state.item:
+            raise SyntaxError(
+                f"Unexpected closing bracket line={self._line_num} "
+                f"column={self._column}",
+            )
+        self._type_stack.pop()
 
     def _eat_type(self, value: str | None = None) -> Token:
         if value:
@@ -402,19 +587,24 @@ class Lexer:
             if self._current_char == Operator.VALUE_DELIMITER.value:
                 break
             if self._current_char is not None:
-                self._word += self._current_char
+                self._word_parts.append(self._current_char)
             self._next_char()
 
-        if self._word in ScalarDataType.values():
-            self._current_data_type = ScalarDataType(self._word)
-        else:
-            self._current_data_type = CompoundDataType(self._word)
-
         if self._word in self.user_types:
+            # instances of user types are dicts, lexed like keys without a type
+            self._current_data_type = None
+            if self._current_char == Operator.VALUE_DELIMITER.value:
+                self._next_char()
             return self._make_token(
                 TokenType.TYPE,
                 self._reset_word(),
             )
+
+        if self._word in SCALAR_DATA_TYPE_VALUES:
+            self._current_data_type = ScalarDataType(self._word)
+        else:
+            self._current_data_type = CompoundDataType(self._word)
+
         if self._word in ALL_DATA_TYPE_VALUES:
             return self._make_token(
                 TokenType.TYPE,
@@ -428,12 +618,12 @@ class Lexer:
             or self._char_type == TokenType.NUMBER
         ):
             if self._current_char is not None:
-                self._word += self._current_char
+                self._word_parts.append(self._current_char)
             self._next_char()
 
         if self._current_data_type in (ScalarDataType.FLOAT, ScalarDataType.DEC):
             return self._eat_number()
-        if self._word in Operator.values():
+        if self._word in OPERATOR_VALUES:
             return self._eat_operator()
         if self._current_data_type:
             return self._eat_value(self._reset_word())
@@ -448,9 +638,12 @@ class Lexer:
                 or self._char_type == TokenType.NUMBER
             ):
                 if self._current_char is not None:
-                    self._word += self._current_char
+                    self._word_parts.append(self._current_char)
                 self._next_char()
             token = self._make_token(TokenType.KEY, self._reset_word())
+        if self._declaring_type:
+            self._declaring_type = False
+            self.user_types.append(token.value)
         self._current_key = token
         return token
 
@@ -465,7 +658,7 @@ class Lexer:
             if self._current_char in OPERATORS_TO_IGNORE:
                 self._skip_char()
             if self._current_char is not None:
-                self._word += self._current_char
+                self._word_parts.append(self._current_char)
             self._next_char()
         return self._eat_value(
             self._reset_word(),
@@ -494,7 +687,7 @@ class Lexer:
             return TokenType.ESCAPE
         if char == Operator.MINUS.value:
             return TokenType.ALPHANUMERIC
-        if char in Operator.values():
+        if char in OPERATOR_VALUES:
             return TokenType.OPERATOR
         if char.isdigit():
             return TokenType.NUMBER
@@ -502,7 +695,58 @@ class Lexer:
             return TokenType.EMPTY
         return TokenType.ALPHANUMERIC
 
+    def _scan_simple_line(self) -> Token | None:
+        """
+        Reads a ``key :type: value`` or ``key:`` line without brackets, quotes, escapes
+        or comments in one go. The tokens are the ones reading it character by
+        character would make, the key is returned and the rest are queued. Returns
+        None, without moving, for any other line.
+        """
+        line_end = self._text.find(TokenType.NEWLINE.value, self._pos)
+        if line_end == -1:
+            line_end = self._len
+        line_start = self._pos - self._column + 1
+        match = _SIMPLE_LINE.fullmatch(self._text, self._pos, line_end)
+        if match is None:
+            match = _SIMPLE_BLOCK_KEY.fullmatch(self._text, self._pos, line_end)
+            if match is None:
+                return None
+            self._column = match.end(1) - line_start + 1
+            key_token = self._eat_key(match.group(1))
+            # the type is made once the colon has been read
+            self._column += 1
+            self._pending_tokens = [
+                self._make_token(TokenType.TYPE, CompoundDataType.UNKNOWN.value),
+            ]
+            self._pos = line_end - 1
+            self._column = line_end - line_start
+            self._next_char()
+            return key_token
+        key, type_name, value = match.groups()
+        simple_value = SIMPLE_VALUES.get(type_name)
+        if simple_value is None or not simple_value[1].fullmatch(value):
+            return None
+        data_type = simple_value[0]
+        value_end = match.end(3)
+        if simple_value[1] in (_REST_OF_LINE, _ANY_REST_OF_LINE):
+            # the rest of the line is read up to the newline
+            value_end = line_end
+        self._column = match.end(1) - line_start + 1
+        key_token = self._eat_key(key)
+        self._column = match.end(2) - line_start + 1
+        type_token = self._make_token(TokenType.TYPE, type_name)
+        self._column = value_end - line_start + 1
+        self._pending_tokens = [type_token, self._eat_value(value)]
+        self._current_data_type = data_type
+        self._pos = line_end - 1
+        self._column = line_end - line_start
+        self._next_char()
+        return key_token
+
     def _get_next_token(self) -> Token:
+        if self._pending_tokens:
+            return self._pending_tokens.pop(0)
+
         if (
             self._current_char == Operator.LIST_DELIMITER.value
             and self._peek(1) == Operator.LIST_DELIMITER.value
@@ -528,8 +772,21 @@ class Lexer:
         if self._current_char == TokenType.INDENT.value:
             self._skip_indent()
 
+        if (
+            not self._line_has_tokens
+            and len(self._type_stack) == 1
+            and self._current_char not in (None, TokenType.NEWLINE.value)
+            and not self._current_char.isspace()
+            and (token := self._scan_simple_line()) is not None
+        ):
+            return token
+
         if self._current_char.isspace():
             self._skip_whitespace()
+            if self._current_char is None:
+                return self._eof()
+            if self._current_char == TokenType.NEWLINE.value:
+                return self._eat_newline()
 
         if self._current_char == TokenType.COMMENT.value:
             return self._skip_comment()
@@ -551,12 +808,26 @@ class Lexer:
         if not self._word_type:
             self._word_type = self._char_type
 
-        if isinstance(self._current_state.contents, Homogeneous):
+        if not self._line_has_tokens:
+            if self._current_char in COMPOUND_ITEM_VALUES and self._peek(1) in (
+                " ",
+                TokenType.INDENT.value,
+                TokenType.NEWLINE.value,
+                None,
+            ):
+                return self._eat_operator()
+            self._exit_item_blocks()
+
+        if (
+            isinstance(self._current_state.contents, Homogeneous)
+            and self._current_state.contents.type is not None
+        ):
             self._current_data_type = self._current_state.contents.type
 
         if self._word_type == TokenType.OPERATOR and self._current_data_type not in (
             ScalarDataType.PATH,
             ScalarDataType.REGEX,
+            CompoundDataType.INCLUDE,
         ):
             return self._eat_operator()
 
@@ -574,6 +845,7 @@ class Lexer:
             ScalarDataType.RANGE,
             ScalarDataType.PATH,
             ScalarDataType.REGEX,
+            CompoundDataType.INCLUDE,
         ):
             return self._eat_rest_of_line()
 
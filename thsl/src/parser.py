@@ -1,23 +1,84 @@
+import time
+from collections.abc import Generator
 from pathlib import Path
+from typing import Any
 
-from thsl.src.abstract_syntax_tree import AST, Collection, Key, Value, Void
+from thsl.src.abstract_syntax_tree import (
+    AliasDeclaration,
+    AST,
+    Collection,
+    Key,
+    Value,
+    Void,
+)
 from thsl.src.grammar import (
+    ALL_DATA_TYPE_VALUES,
     COMPOUND_ITEM_VALUES,
     CompoundDataType,
     DataType,
     Operator,
+    SCALAR_DATA_TYPE_VALUES,
     ScalarDataType,
     TokenType,
 )
 from thsl.src.lexer import Lexer, Token
+from thsl.src.stats import count_nodes, LoadStats
+
+# a step of parsing a rule, it yields the steps of the rules it is made of and is sent
+# back what each of them returned
+Step = Generator["Step", Any, Any]
+
+
+def run(step: Step) -> Any:
+    """
+    Runs a step and every step it is made of on a stack of its own instead of on the
+    call stack, so the depth of nesting is only limited by memory
+    """
+    stack = [step]
+    result: Any = None
+    error: BaseException | None = None
+    while stack:
+        try:
+            if error is None:
+                called = stack[-1].send(result)
+            else:
+                failed, error = error, None
+                called = stack[-1].throw(failed)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+            continue
+        except Exception as err:  # noqa: BLE001
+            stack.pop()
+            if not stack:
+                raise
+            error = err
+            continue
+        stack.append(called)
+        result = None
+    return result
 
 
 class Parser:
-    def __init__(self, file_path: Path | str) -> None:
+    def __init__(
+        self,
+        file_path: Path | str,
+        stats: LoadStats | None = None,
+        tokens: list[Token] | None = None,
+    ) -> None:
         if isinstance(file_path, Path):
             file_path = file_path.open().read()
+        self.stats = stats
         self._lexer = Lexer(file_path)
-        self.tokens = self._lexer.parse()
+        if tokens is not None:
+            self.tokens = tokens
+        elif stats is None:
+            self.tokens = self._lexer.parse()
+        else:
+            start = time.perf_counter()
+            self.tokens = self._lexer.parse()
+            stats.lex_seconds += time.perf_counter() - start
+            stats.tokens += len(self.tokens)
         self.current_token = self.tokens[0]
         self.current_key = None
         self.current_data_type = None
@@ -26,13 +87,25 @@ class Parser:
         self._indent = 0
 
     def parse(self) -> Collection:
+        if self.stats is None:
+            return self._parse()
+        start = time.perf_counter()
+        root = self._parse()
+        self.stats.parse_seconds += time.perf_counter() - start
+        self.stats.nodes += count_nodes(root)
+        return root
+
+    def _parse(self) -> Collection:
+        return run(self.document())
+
+    def document(self) -> Step:
         root = Collection(
             type=CompoundDataType.DICT,
             line=self.line,
             column=self.column,
         )
         while self.type != TokenType.EOF:
-            statements = self.statement_list()
+            statements = yield self.statement_list()
             root.items.extend(statements)
         return root
 
@@ -84,20 +157,20 @@ class Parser:
             preview_pos = self.len - 1
         return self.tokens[preview_pos]
 
-    def make_collection(self, collection_type: DataType) -> Collection:
+    def make_collection(self, collection_type: DataType) -> Step:
         return Collection(
-            items=self.statement_list(),
+            items=(yield self.statement_list()),
             type=collection_type,
             line=self.line,
             column=self.column,
         )
 
-    def statement_list(self) -> list[AST]:
+    def statement_list(self) -> Step:
         results = []
         self.set_indent()
         _indent = self._indent
         while self.current_token_indent == _indent:
-            if statement := self.statement():
+            if statement := (yield self.statement()):
                 results.append(statement)
             if self.type == TokenType.NEWLINE or (
                 self.type == TokenType.OPERATOR
@@ -110,9 +183,9 @@ class Parser:
         results = [result for result in results if result is not None]
         return results
 
-    def statement(self) -> AST | None:
+    def statement(self) -> Step:
         if self.type == TokenType.KEY:
-            return self.eat_key()
+            return (yield self.eat_key())
         if self.type == TokenType.VALUE:
             return self.eat_value()
         if self.type == TokenType.TYPE:
@@ -121,17 +194,21 @@ class Parser:
             value = self.eat_value()
             value.type = value_type
             return value
+        if self.type == TokenType.OPERATOR and self.value == Operator.DECORATOR.value:
+            return (yield self.eat_alias_declaration())
         if self.type == TokenType.OPERATOR and self.value not in (
             Operator.LIST_DELIMITER.value,
             Operator.RCURLYBRACKET.value,
         ):
-            return self.eat_operator()
+            return (yield self.eat_operator())
         self.next_token()
         return None
 
-    def eat_key(self) -> Key | None:
+    def eat_key(self) -> Step:
         name = self.value
         self.next_token()
+        if self.type == TokenType.TYPE and self.value not in ALL_DATA_TYPE_VALUES:
+            return (yield self.eat_instance(name))
         subtype = None
         key_type = self.eat_type()
         self.next_token()
@@ -144,24 +221,24 @@ class Parser:
         if (
             key_type == CompoundDataType.DICT or key_type == CompoundDataType.UNKNOWN
         ) and self.type == TokenType.KEY:
-            value = self.make_collection(key_type)
+            value = yield self.make_collection(key_type)
         elif self.type == TokenType.OPERATOR:
-            value = self.eat_operator()
+            value = yield self.eat_operator()
         elif self.current_token_indent > self._indent:
             self.set_indent()
-            value = self.make_collection(key_type)
+            value = yield self.make_collection(key_type)
             self.set_indent()
         elif (
             self.type == TokenType.NEWLINE and upcoming_token.type == TokenType.OPERATOR
         ):
             self.next_token()
             if self.current_token.value in COMPOUND_ITEM_VALUES:
-                value = self.eat_operator()
+                value = yield self.eat_operator()
             else:
                 self.next_token()
                 subtype = key_type
                 key_type = CompoundDataType.LIST
-                value = self.make_collection(key_type)
+                value = yield self.make_collection(key_type)
         else:
             value = self.eat_value()
         return Key(
@@ -173,10 +250,82 @@ class Parser:
             subtype=subtype,
         )
 
+    def eat_alias_declaration(self) -> Step:
+        """
+        ``@name:`` or ``@name -> base:`` followed by an indented block of the keys of
+        the type and their defaults
+        """
+        line, column = self.line, self.column
+        self.next_token()
+        if self.type != TokenType.KEY:
+            raise SyntaxError(f"Expected a type name line={self.line}")
+        name = self.value
+        self.next_token()
+        base = None
+        if self.type == TokenType.OPERATOR and self.value == Operator.EXTENDS.value:
+            self.next_token()
+            if self.type != TokenType.KEY:
+                raise SyntaxError(f"Expected the name of a base type line={self.line}")
+            base = self.value
+            self.next_token()
+        if self.type != TokenType.TYPE or self.value != CompoundDataType.UNKNOWN.value:
+            raise SyntaxError(f"Expected a colon after type {name!r} line={self.line}")
+        self.next_token()
+        return AliasDeclaration(
+            name=name,
+            collection=(yield self.eat_block()),
+            base=base,
+            line=line,
+            column=column,
+        )
+
+    def eat_instance(self, name: str) -> Step:
+        """
+        A key of a user type, its block or one-liner dict holds the keys that differ
+        from the defaults of the type
+        """
+        line, column = self.line, self.column
+        user_type = self.value
+        self.next_token()
+        if (
+            self.type == TokenType.OPERATOR
+            and self.value == Operator.LCURLYBRACKET.value
+        ):
+            overrides = yield self.eat_operator()
+        else:
+            overrides = yield self.eat_block()
+        return Key(
+            name=name,
+            type=CompoundDataType.DICT,
+            items=overrides,
+            line=line,
+            column=column,
+            user_type=user_type,
+        )
+
+    def eat_block(self) -> Step:
+        """
+        The dict in the block indented under the current line, empty when the next line
+        is not indented deeper
+        """
+        upcoming_token = self.preview(1)
+        if (
+            self.type == TokenType.NEWLINE
+            and upcoming_token.type == TokenType.KEY
+            and upcoming_token.indent > self._indent
+        ):
+            self.next_token()
+            return (yield self.make_collection(CompoundDataType.DICT))
+        return Collection(
+            type=CompoundDataType.DICT,
+            line=self.line,
+            column=self.column,
+        )
+
     def eat_type(self) -> DataType:
         if self.type == TokenType.NEWLINE or self.value == Operator.LCURLYBRACKET.value:
             return CompoundDataType.DICT
-        if self.value in ScalarDataType.values():
+        if self.value in SCALAR_DATA_TYPE_VALUES:
             return ScalarDataType(self.value)
         return CompoundDataType(self.value)
 
@@ -186,11 +335,17 @@ class Parser:
             value = Void(line=self.line, column=self.column)
         else:
             value = self.value
-        ret_value = Value(value=value, line=self.line, column=self.column)
+        meta_data = self.current_token.meta_data
+        ret_value = Value(
+            value=value,
+            line=self.line,
+            column=self.column,
+            template=meta_data is not None and meta_data.single_quote,
+        )
         self.next_token()
         return ret_value
 
-    def eat_operator(self) -> Collection:
+    def eat_operator(self) -> Step:
         value = Collection(type=self.value, line=self.line, column=self.column)
         if self.value == Operator.LSQUAREBRACKET.value:
             closing_operator = Operator.RSQUAREBRACKET.value
@@ -201,7 +356,7 @@ class Parser:
         elif self.value == Operator.LPAREN.value:
             closing_operator = Operator.RPAREN.value
         elif self.value in COMPOUND_ITEM_VALUES:
-            value.items.extend(self.eat_iterator_items())
+            value.items.extend((yield self.eat_iterator_items()))
             return value
         else:
             raise NotImplementedError
@@ -218,25 +373,37 @@ class Parser:
                 self.next_token()
                 break
             if self.current_token.type == TokenType.KEY:
-                value.items.append(self.eat_key())
+                value.items.append((yield self.eat_key()))
             else:
                 value.items.append(self.eat_value())
         if self.value == closing_operator:
             self.next_token()
         return value
 
-    def eat_iterator_items(self) -> list[AST]:
-        current_indent = self.current_token_indent
-        items = []
+    def eat_iterator_items(self) -> Step:
+        item_operator = self.value
+        item_indent = self.current_token.indent
+        items: list[AST | None] = []
         self.set_indent()
-        while self.current_token_indent == current_indent:
+        while (
+            self.type == TokenType.OPERATOR
+            and self.value == item_operator
+            and self.current_token.indent == item_indent
+        ):
             self.next_token()
-            if self.current_token.value in COMPOUND_ITEM_VALUES:
+            if self.type == TokenType.NEWLINE:
                 self.next_token()
-            if self.current_token.type == TokenType.VALUE:
+                if (
+                    self.type == TokenType.KEY
+                    and self.current_token.indent > item_indent
+                ):
+                    items.append((yield self.make_collection(CompoundDataType.DICT)))
+            elif self.type == TokenType.VALUE:
                 items.append(self.eat_value())
-            elif self.current_token.type == TokenType.OPERATOR:
-                items.append(self.eat_operator())
+            elif self.type == TokenType.OPERATOR:
+                items.append((yield self.eat_operator()))
             else:
-                items.append(self.statement())
+                items.append((yield self.statement()))
+            while self.type == TokenType.NEWLINE:
+                self.next_token()
         return [item for item in items if item is not None]
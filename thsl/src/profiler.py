@@ -0,0 +1,227 @@
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any
+
+from thsl.src.abstract_syntax_tree import AST, Collection, Key, Void
+from thsl.src.compiler import Compiler
+from thsl.src.grammar import ScalarDataType, TokenType
+from thsl.src.lexer import Lexer, Token
+from thsl.src.parser import Parser, Step
+from thsl.src.templating import KeyPath
+
+ROOT_PATH: KeyPath = ()
+
+
+@dataclass
+class KeyCost:
+    lex_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    cast_seconds: float = 0.0
+    lex_bytes: int = 0
+    parse_bytes: int = 0
+    cast_bytes: int = 0
+    casts: int = 0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.lex_seconds + self.parse_seconds + self.cast_seconds
+
+    @property
+    def total_bytes(self) -> int:
+        return self.lex_bytes + self.parse_bytes + self.cast_bytes
+
+
+@dataclass
+class ProfileReport:
+    """
+    Time and memory of every stage attributed to the key path they were spent on.
+
+    Costs are exclusive, the cost of a nested key is not included in its parents.
+    """
+
+    costs: dict[KeyPath, KeyCost] = field(default_factory=dict)
+
+    def cost(self, path: KeyPath) -> KeyCost:
+        key_cost = self.costs.get(path)
+        if key_cost is None:
+            key_cost = self.costs[path] = KeyCost()
+        return key_cost
+
+    def ranked(self, limit: int | None = None) -> list[tuple[KeyPath, KeyCost]]:
+        ranked = sorted(
+            self.costs.items(),
+            key=lambda item: item[1].total_seconds,
+            reverse=True,
+        )
+        return ranked[:limit]
+
+    def format(self, limit: int | None = 20) -> str:
+        lines = [
+            f"{'key':<40}{'total ms':>10}{'lex ms':>9}{'parse ms':>10}"
+            f"{'cast ms':>9}{'casts':>8}{'KiB':>9}",
+        ]
+        for path, key_cost in self.ranked(limit):
+            name = ".".join(path) if path else "<root>"
+            if len(name) > 39:
+                name = f"...{name[-36:]}"
+            lines.append(
+                f"{name:<40}"
+                f"{key_cost.total_seconds * 1000:>10.2f}"
+                f"{key_cost.lex_seconds * 1000:>9.2f}"
+                f"{key_cost.parse_seconds * 1000:>10.2f}"
+                f"{key_cost.cast_seconds * 1000:>9.2f}"
+                f"{key_cost.casts:>8}"
+                f"{key_cost.total_bytes / 1024:>9.1f}",
+            )
+        return "\n".join(lines)
+
+
+class Profiler:
+    """
+    Loads a document stage by stage and attributes the lex, parse and cast time, and
+    the memory allocated (when ``memory`` is set), to the key path it belongs to
+    """
+
+    def __init__(self, text: str, memory: bool = True) -> None:
+        self.text = text
+        self.memory = memory
+        self.report = ProfileReport()
+
+    def run(self) -> ProfileReport:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            try:
+                self._run()
+            finally:
+                tracemalloc.stop()
+        else:
+            self._run()
+        return self.report
+
+    def _run(self) -> None:
+        tokens = self._lex()
+        parser = _ProfilingParser(self.text, tokens=tokens, profiler=self)
+        compiler = _ProfilingCompiler(self.text, parser=parser, profiler=self)
+        compiler.compile()
+
+    def _traced_memory(self) -> int:
+        if not self.memory:
+            return 0
+        return tracemalloc.get_traced_memory()[0]
+
+    def _lex(self) -> list[Token]:
+        tokens = []
+        line_costs: dict[int, tuple[float, int]] = {}
+        analyzer = Lexer(self.text).analyze()
+        while True:
+            memory = self._traced_memory()
+            start = time.perf_counter()
+            token = next(analyzer, None)
+            seconds = time.perf_counter() - start
+            if token is None:
+                break
+            allocated = self._traced_memory() - memory
+            tokens.append(token)
+            line_seconds, line_bytes = line_costs.get(token.line, (0.0, 0))
+            line_costs[token.line] = (line_seconds + seconds, line_bytes + allocated)
+        line_paths = self._line_paths(tokens)
+        for line, (seconds, allocated) in line_costs.items():
+            key_cost = self.report.cost(line_paths.get(line, ROOT_PATH))
+            key_cost.lex_seconds += seconds
+            key_cost.lex_bytes += allocated
+        return tokens
+
+    @staticmethod
+    def _line_paths(tokens: list[Token]) -> dict[int, KeyPath]:
+        """
+        Maps each line to the key path of the first key on it, or of the key it is
+        nested under when the line has no key of its own (list items for example)
+        """
+        line_paths: dict[int, KeyPath] = {}
+        stack: list[tuple[int, str]] = []
+        line_start = True
+        for token in tokens:
+            if token.type == TokenType.NEWLINE:
+                line_start = True
+                continue
+            if line_start:
+                while stack and stack[-1][0] >= token.indent:
+                    stack.pop()
+                if token.type == TokenType.KEY:
+                    stack.append((token.indent, token.value))
+                line_paths[token.line] = tuple(name for _, name in stack)
+            line_start = False
+        return line_paths
+
+
+class _ProfilingParser(Parser):
+    def __init__(
+        self,
+        file_path: str,
+        tokens: list[Token],
+        profiler: Profiler,
+    ) -> None:
+        super().__init__(file_path, tokens=tokens)
+        self._profiler = profiler
+        self._path: list[str] = []
+        self._child_seconds = [0.0]
+        self._child_bytes = [0]
+
+    def eat_key(self) -> Step:
+        self._path.append(self.value)
+        self._child_seconds.append(0.0)
+        self._child_bytes.append(0)
+        memory = self._profiler._traced_memory()
+        start = time.perf_counter()
+        try:
+            return (yield from super().eat_key())
+        finally:
+            seconds = time.perf_counter() - start
+            allocated = self._profiler._traced_memory() - memory
+            key_cost = self._profiler.report.cost(tuple(self._path))
+            key_cost.parse_seconds += seconds - self._child_seconds.pop()
+            key_cost.parse_bytes += allocated - self._child_bytes.pop()
+            self._child_seconds[-1] += seconds
+            self._child_bytes[-1] += allocated
+            self._path.pop()
+
+
+class _ProfilingCompiler(Compiler):
+    # every cast is attributed to the key it belongs to
+    batch_casts = False
+
+    def __init__(self, file_path: str, parser: Parser, profiler: Profiler) -> None:
+        # every cast is timed as if the value had not been seen before
+        super().__init__(file_path, parser=parser, cache_casts=False)
+        self._profiler = profiler
+        self._key_paths = self._map_key_paths(self.tree)
+
+    @staticmethod
+    def _map_key_paths(tree: Collection) -> dict[int, KeyPath]:
+        key_paths = {}
+        stack: list[tuple[AST, KeyPath]] = [(tree, ROOT_PATH)]
+        while stack:
+            node, path = stack.pop()
+            match node:
+                case Collection(items=items):
+                    stack.extend((item, path) for item in items)
+                case Key(name=name, items=items):
+                    key_path = (*path, name)
+                    key_paths[id(node)] = key_path
+                    stack.append((items, key_path))
+        return key_paths
+
+    def cast_scalar(self, value: str | Void, cast_type: ScalarDataType) -> Any:
+        memory = self._profiler._traced_memory()
+        start = time.perf_counter()
+        result = super().cast_scalar(value, cast_type)
+        seconds = time.perf_counter() - start
+        path = ROOT_PATH
+        if self._current_key is not None:
+            path = self._key_paths.get(id(self._current_key), ROOT_PATH)
+        key_cost = self._profiler.report.cost(path)
+        key_cost.cast_seconds += seconds
+        key_cost.cast_bytes += self._profiler._traced_memory() - memory
+        key_cost.casts += 1
+        return result
@@ -0,0 +1,216 @@
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from thsl.src.casting import cast_scalar
+from thsl.src.compiler import compile_include
+from thsl.src.event_parser import Event, EventParser, EventPath, EventType
+from thsl.src.grammar import CompoundDataType, ScalarDataType, TokenType
+from thsl.src.includes import IncludeGraph
+from thsl.src.templating import KeyPath, Template, TemplateResolver
+
+
+class ProjectingEventParser(EventParser):
+    """
+    An EventParser that only produces the events of the keys at, above or below the
+    selected key paths. The values of every other key are read past without casting
+    them, nested blocks are skipped by the Lexer on their indentation alone.
+    """
+
+    def __init__(self, text: str, only: Iterable[KeyPath]) -> None:
+        super().__init__(text, cast=False)
+        self.only = set(only)
+        self._prefixes = {path[:end] for path in self.only for end in range(len(path))}
+
+    def wanted(self, path: EventPath) -> bool:
+        return path in self._prefixes or any(
+            path[: len(selected)] == selected for selected in self.only
+        )
+
+    def _key(self, path: EventPath) -> Iterator[Event]:
+        key_token = self._peek()
+        # the defaults of user types are read to be repeated in their instances
+        if self._declaring is not None or self.wanted((*path, key_token.value)):
+            yield from super()._key(path)
+            return
+        self._next()
+        if self._peek().type == TokenType.TYPE:
+            self._next()
+        if self._peek().type != TokenType.NEWLINE:
+            for _ in self._value_events(path, key_token):
+                pass
+            return
+        self._next()
+        if not self._lexer.skip_block(key_token.indent):
+            for _ in self._nested(path, key_token.indent, None):
+                pass
+
+    def _value_events(self, path: EventPath, key_token: Any) -> Iterator[Event]:
+        token = self._peek()
+        if token.type == TokenType.VALUE:
+            self._next()
+            return iter(())
+        return self._inline_value((*path, key_token.value), None)
+
+
+def project(text: str, only: Iterable[str], source: Path | None = None) -> dict:
+    """
+    Loads the values at the dotted key paths in ``only`` into nested dicts. Reading
+    stops once every root key of those paths has been read. When the values hold
+    templates, the document is read again with the keys the templates reference added
+    until they are all there, then only the selected keys are returned. Included files
+    are loaded whole, relative to ``source`` when the text was read from a file.
+    """
+    paths = {tuple(path.split(".")) for path in only}
+    read = set(paths)
+    while True:
+        document, builder = _read(text, read, source)
+        references = {
+            reference
+            for template in builder.templates.templates
+            for reference in _references(template)
+            if not any(reference[:end] in read for end in range(1, len(reference) + 1))
+        }
+        if not references:
+            break
+        read |= references
+    builder.templates.resolve(document)
+    builder.flush_tuples()
+    if read == paths and not builder.included:
+        return document
+    return _select(document, paths, _prefixes(paths))
+
+
+def _read(
+    text: str,
+    paths: set[KeyPath],
+    source: Path | None,
+) -> tuple[dict, "_Builder"]:
+    parser = ProjectingEventParser(text, paths)
+    builder = _Builder(parser, source)
+    remaining = {path[0] for path in paths}
+    prefixes = _prefixes(paths)
+    document: dict = {}
+    events = parser.parse()
+    for event in events:
+        if event.type != EventType.KEY:
+            if event.type == EventType.END_COLLECTION and len(event.path) == 1:
+                remaining.discard(event.path[0])  # type: ignore
+            if not remaining:
+                break
+            continue
+        if event.path not in paths and event.path not in prefixes:
+            continue
+        first = next(events)
+        # keys below an include are selected from the whole included document
+        if event.path in paths or first.data_type == CompoundDataType.INCLUDE:
+            target = document
+            for name in event.path[:-1]:
+                target = target.setdefault(name, {})
+            builder.place(target, event.path[-1], first, events)
+            builder.included |= event.path not in paths
+            if len(event.path) == 1:
+                remaining.discard(event.path[0])
+        if not remaining:
+            break
+    return document, builder
+
+
+def _references(template: Template) -> Iterator[KeyPath]:
+    """
+    The key paths to read for the values a template references. Items of collections
+    are read with the whole collection.
+    """
+    for part in template.parts:
+        if isinstance(part, str):
+            continue
+        end = next(
+            (index for index, name in enumerate(part) if name.isdigit()),
+            len(part),
+        )
+        if end:
+            yield part[:end]
+
+
+def _prefixes(paths: set[KeyPath]) -> set[KeyPath]:
+    return {path[:end] for path in paths for end in range(1, len(path))}
+
+
+def _select(
+    document: dict,
+    paths: set[KeyPath],
+    prefixes: set[KeyPath],
+    path: KeyPath = (),
+) -> dict:
+    """
+    The selected keys of a document that was read with more keys than were selected
+    """
+    result = {}
+    for name, value in document.items():
+        key_path = (*path, name)
+        if key_path in paths:
+            result[name] = value
+        elif key_path in prefixes and isinstance(value, dict):
+            selected = _select(value, paths, prefixes, key_path)
+            if selected:
+                result[name] = selected
+    return result
+
+
+class _Builder:
+    """
+    Builds values from their events the way the Compiler does, templates are added to
+    a TemplateResolver and tuples are only made once the templates in them are resolved
+    """
+
+    def __init__(self, parser: EventParser, source: Path | None = None) -> None:
+        self.parser = parser
+        self.templates = TemplateResolver()
+        self.includes = IncludeGraph(source)
+        # whether a whole included document was read for keys below its include
+        self.included = False
+        self._tuples: list[tuple[Any, Any, list]] = []
+
+    def place(
+        self,
+        container: Any,
+        slot: Any,
+        first: Event,
+        events: Iterator[Event],
+    ) -> None:
+        if first.type == EventType.VALUE:
+            if first.template:
+                self.templates.add(container, slot, first.value)
+            elif isinstance(first.data_type, ScalarDataType):
+                container[slot] = cast_scalar(first.value, first.data_type)
+            elif first.data_type == CompoundDataType.INCLUDE:
+                container[slot] = compile_include(self.includes, first.value)
+            else:
+                container[slot] = first.value
+            return
+        collection: Any = {} if first.type == EventType.START_DICT else []
+        if first.type == EventType.START_SET:
+            collection = set()
+        container[slot] = collection
+        name = None
+        for event in events:
+            if event.type == EventType.END_COLLECTION:
+                break
+            if event.type == EventType.KEY:
+                name = event.value
+            elif isinstance(collection, dict):
+                self.place(collection, name, event, events)
+            elif isinstance(collection, set):
+                # the values of sets are cast without templating them
+                collection.add(self.parser._build(event, events))
+            else:
+                collection.append(None)
+                self.place(collection, len(collection) - 1, event, events)
+        if first.type == EventType.START_TUPLE:
+            # tuples are registered innermost first, like the tuples of the Compiler
+            self._tuples.append((container, slot, collection))
+
+    def flush_tuples(self) -> None:
+        for container, slot, items in self._tuples:
+            container[slot] = tuple(items)
+        self._tuples.clear()
@@ -0,0 +1,56 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Prototype:
+    """
+    A user type compiled once. Its defaults hold the values of the keys of the type and
+    of the types it extends, every instance starts out as a copy of them.
+
+    Defaults that can be hashed can not change and are shared by all the instances,
+    the mutable ones are copied for each instance.
+    """
+
+    name: str
+    defaults: dict
+    mutable: tuple = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.mutable = tuple(
+            key for key, value in self.defaults.items() if not _is_immutable(value)
+        )
+
+    def instantiate(self) -> dict:
+        instance = self.defaults.copy()
+        for key in self.mutable:
+            instance[key] = copy_mutable(instance[key])
+        return instance
+
+
+def copy_mutable(value: Any) -> Any:
+    """
+    Copies the dicts, lists, sets and tuples a load builds item by item, values that
+    can be hashed are shared and anything else is deep copied
+    """
+    if _is_immutable(value):
+        return value
+    match value:
+        case dict():
+            return {key: copy_mutable(item) for key, item in value.items()}
+        case list():
+            return [copy_mutable(item) for item in value]
+        case set():
+            return set(value)
+        case tuple():
+            return tuple(copy_mutable(item) for item in value)
+    return copy.deepcopy(value)
+
+
+def _is_immutable(value: object) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
@@ -0,0 +1,187 @@
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from thsl.src.abstract_syntax_tree import AliasDeclaration, AST, Collection, Key
+from thsl.src.compiler import Compiler
+from thsl.src.frozen import FrozenDict
+from thsl.src.grammar import CompoundDataType
+from thsl.src.shared_keys import share_nested_keys
+from thsl.src.templating import KeyPath
+
+DICT_TYPES = (CompoundDataType.DICT, CompoundDataType.UNKNOWN)
+
+_MISSING = object()
+
+
+@dataclass
+class Changes:
+    """
+    The key paths that differ between two loads of a document. A changed dict is not
+    listed itself, only the keys in it that changed
+    """
+
+    added: list[KeyPath] = field(default_factory=list)
+    removed: list[KeyPath] = field(default_factory=list)
+    changed: list[KeyPath] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class ReloadingCompiler(Compiler):
+    """
+    Compiles a new version of a document against the result of loading the old one.
+    The dicts of the new document are walked together with the old dicts, every value
+    equal to the old one is replaced with the old object and a dict that ends up
+    holding only old objects is replaced with the old dict, so unchanged subtrees keep
+    their identity.
+    """
+
+    def __init__(self, file_path: Path | str, old: Any, **kwargs: Any) -> None:
+        if not isinstance(old, dict | FrozenDict):
+            raise TypeError("Only a document loaded as a dict can be reloaded")
+        self.old = old
+        self.changes = Changes()
+        # the slots of the new document in the order they are done, the slots of a
+        # dict come before the slot holding the dict
+        self._slots: list[tuple[dict, str, Any, KeyPath, bool]] = []
+        super().__init__(file_path, frozen=isinstance(old, FrozenDict), **kwargs)
+
+    def _compile(self) -> Any:
+        result = self._reload(self.tree, self.old)
+        self._flush_casts()
+        self._templates.resolve(result)
+        self._flush_tuples({})
+        reused: set[int] = set()
+        for data, name, old, path, walked in self._slots:
+            if old is _MISSING:
+                self.changes.added.append(path)
+            elif (_unchanged if walked else _same)(data[name], old):
+                data[name] = old
+                reused.add(id(old))
+            elif not walked:
+                self.changes.changed.append(path)
+        if _unchanged(result, self.old):
+            return self.old
+        if self.shared_keys:
+            # the old objects in the result are kept as they were loaded
+            result = share_nested_keys(result, keep=reused)
+        return result
+
+    def _reload(self, collection: Collection, old: Any) -> Any:
+        # the dicts being walked, innermost last. A nested dict is put on top and
+        # placed in its parent once all its keys are done
+        stack = [_Walk(iter(collection.items), _data(old), {}, ())]
+        result = None
+        while stack:
+            walk = stack[-1]
+            nested = self._reload_items(walk)
+            if nested is not None:
+                stack.append(nested)
+                continue
+            stack.pop()
+            for name in walk.old_data:
+                if name not in walk.data:
+                    self.changes.removed.append((*walk.path, name))
+            result = FrozenDict(walk.data) if self.frozen else walk.data
+            if walk.parent is not None:
+                name = walk.path[-1]
+                walk.parent.data[name] = result
+                old_value = walk.parent.old_data[name]
+                self._slots.append((walk.parent.data, name, old_value, walk.path, True))
+        return result
+
+    def _reload_items(self, walk: "_Walk") -> "_Walk | None":
+        """
+        Compiles the keys of a walked dict until one of them holds a dict that was a
+        dict before as well, which is returned to be walked next. Returns None once all
+        keys are done.
+        """
+        data = walk.data
+        for item in walk.items:
+            if isinstance(item, AliasDeclaration):
+                self._declare(item)
+                continue
+            if not isinstance(item, Key):
+                continue
+            name = sys.intern(item.name)
+            old_value = walk.old_data.get(name, _MISSING)
+            if (
+                item.user_type is None
+                and item.type in DICT_TYPES
+                and isinstance(item.items, Collection)
+                and item.items.type in DICT_TYPES
+                and isinstance(old_value, dict | FrozenDict)
+            ):
+                return _Walk(
+                    iter(item.items.items),
+                    _data(old_value),
+                    {},
+                    (*walk.path, name),
+                    walk,
+                )
+            self._visit(
+                Collection(
+                    type=CompoundDataType.DICT,
+                    items=[item],
+                    line=item.line,
+                    column=item.column,
+                ),
+                root=data,
+            )
+            self._slots.append((data, name, old_value, (*walk.path, name), False))
+        return None
+
+
+@dataclass(slots=True)
+class _Walk:
+    """
+    A dict of the new document being walked with the dict it replaces
+    """
+
+    items: Iterator[AST]
+    old_data: dict
+    data: dict
+    path: KeyPath
+    parent: "_Walk | None" = None
+
+
+def _data(mapping: dict | FrozenDict) -> dict:
+    return mapping._data if isinstance(mapping, FrozenDict) else mapping
+
+
+def _unchanged(new: dict | FrozenDict, old: Any) -> bool:
+    """
+    Whether a walked dict holds the old objects under the same keys in the same order
+    """
+    if not isinstance(old, dict | FrozenDict):
+        return False
+    new_data, old_data = _data(new), _data(old)
+    return list(new_data) == list(old_data) and all(
+        value is old_data[name] for name, value in new_data.items()
+    )
+
+
+def _same(new: Any, old: Any) -> bool:
+    if new is old:
+        return True
+    if type(new) is not type(old):
+        return False
+    if hasattr(new, "dtype"):
+        # numpy arrays compare item by item
+        return (
+            new.dtype == old.dtype
+            and new.shape == old.shape
+            and new.tobytes() == old.tobytes()
+        )
+    if isinstance(new, float | Decimal):
+        # -0.0 equals 0.0 and Decimal("1.0") equals Decimal("1.00")
+        return repr(new) == repr(old)
+    if new == old:
+        return True
+    # nan is not equal to itself
+    return new != new and old != old
@@ -0,0 +1,78 @@
+from functools import lru_cache
+from typing import Any
+
+from thsl.src.frozen import FrozenDict
+
+# one class per distinct key layout, the least recently used layouts are dropped. Two
+# threads may both create a class for a new layout, which only costs some sharing
+MAX_LAYOUTS = 1024
+
+
+@lru_cache(maxsize=MAX_LAYOUTS)
+def _layout_type(keys: tuple[str, ...]) -> type:
+    return type("SharedKeys", (), {})
+
+
+def share_keys(data: dict) -> dict:
+    """
+    Copies a dict into the instance dict of a class made for its keys. CPython lets the
+    instance dicts of a class share one key table, so dicts with the same keys in the
+    same order only store their values. Keys are inserted one by one, ``dict.update``
+    would build a dict of its own
+    """
+    keys = tuple(data)
+    if not all(type(key) is str for key in keys):
+        return data
+    shared = _layout_type(keys)().__dict__
+    for key, value in data.items():
+        shared[key] = value
+    return shared
+
+
+def share_nested_keys(
+    root: dict | FrozenDict,
+    replaced: dict[int, tuple[dict, dict]] | None = None,
+    keep: set[int] | None = None,
+) -> dict | FrozenDict:
+    """
+    Replaces the root and every dict nested in it through dicts, frozen dicts and lists
+    with a shared-key dict. When a ``replaced`` mapping is given each replaced dict is
+    kept in it, next to its replacement and by its id. Dicts and lists whose ids are in
+    ``keep`` are left as they are, with everything nested in them
+    """
+    if replaced is None:
+        replaced = {}
+    root, data = _share(root, replaced)
+    stack: list[Any] = [data]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            slots: Any = container.items()
+        else:
+            slots = enumerate(container)
+        for slot, value in slots:
+            if keep is not None and id(value) in keep:
+                continue
+            if isinstance(value, dict | FrozenDict):
+                container[slot], data = _share(value, replaced)
+                stack.append(data)
+            elif isinstance(value, list):
+                stack.append(value)
+    return root
+
+
+def _share(
+    value: dict | FrozenDict,
+    replaced: dict[int, tuple[dict, dict]],
+) -> tuple[dict | FrozenDict, dict]:
+    """
+    Returns the replacement of a dict or frozen dict and the shared-key dict it holds,
+    frozen dicts keep their identity and have the dict they wrap replaced
+    """
+    data = value._data if isinstance(value, FrozenDict) else value
+    shared = share_keys(data)
+    replaced[id(data)] = (data, shared)
+    if isinstance(value, FrozenDict):
+        value._data = shared
+        return value, shared
+    return shared, shared
@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+
+from thsl.src.abstract_syntax_tree import AliasDeclaration, AST, Collection, Key
+from thsl.src.grammar import ScalarDataType
+
+
+@dataclass
+class CastStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class LoadStats:
+    """
+    Timings and counters of a single load, filled in by the Parser and the Compiler
+    when they are given an instance
+    """
+
+    lex_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    compile_seconds: float = 0.0
+    tokens: int = 0
+    nodes: int = 0
+    casts: dict[ScalarDataType, CastStats] = field(default_factory=dict)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.lex_seconds + self.parse_seconds + self.compile_seconds
+
+    @property
+    def cast_seconds(self) -> float:
+        return sum(cast_stats.seconds for cast_stats in self.casts.values())
+
+    def add_cast(
+        self,
+        cast_type: ScalarDataType,
+        seconds: float,
+        count: int = 1,
+    ) -> None:
+        cast_stats = self.casts.get(cast_type)
+        if cast_stats is None:
+            cast_stats = self.casts[cast_type] = CastStats()
+        cast_stats.count += count
+        cast_stats.seconds += seconds
+
+
+def count_nodes(tree: AST) -> int:
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        match node:
+            case Collection(items=items):
+                stack.extend(items)
+            case Key(items=items):
+                stack.append(items)
+            case AliasDeclaration(collection=collection):
+                stack.append(collection)
+    return count
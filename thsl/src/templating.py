@@ -0,0 +1,158 @@
+import dataclasses
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any
+
+KeyPath = tuple[str, ...]
+# the literal text of a template and the paths of the values it references, in order
+TemplateParts = tuple[str | KeyPath, ...]
+
+OPEN = "{"
+CLOSE = "}"
+ESCAPE = "\\"
+PATH_SEPARATOR = "."
+
+
+@lru_cache(maxsize=4096)
+def compile_template(text: str) -> TemplateParts:
+    """
+    Splits a template into its literal text and the key paths between braces, ``\\{``
+    and ``\\}`` are literal braces. Each distinct template is only compiled once.
+    """
+    parts: list[str | KeyPath] = []
+    literal: list[str] = []
+    pos = 0
+    while pos < len(text):
+        char = text[pos]
+        if char == ESCAPE and text[pos + 1 : pos + 2] in (OPEN, CLOSE):
+            literal.append(text[pos + 1])
+            pos += 2
+            continue
+        if char == CLOSE:
+            raise SyntaxError(f"Unmatched {CLOSE} in template {text!r}")
+        if char != OPEN:
+            literal.append(char)
+            pos += 1
+            continue
+        end = text.find(CLOSE, pos)
+        reference = text[pos + 1 : end].strip()
+        if end == -1 or not reference:
+            raise SyntaxError(f"Expected a key path in braces in template {text!r}")
+        if literal:
+            parts.append("".join(literal))
+            literal = []
+        parts.append(tuple(reference.split(PATH_SEPARATOR)))
+        pos = end + 1
+    if literal:
+        parts.append("".join(literal))
+    return tuple(parts)
+
+
+class Template:
+    """
+    Stands in for the value of a templated string until it has been resolved
+    """
+
+    __slots__ = ("parts", "container", "slot")
+
+    def __init__(self, parts: TemplateParts, container: Any, slot: Any) -> None:
+        self.parts = parts
+        self.container = container
+        self.slot = slot
+
+
+class TemplateResolver:
+    """
+    Resolves the templated strings of a document once it has been compiled. The
+    references between templates form a graph that is walked depth first, so every
+    template is resolved once, after the templates it references, and a cycle is found
+    as soon as it is closed.
+    """
+
+    def __init__(self) -> None:
+        self.templates: list[Template] = []
+
+    def add(self, container: Any, slot: Any, text: str) -> None:
+        parts = compile_template(text)
+        if all(isinstance(part, str) for part in parts):
+            container[slot] = "".join(parts)  # type: ignore
+            return
+        template = Template(parts, container, slot)
+        container[slot] = template
+        self.templates.append(template)
+
+    def resolve(self, root: Any) -> None:
+        for template in self.templates:
+            if template.container[template.slot] is template:
+                self._resolve(template, root)
+        self.templates.clear()
+
+    def _resolve(self, template: Template, root: Any) -> None:
+        # a template with the text of the parts resolved so far
+        stack: list[tuple[Template, list[str]]] = [(template, [])]
+        # the paths the nested templates on the stack were reached by
+        entered_by: list[KeyPath] = []
+        active = {id(template)}
+        while stack:
+            current, pieces = stack[-1]
+            while len(pieces) < len(current.parts):
+                part = current.parts[len(pieces)]
+                if isinstance(part, str):
+                    pieces.append(part)
+                    continue
+                value = _lookup(root, part)
+                if isinstance(value, Template):
+                    if id(value) in active:
+                        cycle = [*entered_by, part]
+                        raise ValueError(
+                            "Templates reference each other in a cycle: "
+                            + " -> ".join(map(PATH_SEPARATOR.join, cycle)),
+                        )
+                    stack.append((value, []))
+                    entered_by.append(part)
+                    active.add(id(value))
+                    break
+                pieces.append(_format(value, part))
+            else:
+                current.container[current.slot] = "".join(pieces)
+                active.discard(id(current))
+                stack.pop()
+                if stack:
+                    entered_by.pop()
+
+
+def _lookup(root: Any, path: KeyPath) -> Any:
+    value = root
+    try:
+        for name in path:
+            if isinstance(value, Mapping):
+                value = value[name]
+            elif isinstance(value, list | tuple) and name.isdigit():
+                value = value[int(name)]
+            elif _is_dataclass(value) and name in value.__dataclass_fields__:
+                # a document loaded into dataclasses is looked up by field
+                value = getattr(value, name)
+            else:
+                raise KeyError(name)
+    except (IndexError, KeyError):
+        raise KeyError(
+            f"No value at {PATH_SEPARATOR.join(path)} for a template",
+        ) from None
+    return value
+
+
+def _format(value: Any, path: KeyPath) -> str:
+    if (
+        isinstance(value, Mapping | list | set | frozenset)
+        or type(value) is tuple
+        or _is_dataclass(value)
+    ):
+        raise TypeError(
+            f"Templates can only reference scalar values, "
+            f"{PATH_SEPARATOR.join(path)} is a {type(value).__name__}",
+        )
+    return str(value)
+
+
+def _is_dataclass(value: Any) -> bool:
+    return dataclasses.is_dataclass(value) and not isinstance(value, type)
@@ -0,0 +1,323 @@
+import binascii
+import ipaddress
+import re
+import urllib.parse
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, time
+from decimal import Decimal
+from functools import partial
+
+import semantic_version
+import tempora
+from dateutil import parser as dateutil
+
+from thsl.src.abstract_syntax_tree import (
+    AliasDeclaration,
+    AST,
+    Collection,
+    Key,
+    Value,
+    Void,
+)
+from thsl.src.grammar import CompoundDataType, DataType, ScalarDataType
+from thsl.src.lexer import Lexer
+from thsl.src.parser import Parser
+
+try:
+    from re import _compiler as sre_compile  # type: ignore
+except ImportError:  # Python 3.10
+    import sre_compile
+
+_ISO_DATETIME = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}"
+    r"(?:[T ][0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{1,6})?)?)?",
+)
+_ISO_TIME = re.compile(r"[0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{1,6})?)?")
+_BASE64 = re.compile(r"([A-Za-z0-9+/]*)=*")
+_POSITION = re.compile(r"(.*?)[ ,]*line=(\d+)(?: column=(\d+))?")
+
+LIST_LIKE = (CompoundDataType.LIST, CompoundDataType.TUPLE)
+COLLECTION_TYPES = (*LIST_LIKE, CompoundDataType.SET)
+# the types an empty value has a default for
+DEFAULTED_TYPES = (*ScalarDataType, *COLLECTION_TYPES, CompoundDataType.DICT)
+
+
+def _check_bool(value: str) -> None:
+    if value not in ("true", "false"):
+        raise ValueError("expected true or false")
+
+
+def _check_bytes(value: str) -> None:
+    if not 0 <= int(value, 2) <= 0xFFFF:
+        raise ValueError("more than two bytes")
+
+
+def _check_char(value: str) -> None:
+    if len(value) > 1:
+        raise ValueError("Char type can only be a single character")
+
+
+def _check_complex(value: str) -> None:
+    complex(value.replace("i", "j"))
+
+
+def _check_range(value: str) -> None:
+    int(value[0])
+    int(value[-1])
+
+
+def _check_datetime(value: str) -> None:
+    # plain ISO dates are checked without dateutil, which parses anything else
+    if _ISO_DATETIME.fullmatch(value) is not None:
+        try:
+            datetime.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            return
+    dateutil.parse(value)
+
+
+def _check_time(value: str) -> None:
+    if _ISO_TIME.fullmatch(value) is not None:
+        try:
+            time.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            return
+    dateutil.parse(value)
+
+
+def _check_base64(value: str) -> None:
+    match = _BASE64.fullmatch(value)
+    if match is None:
+        binascii.a2b_base64(value)
+        return
+    # whole groups of four characters always decode, so only the last group and what
+    # follows it are decoded
+    start = max(0, (match.end(1) // 4 - 1) * 4)
+    binascii.a2b_base64(value[start:])
+
+
+def _check_regex(value: str) -> None:
+    # compiled without re.compile, which keeps the pattern in the cache of the re
+    # module that the rest of the process shares
+    sre_compile.compile(value)
+
+
+# raise on the values casting would fail on, without keeping what they make. Types
+# that every value can be cast to are left out
+CHECKS: dict[ScalarDataType, Callable[[str], object]] = {
+    ScalarDataType.INT: int,
+    ScalarDataType.DEC: Decimal,
+    ScalarDataType.FLOAT: float,
+    ScalarDataType.HEX: partial(int, base=16),
+    ScalarDataType.OCT: partial(int, base=8),
+    ScalarDataType.COMPLEX: _check_complex,
+    ScalarDataType.BASE64: _check_base64,
+    ScalarDataType.BOOL: _check_bool,
+    ScalarDataType.BYTES: _check_bytes,
+    ScalarDataType.CHAR: _check_char,
+    ScalarDataType.DATETIME: _check_datetime,
+    ScalarDataType.DATE: _check_datetime,
+    ScalarDataType.TIME: _check_time,
+    ScalarDataType.INTERVAL: tempora.parse_timedelta,
+    ScalarDataType.IP_ADDRESS: ipaddress.ip_address,
+    ScalarDataType.IP_NETWORK: ipaddress.ip_network,
+    ScalarDataType.URL: urllib.parse.urlsplit,
+    ScalarDataType.RANGE: _check_range,
+    ScalarDataType.SEMVER: semantic_version.Version.parse,
+    ScalarDataType.REGEX: _check_regex,
+}
+
+
+@dataclass(frozen=True)
+class ValidationError:
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line} column {self.column}: {self.message}"
+
+
+@dataclass(slots=True)
+class _Frame:
+    """
+    A collection being checked, its items still to do and the user type whose
+    defaults it holds
+    """
+
+    items: Iterator[AST]
+    type: DataType
+    alias: str | None = None
+    declares: str | None = None
+
+
+class Validator:
+    """
+    Lexes and parses a document and checks that every value can be cast to its type,
+    without casting it or building the result. Walks the tree in the order of the
+    Compiler and gives values the same types. Templates and includes are not resolved.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.errors: list[ValidationError] = []
+        self._user_types: set[str] = set()
+        self._current_key: Key | None = None
+        # where each line starts in the text, only found once there is an error
+        self._line_starts: list[int] | None = None
+
+    def validate(self) -> list[ValidationError]:
+        lexer = Lexer(self.text)
+        try:
+            tokens = lexer.parse()
+        except Exception as err:  # noqa: BLE001
+            position = (lexer._line_num, lexer._column)  # noqa: SLF001
+            self._syntax_error(err, *position)
+            return self.errors
+        parser = Parser(self.text, tokens=tokens)
+        try:
+            tree = parser.parse()
+        except Exception as err:  # noqa: BLE001
+            self._syntax_error(err, parser.line, parser.column)
+            return self.errors
+        self._visit(tree)
+        return self.errors
+
+    def _syntax_error(self, err: Exception, line: int, column: int) -> None:
+        message = str(err) or type(err).__name__
+        match = _POSITION.fullmatch(message)
+        if match is not None:
+            message, line = match[1], int(match[2])
+            column = int(match[3]) if match[3] else column
+        self.errors.append(ValidationError(line, column, message))
+
+    def _error(self, node: AST, message: str, source: str) -> None:
+        """
+        Records an error at the first character of the source text of a node. Tokens
+        hold the column after them, so the text is looked for before that column.
+        """
+        column = node.column
+        line = self._line_text(node.line)
+        start = line.rfind(source.split("\n", 1)[0], 0, column - 1)
+        if start != -1:
+            column = start + 1
+        self.errors.append(ValidationError(node.line, column, message))
+
+    def _line_text(self, line: int) -> str:
+        if self._line_starts is None:
+            self._line_starts = [0]
+            newline = self.text.find("\n")
+            while newline != -1:
+                self._line_starts.append(newline + 1)
+                newline = self.text.find("\n", newline + 1)
+        if line > len(self._line_starts):
+            return ""
+        start = self._line_starts[line - 1]
+        end = self.text.find("\n", start)
+        return self.text[start : end if end != -1 else len(self.text)]
+
+    def _visit(self, tree: Collection) -> None:
+        stack = [_Frame(iter(tree.items), CompoundDataType.DICT)]
+        while stack:
+            frame = stack[-1]
+            nested = self._visit_items(frame)
+            if nested is not None:
+                stack.append(nested)
+                continue
+            stack.pop()
+            if frame.declares is not None:
+                self._user_types.add(frame.declares)
+
+    @staticmethod
+    def _enter(collection: Collection, alias: str | None) -> _Frame:
+        collection_type = collection.type
+        if collection_type not in COLLECTION_TYPES:
+            collection_type = CompoundDataType.DICT
+        return _Frame(iter(collection.items), collection_type, alias)  # type: ignore
+
+    def _visit_items(self, frame: _Frame) -> _Frame | None:
+        """
+        Checks the items of a collection until one of them is a collection itself,
+        which is returned to be checked next. Returns None once all items are done.
+        """
+        for item in frame.items:
+            if isinstance(item, Key):
+                self._current_key = item
+            match item:
+                case AliasDeclaration() as alias:
+                    if alias.base is not None and alias.base not in self._user_types:
+                        self._error(alias, f"Unknown type {alias.base!r}", alias.base)
+                    nested = self._enter(alias.collection, alias.name)
+                    nested.declares = alias.name
+                    return nested
+                case Key(user_type=str()) as key:
+                    if key.user_type not in self._user_types:
+                        self._error(
+                            key,
+                            f"Unknown type {key.user_type!r}",
+                            key.user_type,  # type: ignore
+                        )
+                    nested = self._enter(key.items, frame.alias)  # type: ignore
+                    nested.type = CompoundDataType.DICT
+                    return nested
+                case Key(type=CompoundDataType.INCLUDE) as key:
+                    if isinstance(key.items.value, Void):  # type: ignore
+                        self._error(key, "Expected a file to include", key.name)
+                case Key(items=Value()) as key:
+                    self._check(key.items, key.type, frame.alias)  # type: ignore
+                case Key(items=Collection(type=CompoundDataType())) as key:
+                    return self._enter(key.items, frame.alias)  # type: ignore
+                case Collection() as collection:
+                    if frame.type in LIST_LIKE:
+                        return self._enter(collection, frame.alias)
+                case Value() as value:
+                    if self._current_key is None or frame.type not in COLLECTION_TYPES:
+                        continue
+                    subtype = self._current_key.subtype
+                    if subtype is None:
+                        subtype = self._current_key.type
+                    if subtype == CompoundDataType.UNKNOWN:
+                        subtype = value.type
+                    if value.type is not None:
+                        subtype = value.type
+                    # the values of sets are cast without templating them
+                    templates = frame.type in LIST_LIKE
+                    self._check(value, subtype, frame.alias, templates)
+        return None
+
+    def _check(
+        self,
+        node: Value,
+        cast_type: DataType | None,
+        alias: str | None,
+        templates: bool = True,
+    ) -> None:
+        if templates and node.template and cast_type == ScalarDataType.STR:
+            if alias is not None:
+                self._error(
+                    node,
+                    f"The defaults of type {alias!r} can not reference other keys",
+                    node.value,  # type: ignore
+                )
+            return
+        if isinstance(node.value, Void):
+            if cast_type not in DEFAULTED_TYPES:
+                self._error(node, "Expected a value", "")
+            return
+        check = CHECKS.get(cast_type)  # type: ignore
+        if check is None:
+            return
+        try:
+            check(node.value)
+        except Exception as err:  # noqa: BLE001
+            detail = str(err) or type(err).__name__
+            self._error(
+                node,
+                f"Invalid {cast_type.value} value: {detail}",  # type: ignore
+                node.value,
+            )